@@ -0,0 +1,482 @@
+/* _sudoku_native.c
+ *
+ * Backend native opsional untuk loop search yang paling panas:
+ *   dfs(cells, n, max_nodes, remaining_sec, check_every)
+ *       DFS bitmask (sama dengan solver_dfs: sel kosong row-major, kandidat urut naik)
+ *   dlx(L, R, U, D, C, S, row_of, max_nodes, remaining_sec, check_every)
+ *       Algorithm X di atas array DancingLinks hasil solver_dlx_links.build_links
+ *
+ * Keduanya memakai stack eksplisit (tanpa rekursi C) dan urutan node yang sama
+ * dengan versi Python, jadi recursion_steps identik. Budget meniru metrics.Budget:
+ * max_nodes tepat per tick, jam dicek tiap check_every tick.
+ * Return: (ok, hasil, recursion_steps, ticks, reason)
+ *   dfs: hasil = list N*N sel (board terisi jika ok)
+ *   dlx: hasil = list row_id baris terpilih (urut kedalaman)
+ *   reason: "" / "time" / "nodes"
+ *
+ * Build: python setup.py build_ext --inplace (lihat native_backend.py untuk fallback).
+ */
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <stdint.h>
+#include <stdlib.h>
+#include <time.h>
+
+enum { STOP_NONE = 0, STOP_TIME, STOP_NODES, STOP_SIGNAL };
+
+typedef struct {
+    long long max_nodes;    /* < 0 = tanpa batas */
+    long long ticks;
+    double deadline;        /* detik CLOCK_MONOTONIC */
+    long check_every;
+    long countdown;
+    int reason;
+} budget_t;
+
+static double now_sec(void)
+{
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return (double)ts.tv_sec + (double)ts.tv_nsec * 1e-9;
+}
+
+static void budget_init(budget_t *b, long long max_nodes, double remaining, long check_every)
+{
+    b->max_nodes = max_nodes;
+    b->ticks = 0;
+    b->deadline = now_sec() + remaining;
+    b->check_every = check_every > 0 ? check_every : 1;
+    b->countdown = b->check_every;
+    b->reason = STOP_NONE;
+}
+
+/* satu node; 1 jika budget habis (search harus berhenti) */
+static int budget_tick(budget_t *b)
+{
+    b->ticks++;
+    if (b->max_nodes >= 0 && b->ticks > b->max_nodes) {
+        b->reason = STOP_NODES;
+        return 1;
+    }
+    if (--b->countdown <= 0) {
+        b->countdown = b->check_every;
+        if (now_sec() > b->deadline) {
+            b->reason = STOP_TIME;
+            return 1;
+        }
+        /* Ctrl-C tetap bisa menghentikan search panjang */
+        if (PyErr_CheckSignals() < 0) {
+            b->reason = STOP_SIGNAL;
+            return 1;
+        }
+    }
+    return 0;
+}
+
+static const char *reason_name(int reason)
+{
+    switch (reason) {
+    case STOP_TIME:
+        return "time";
+    case STOP_NODES:
+        return "nodes";
+    default:
+        return "";
+    }
+}
+
+static int lowest_bit_index(uint64_t x)
+{
+#if defined(__GNUC__) || defined(__clang__)
+    return __builtin_ctzll(x);
+#else
+    int i = 0;
+    while (!(x & 1)) {
+        x >>= 1;
+        i++;
+    }
+    return i;
+#endif
+}
+
+/* sequence int Python -> array int baru (malloc); NULL + exception jika gagal */
+static int *to_int_array(PyObject *obj, Py_ssize_t *len_out, const char *name)
+{
+    PyObject *seq = PySequence_Fast(obj, name);
+    Py_ssize_t len, i;
+    int *out;
+
+    if (seq == NULL)
+        return NULL;
+    len = PySequence_Fast_GET_SIZE(seq);
+    out = (int *)malloc((len > 0 ? len : 1) * sizeof(int));
+    if (out == NULL) {
+        Py_DECREF(seq);
+        PyErr_NoMemory();
+        return NULL;
+    }
+    for (i = 0; i < len; i++) {
+        long v = PyLong_AsLong(PySequence_Fast_GET_ITEM(seq, i));
+        if (v == -1 && PyErr_Occurred()) {
+            free(out);
+            Py_DECREF(seq);
+            return NULL;
+        }
+        out[i] = (int)v;
+    }
+    Py_DECREF(seq);
+    *len_out = len;
+    return out;
+}
+
+static PyObject *int_list(const int *values, Py_ssize_t len)
+{
+    PyObject *list = PyList_New(len);
+    Py_ssize_t i;
+
+    if (list == NULL)
+        return NULL;
+    for (i = 0; i < len; i++) {
+        PyObject *v = PyLong_FromLong(values[i]);
+        if (v == NULL) {
+            Py_DECREF(list);
+            return NULL;
+        }
+        PyList_SET_ITEM(list, i, v);
+    }
+    return list;
+}
+
+static PyObject *
+native_dfs(PyObject *self, PyObject *args)
+{
+    PyObject *cells_obj, *result = NULL, *cells_list;
+    int n, b, *grid = NULL, *empties = NULL, *placed = NULL, *block_of = NULL;
+    long long max_nodes, steps = 0;
+    double remaining;
+    long check_every;
+    Py_ssize_t ncells, i;
+    uint64_t rows[64] = {0}, cols[64] = {0}, blocks[64] = {0}, full, *cand = NULL;
+    int nempty = 0, depth = 0, entering = 1, ok = 0;
+    budget_t bud;
+
+    (void)self;
+    if (!PyArg_ParseTuple(args, "OiLdl", &cells_obj, &n, &max_nodes, &remaining, &check_every))
+        return NULL;
+    if (n < 1 || n > 64) {
+        PyErr_SetString(PyExc_ValueError, "dfs native hanya mendukung 1 <= N <= 64");
+        return NULL;
+    }
+    for (b = 1; b * b < n; b++)
+        ;
+    if (b * b != n) {
+        PyErr_Format(PyExc_ValueError, "N=%d bukan kuadrat sempurna", n);
+        return NULL;
+    }
+
+    grid = to_int_array(cells_obj, &ncells, "cells harus sequence int");
+    if (grid == NULL)
+        return NULL;
+    if (ncells != (Py_ssize_t)n * n) {
+        PyErr_Format(PyExc_ValueError, "cells berisi %zd sel, harus %d", ncells, n * n);
+        goto done;
+    }
+
+    empties = (int *)malloc(ncells * sizeof(int));
+    placed = (int *)malloc(ncells * sizeof(int));
+    block_of = (int *)malloc(ncells * sizeof(int));
+    cand = (uint64_t *)malloc(ncells * sizeof(uint64_t));
+    if (empties == NULL || placed == NULL || block_of == NULL || cand == NULL) {
+        PyErr_NoMemory();
+        goto done;
+    }
+
+    full = n == 64 ? ~(uint64_t)0 : (((uint64_t)1 << n) - 1);
+    for (i = 0; i < ncells; i++) {
+        int r = (int)(i / n), c = (int)(i % n), v = grid[i];
+        block_of[i] = (r / b) * b + c / b;
+        if (v < 0 || v > n) {
+            PyErr_Format(PyExc_ValueError, "nilai sel %d di luar 0..%d", v, n);
+            goto done;
+        }
+        if (v == 0) {
+            empties[nempty++] = (int)i;
+        } else {
+            uint64_t bit = (uint64_t)1 << (v - 1);
+            rows[r] |= bit;
+            cols[c] |= bit;
+            blocks[block_of[i]] |= bit;
+        }
+    }
+
+    budget_init(&bud, max_nodes, remaining, check_every);
+    for (;;) {
+        int cell, r, c, v;
+        uint64_t mask, low, bit;
+
+        if (entering) {
+            /* masuk node baru (= satu pemanggilan dfs_search) */
+            if (budget_tick(&bud))
+                break;
+            steps++;
+            if (depth == nempty) {
+                ok = 1;
+                break;
+            }
+            cell = empties[depth];
+            r = cell / n;
+            c = cell % n;
+            cand[depth] = full & ~(rows[r] | cols[c] | blocks[block_of[cell]]);
+        } else {
+            /* subtree gagal -> undo nilai di kedalaman ini */
+            cell = empties[depth];
+            r = cell / n;
+            c = cell % n;
+            bit = ~((uint64_t)1 << (placed[depth] - 1));
+            rows[r] &= bit;
+            cols[c] &= bit;
+            blocks[block_of[cell]] &= bit;
+            grid[cell] = 0;
+        }
+
+        mask = cand[depth];
+        if (!mask) {
+            if (depth == 0)
+                break;
+            depth--;
+            entering = 0;
+            continue;
+        }
+        low = mask & (~mask + 1);
+        cand[depth] = mask ^ low;
+        v = lowest_bit_index(low) + 1;
+        rows[r] |= low;
+        cols[c] |= low;
+        blocks[block_of[cell]] |= low;
+        grid[cell] = v;
+        placed[depth] = v;
+        depth++;
+        entering = 1;
+    }
+
+    if (bud.reason == STOP_SIGNAL)
+        goto done;
+    cells_list = int_list(grid, ncells);
+    if (cells_list != NULL)
+        result = Py_BuildValue("(NNLLs)", PyBool_FromLong(ok), cells_list, steps, bud.ticks,
+                               reason_name(bud.reason));
+
+done:
+    free(grid);
+    free(empties);
+    free(placed);
+    free(block_of);
+    free(cand);
+    return result;
+}
+
+typedef struct {
+    int *L, *R, *U, *D, *C, *S;
+} links_t;
+
+static void dlx_cover(const links_t *x, int h)
+{
+    int *L = x->L, *R = x->R, *U = x->U, *D = x->D, *C = x->C, *S = x->S;
+    int i, j;
+
+    R[L[h]] = R[h];
+    L[R[h]] = L[h];
+    for (i = D[h]; i != h; i = D[i]) {
+        for (j = R[i]; j != i; j = R[j]) {
+            U[D[j]] = U[j];
+            D[U[j]] = D[j];
+            S[C[j]]--;
+        }
+    }
+}
+
+static void dlx_uncover(const links_t *x, int h)
+{
+    int *L = x->L, *R = x->R, *U = x->U, *D = x->D, *C = x->C, *S = x->S;
+    int i, j;
+
+    for (i = U[h]; i != h; i = U[i]) {
+        for (j = L[i]; j != i; j = L[j]) {
+            S[C[j]]++;
+            U[D[j]] = j;
+            D[U[j]] = j;
+        }
+    }
+    R[L[h]] = h;
+    L[R[h]] = h;
+}
+
+static PyObject *
+native_dlx(PyObject *self, PyObject *args)
+{
+    PyObject *objs[7], *result = NULL, *rows_list;
+    int *arrays[7] = {NULL};
+    static const char *names[7] = {
+        "L harus sequence int", "R harus sequence int", "U harus sequence int",
+        "D harus sequence int", "C harus sequence int", "S harus sequence int",
+        "row_of harus sequence int"};
+    Py_ssize_t lens[7], size, k;
+    long long max_nodes, steps = 0;
+    double remaining;
+    long check_every;
+    int *col_at = NULL, *row_at = NULL, *solution = NULL;
+    int depth = 0, entering = 1, undo_child, ok = 0;
+    links_t x;
+    budget_t bud;
+
+    (void)self;
+    if (!PyArg_ParseTuple(args, "OOOOOOOLdl", &objs[0], &objs[1], &objs[2], &objs[3],
+                          &objs[4], &objs[5], &objs[6], &max_nodes, &remaining, &check_every))
+        return NULL;
+    for (k = 0; k < 7; k++) {
+        arrays[k] = to_int_array(objs[k], &lens[k], names[k]);
+        if (arrays[k] == NULL)
+            goto done;
+        /* S hanya berisi header kolom, array lain satu entry per node */
+        if (k != 5 && lens[k] != lens[0]) {
+            PyErr_SetString(PyExc_ValueError, "array node DancingLinks harus sama panjang");
+            goto done;
+        }
+    }
+    size = lens[0];
+    /* index di luar jangkauan akan merusak memori: cek sekali di depan */
+    for (k = 0; k < size; k++) {
+        if (arrays[0][k] < 0 || arrays[0][k] >= size || arrays[1][k] < 0 || arrays[1][k] >= size
+            || arrays[2][k] < 0 || arrays[2][k] >= size || arrays[3][k] < 0 || arrays[3][k] >= size
+            || arrays[4][k] < 0 || arrays[4][k] >= lens[5] || lens[5] > size) {
+            PyErr_SetString(PyExc_ValueError, "index DancingLinks di luar jangkauan");
+            goto done;
+        }
+    }
+    x.L = arrays[0];
+    x.R = arrays[1];
+    x.U = arrays[2];
+    x.D = arrays[3];
+    x.C = arrays[4];
+    x.S = arrays[5];
+
+    /* kedalaman <= jumlah kolom (setiap baris meng-cover minimal satu kolom) */
+    col_at = (int *)malloc(size * sizeof(int));
+    row_at = (int *)malloc(size * sizeof(int));
+    if (col_at == NULL || row_at == NULL) {
+        PyErr_NoMemory();
+        goto done;
+    }
+
+    budget_init(&bud, max_nodes, remaining, check_every);
+    for (;;) {
+        int *R = x.R, *L = x.L, *D = x.D, *C = x.C, *S = x.S;
+        int col, i, j;
+
+        undo_child = 1;
+        if (entering) {
+            /* masuk node baru (= satu pemanggilan dlx_search) */
+            int best, h;
+
+            entering = 0;
+            if (budget_tick(&bud))
+                break;
+            if (R[0] == 0) {
+                ok = 1;
+                break;
+            }
+            /* kolom dengan size minimum (urutan scan sama dengan dlx_search) */
+            col = R[0];
+            best = S[col];
+            for (h = R[col]; h != 0 && best > 0; h = R[h]) {
+                if (S[h] < best) {
+                    col = h;
+                    best = S[h];
+                }
+            }
+            if (best == 0) {
+                if (depth == 0)
+                    break;
+                depth--;
+            } else {
+                dlx_cover(&x, col);
+                col_at[depth] = col;
+                row_at[depth] = col;
+                undo_child = 0;
+            }
+        }
+
+        col = col_at[depth];
+        i = row_at[depth];
+        if (undo_child) {
+            /* subtree baris i gagal: uncover urutan terbalik */
+            for (j = L[i]; j != i; j = L[j])
+                dlx_uncover(&x, C[j]);
+        }
+
+        i = D[i];
+        row_at[depth] = i;
+        if (i == col) {
+            dlx_uncover(&x, col);
+            if (depth == 0)
+                break;
+            depth--;
+            continue;
+        }
+
+        steps++;
+        for (j = R[i]; j != i; j = R[j])
+            dlx_cover(&x, C[j]);
+        depth++;
+        entering = 1;
+    }
+
+    if (bud.reason == STOP_SIGNAL)
+        goto done;
+    solution = (int *)malloc((depth > 0 ? depth : 1) * sizeof(int));
+    if (solution == NULL) {
+        PyErr_NoMemory();
+        goto done;
+    }
+    for (k = 0; k < (ok ? depth : 0); k++)
+        solution[k] = arrays[6][row_at[k]];
+    rows_list = int_list(solution, ok ? depth : 0);
+    if (rows_list != NULL)
+        result = Py_BuildValue("(NNLLs)", PyBool_FromLong(ok), rows_list, steps, bud.ticks,
+                               reason_name(bud.reason));
+
+done:
+    for (k = 0; k < 7; k++)
+        free(arrays[k]);
+    free(col_at);
+    free(row_at);
+    free(solution);
+    return result;
+}
+
+static PyMethodDef native_methods[] = {
+    {"dfs", native_dfs, METH_VARARGS,
+     "dfs(cells, n, max_nodes, remaining_sec, check_every) -> (ok, cells, steps, ticks, reason)"},
+    {"dlx", native_dlx, METH_VARARGS,
+     "dlx(L, R, U, D, C, S, row_of, max_nodes, remaining_sec, check_every)"
+     " -> (ok, row_ids, steps, ticks, reason)"},
+    {NULL, NULL, 0, NULL}
+};
+
+static struct PyModuleDef native_module = {
+    PyModuleDef_HEAD_INIT,
+    "_sudoku_native",
+    "Loop search DFS bitmask dan DLX dalam C (lihat native_backend.py).",
+    -1,
+    native_methods,
+    NULL,
+    NULL,
+    NULL,
+    NULL
+};
+
+PyMODINIT_FUNC
+PyInit__sudoku_native(void)
+{
+    return PyModule_Create(&native_module);
+}
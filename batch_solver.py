@@ -0,0 +1,224 @@
+# batch_solver.py
+"""
+Batch solver: banyak board sekaligus sebagai satu array NumPy (B, N, N).
+
+Propagasi naked singles + hidden singles dijalankan tervektorisasi untuk
+seluruh batch lewat bitplane kandidat bool (B, N, N, N) (plane v = nilai v+1).
+Hanya board yang masih belum selesai setelah propagasi yang dikirim ke solver
+search per-board (default solve_dlx_links).
+
+    python batch_solver.py puzzles_9x9.bin --out solutions_9x9.bin
+"""
+import argparse
+import os
+import time
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from metrics import Metrics
+from puzzle_bin import HEADER, PuzzleBinReader, PuzzleBinWriter, is_puzzle_bin
+from sudoku_core import iter_puzzles, validate_batch
+from sudoku_geometry import get_geometry
+from solver_dlx_links import solve_dlx_links
+
+# bitplane (CHUNK, N, N, N) bool: 4096 board 9x9 ~ 3 MB, 16x16 ~ 16 MB
+DEFAULT_CHUNK = 4096
+
+
+def _unit_used(onehot: np.ndarray, b: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Nilai yang sudah dipakai per baris (B,N,V), kolom (B,N,V), blok (B,b,b,V)."""
+    B, n = onehot.shape[0], onehot.shape[1]
+    rows = onehot.any(axis=2)
+    cols = onehot.any(axis=1)
+    blocks = onehot.reshape(B, b, b, b, b, n).any(axis=(2, 4))
+    return rows, cols, blocks
+
+
+def _expand_blocks(per_block: np.ndarray, b: int) -> np.ndarray:
+    """(B, b, b, V) -> (B, N, N, V): nilai blok disebar ke semua selnya."""
+    return per_block.repeat(b, axis=1).repeat(b, axis=2)
+
+
+def candidates(grid: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Bitplane kandidat (B, N, N, N) dan flag kontradiksi per board
+    (nilai dobel di satu unit). Sel terisi tidak punya kandidat.
+    """
+    B, n, _ = grid.shape
+    b = get_geometry(n).b
+    values = np.arange(1, n + 1, dtype=grid.dtype)
+    onehot = grid[..., None] == values
+
+    # nilai dobel di baris / kolom / blok -> board tidak konsisten
+    dup = ((onehot.sum(axis=2) > 1).any(axis=(1, 2))
+           | (onehot.sum(axis=1) > 1).any(axis=(1, 2))
+           | (onehot.reshape(B, b, b, b, b, n).sum(axis=(2, 4)) > 1).any(axis=(1, 2, 3)))
+
+    rows, cols, blocks = _unit_used(onehot, b)
+    used = rows[:, :, None, :] | cols[:, None, :, :] | _expand_blocks(blocks, b)
+    cand = ~used & (grid == 0)[..., None]
+    return cand, dup
+
+
+def propagate_batch(grid: np.ndarray, max_rounds: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Naked singles + hidden singles sampai fixpoint, in-place di `grid` (B, N, N).
+    Tiap ronde hanya board yang masih berubah yang dihitung ulang.
+    Return (rounds per board, dead per board): dead = kontradiksi
+    (sel tanpa kandidat, nilai yang tidak bisa ditempatkan di unit, atau nilai dobel).
+    """
+    B, n, _ = grid.shape
+    b = get_geometry(n).b
+    rounds = np.zeros(B, dtype=np.int64)
+    dead = np.zeros(B, dtype=bool)
+    active = np.arange(B)
+    r = 0
+
+    while active.size and (max_rounds is None or r < max_rounds):
+        r += 1
+        g = grid[active]
+        cand, dup = candidates(g)
+        empty = g == 0
+        count = cand.sum(axis=3)
+
+        # hidden single: nilai v hanya punya satu posisi di unit
+        row_n = cand.sum(axis=2)                                   # (A, N, V)
+        col_n = cand.sum(axis=1)                                   # (A, N, V)
+        blk_n = cand.reshape(-1, b, b, b, b, n).sum(axis=(2, 4))   # (A, b, b, V)
+        onehot = g[..., None] == np.arange(1, n + 1, dtype=g.dtype)
+        rows, cols, blocks = _unit_used(onehot, b)
+
+        # kontradiksi: sel kosong tanpa kandidat, atau nilai belum dipakai tapi tak punya posisi
+        stuck = ((empty & (count == 0)).any(axis=(1, 2))
+                 | ((row_n == 0) & ~rows).any(axis=(1, 2))
+                 | ((col_n == 0) & ~cols).any(axis=(1, 2))
+                 | ((blk_n == 0) & ~blocks).any(axis=(1, 2, 3)))
+        bad = dup | stuck
+
+        hidden = cand & ((row_n == 1)[:, :, None, :]
+                         | (col_n == 1)[:, None, :, :]
+                         | _expand_blocks(blk_n == 1, b))
+        naked = cand & (count == 1)[..., None]
+        forced = hidden | naked
+        hit = forced.any(axis=3) & ~bad[:, None, None]
+
+        # nilai terkecil yang dipaksa; dua nilai berbeda di satu sel
+        # berarti kontradiksi dan akan terdeteksi di ronde berikutnya
+        new_vals = forced.argmax(axis=3).astype(g.dtype) + 1
+        g = np.where(hit, new_vals, g)
+        grid[active] = g
+
+        changed = hit.any(axis=(1, 2))
+        dead[active[bad]] = True
+        rounds[active] += 1
+        active = active[changed]
+
+    return rounds, dead
+
+
+def solve_batch(boards,
+                fallback: Optional[Callable] = solve_dlx_links,
+                timeout_sec: float = 30.0,
+                chunk_size: int = DEFAULT_CHUNK,
+                max_rounds: Optional[int] = None) -> Tuple[np.ndarray, List[Metrics]]:
+    """
+    Selesaikan batch board (array (B, N, N) atau sequence list of list).
+    1. propagate_batch per chunk (vektor, tanpa loop Python per board)
+    2. board yang belum lengkap (dan tidak kontradiksi) -> `fallback`
+       (signature solver standar); fallback=None -> dibiarkan sebagian terisi.
+    Return (array solusi baru, Metrics per board). Input tidak diubah.
+    Metrics: time_ms = bagian rata-rata waktu propagasi chunk + waktu fallback,
+    recursion_steps = node search fallback (0 jika selesai oleh propagasi),
+    stop_reason = "contradiction" untuk board yang terbukti tidak konsisten.
+    """
+    original = np.array(boards, dtype=np.int16, copy=True)
+    grid = original.copy()
+    if grid.ndim != 3 or grid.shape[1] != grid.shape[2]:
+        raise ValueError(f"boards harus berbentuk (B, N, N), bukan {grid.shape}")
+    B = grid.shape[0]
+    metrics = [Metrics() for _ in range(B)]
+
+    for lo in range(0, B, chunk_size):
+        hi = min(lo + chunk_size, B)
+        start = time.perf_counter()
+        chunk = grid[lo:hi]
+        _, dead = propagate_batch(chunk, max_rounds)
+        share_ms = (time.perf_counter() - start) * 1000.0 / (hi - lo)
+
+        solved = (chunk != 0).all(axis=(1, 2)) & ~dead
+        for k in range(hi - lo):
+            m = metrics[lo + k]
+            m.time_ms = share_ms
+            if dead[k]:
+                m.stop_reason = "contradiction"
+            elif solved[k]:
+                m.success = True
+            elif fallback is not None:
+                board = chunk[k].tolist()
+                t0 = time.perf_counter()
+                m.success = bool(fallback(board, m, timeout_sec, t0))
+                m.time_ms += (time.perf_counter() - t0) * 1000.0
+                chunk[k] = board
+
+        # cek solusi sekaligus untuk satu chunk; waktunya dibagi rata ke validate_ms
+        start = time.perf_counter()
+        valid = validate_batch(chunk, original[lo:hi])
+        share_ms = (time.perf_counter() - start) * 1000.0 / (hi - lo)
+        for k in range(hi - lo):
+            m = metrics[lo + k]
+            if m.success:
+                m.valid = valid[k]
+                m.validate_ms = share_ms
+
+    return grid, metrics
+
+
+def load_array(path: str, n: Optional[int] = None) -> np.ndarray:
+    """
+    Semua puzzle di file sebagai array (B, N, N).
+    File biner puzzle_bin dibaca langsung ke array (tanpa parsing teks),
+    file teks lewat iter_puzzles.
+    """
+    if is_puzzle_bin(path):
+        with PuzzleBinReader(path) as reader:
+            size, count = reader.n, len(reader)
+        data = np.fromfile(path, dtype=np.uint8, count=count * size * size, offset=HEADER.size)
+        return data.reshape(count, size, size)
+    return np.array(list(iter_puzzles(path, n)), dtype=np.int16)
+
+
+def summarize_batch(metrics: Sequence[Metrics]) -> dict:
+    return {
+        "boards": len(metrics),
+        "solved": sum(1 for m in metrics if m.success),
+        "invalid": sum(1 for m in metrics if m.valid is False),
+        "by_propagation": sum(1 for m in metrics if m.success and m.recursion_steps == 0),
+        "contradiction": sum(1 for m in metrics if m.stop_reason == "contradiction"),
+        "total_ms": sum(m.time_ms for m in metrics),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch solve puzzle Sudoku (NumPy)")
+    parser.add_argument("src", help="File puzzle (txt / txt.gz / biner puzzle_bin)")
+    parser.add_argument("--n", type=int, default=None)
+    parser.add_argument("--out", default=None, help="Tulis solusi ke file biner ini")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--chunk", type=int, default=DEFAULT_CHUNK)
+    args = parser.parse_args()
+
+    boards = load_array(args.src, args.n)
+    solved, metrics = solve_batch(boards, timeout_sec=args.timeout, chunk_size=args.chunk)
+    print(summarize_batch(metrics))
+
+    if args.out:
+        if os.path.exists(args.out):
+            os.remove(args.out)
+        with PuzzleBinWriter(args.out, solved.shape[1]) as writer:
+            for board in solved.astype(np.uint8):
+                writer.write(board.tobytes())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,104 +1,611 @@
 # benchmark.py
+import argparse
 import csv
+import os
+import statistics
 import time
-import tracemalloc
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import multiprocessing as mp
+from functools import partial
+from dataclasses import dataclass
+from typing import Optional
 import psutil
 
-from sudoku_core import parse_puzzle, clone_board
+from sudoku_core import clone_board, iter_puzzles, validate_board
 from solver_dfs import solve_dfs
 from solver_csp import solve_csp
 from solver_dlx import solve_dlx
-from metrics import Metrics  
+from solver_dlx_links import solve_dlx_links
+from metrics import Metrics, read_vmhwm_kb, run_with_metrics
+from puzzle_bin import PuzzleBinReader, is_puzzle_bin
+from puzzle_generator import count_clues, generate_puzzle, grade_puzzle
+from parallel_search import make_parallel_solver
+from portfolio import solve_portfolio
+from solution_cache import CachedSolver
+from native_backend import BACKEND, solve_dfs_native, solve_dlx_native
 
 
 SOLVERS = {
     "dfs": solve_dfs,
     "csp": solve_csp,
     "dlx": solve_dlx,
+    "dlx_links": solve_dlx_links,
+    # engine stack eksplisit (hasil & node sama, tanpa batas rekursi)
+    "dfs_iter": partial(solve_dfs, iterative=True),
+    "csp_iter": partial(solve_csp, iterative=True),
+    "dlx_iter": partial(solve_dlx, iterative=True),
+    # matrix penuh tanpa preprocessing singles, pembanding untuk "dlx"
+    "dlx_full": partial(solve_dlx, preprocess=False),
+    "dlx_links_iter": partial(solve_dlx_links, iterative=True),
+    # loop search di C (_sudoku_native) jika sudah di-build, selain itu fallback Python
+    "dfs_native": solve_dfs_native,
+    "dlx_native": solve_dlx_native,
+    "portfolio": solve_portfolio,
+    # cache solusi di memori; tiap proses (worker pool / child --isolate) punya cache
+    # sendiri, jadi hit hanya muncul untuk puzzle berulang/isomorfik di proses yang sama
+    "dlx_links_cached": CachedSolver(solve_dlx_links),
 }
 
+# run set default; varian lain (iterative, dlx_full, native, portfolio, cached) dipilih lewat --solvers
+DEFAULT_SOLVERS = ("dfs", "csp", "dlx", "dlx_links")
 
-def load_puzzles_from_file(path: str, n: int) -> list:
+# konfigurasi pipeline propagasi CSP (ac3 / naked singles selalu aktif)
+CSP_CONFIGS = {
+    "ac3": (),
+    "hidden_singles": ("hidden_singles",),
+    "singles_pairs": ("hidden_singles", "naked_pairs", "hidden_pairs"),
+    "singles_box_line": ("hidden_singles", "box_line"),
+    "all": ("hidden_singles", "naked_pairs", "hidden_pairs", "box_line"),
+}
+
+
+def make_csp_solver(propagators):
+    """Solver CSP dengan signature standar, memakai stage propagasi tertentu."""
+    return partial(solve_csp, propagators=tuple(propagators))
+
+
+def iter_puzzle_source(path: str, n: int = None):
+    """Puzzle satu per satu dari file teks (iter_puzzles) atau file biner puzzle_bin."""
+    if is_puzzle_bin(path):
+        with PuzzleBinReader(path) as reader:
+            yield from reader.iter_boards()
+    else:
+        yield from iter_puzzles(path, n)
+
+
+def load_puzzles_from_file(path: str, n: int = None) -> list:
     """
-    Membaca puzzle dari txt.
-    - Untuk 25x25: tiap baris berisi 25 angka dipisah spasi, 25 baris per puzzle.
+    Semua puzzle di file sebagai list (untuk yang perlu mengulang puzzle, mis. benchmark_suite).
+    Runner benchmark sendiri memakai iter_puzzle_source supaya streaming.
     """
-    with open(path) as f:
-        lines = [line.rstrip("\n") for line in f if line.strip()]
+    return list(iter_puzzle_source(path, n))
+
 
-    puzzles = []
-    for i in range(0, len(lines), n):
-        chunk = lines[i:i + n]
-        if len(chunk) == n:
-            puzzles.append(parse_puzzle(chunk))
-    return puzzles
+@dataclass(frozen=True)
+class RunOptions:
+    """Opsi satu job benchmark (ikut dikirim ke worker / child process)."""
+    timeout_sec: float = 30.0
+    max_nodes: Optional[int] = None
+    mode: str = "time"            # "time" atau "memory", lihat metrics.MEASURE_MODES
+    trace_python: bool = False    # tracemalloc (hanya di mode memory)
 
 
-def run_with_metrics_rss(solver_func, board, timeout_sec: float) -> Metrics:
+def run_with_metrics_rss(solver_func, board, timeout_sec: float, max_nodes: int = None,
+                         mode: str = "time", trace_python: bool = False) -> Metrics:
     """
     Mengukur:
     - waktu (ms)
     - recursion_steps (diisi solver)
     - success (solver True/False)
-    - py_peak_kb (tracemalloc peak)
-    - rss_kb (RSS proses via psutil; bytes -> KB)
+    - py_peak_kb (tracemalloc peak, hanya mode="memory" + trace_python)
+    - rss_kb (puncak RSS dari sampler background, hanya mode="memory")
+    max_nodes: batas node (Budget) supaya hasil reproducible lintas mesin.
+    Run timing dan run memori dipisah supaya time_ms tidak terdistorsi tracing.
+    """
+    return run_with_metrics(solver_func, board, timeout_sec, max_nodes=max_nodes,
+                            mode=mode, trace_python=trace_python)
+
+
+FIELDNAMES = [
+    "solver", "puzzle_id", "success", "status", "valid",
+    "time_ms", "recursion_steps", "nodes_per_sec",
+    "py_peak_kb", "rss_kb", "validate_ms",
+    "backend", "winner", "winner_ms", "cache_hits", "cache_misses",
+    # ukuran & waktu bangun matrix exact cover solve_dlx (kosong untuk solver lain)
+    "matrix_rows_before", "matrix_cols_before", "matrix_rows_after", "matrix_cols_after",
+    "build_ms",
+]
+
+
+# waktu tambahan setelah timeout sebelum child di-kill (solver biasanya berhenti sendiri lebih dulu)
+KILL_GRACE_SEC = 1.0
+# interval parent mengecek waktu & RSS child
+WATCH_INTERVAL_SEC = 0.05
+
+
+def job_status(metrics: Metrics, timeout_sec: float) -> str:
+    """ok / invalid / timeout / node_limit / fail untuk job yang selesai normal (tidak di-kill)."""
+    if metrics.success:
+        return "invalid" if metrics.valid is False else "ok"
+    if metrics.stop_reason == "nodes":
+        return "node_limit"
+    if metrics.stop_reason == "time" or metrics.time_ms >= timeout_sec * 1000.0:
+        return "timeout"
+    return "fail"
+
+
+def metrics_row(solver_name: str, pid: int, metrics: Metrics, status: str = None) -> dict:
+    """Satu baris CSV hasil benchmark."""
+    nodes_per_sec = (metrics.recursion_steps / (metrics.time_ms / 1000.0)
+                     if metrics.time_ms > 0 else 0.0)
+    return {
+        "solver": solver_name,
+        "puzzle_id": pid,
+        "success": int(metrics.success),
+        "status": status if status is not None else ("ok" if metrics.success else "fail"),
+        "valid": "" if metrics.valid is None else int(metrics.valid),
+        "time_ms": f"{metrics.time_ms:.3f}",
+        "recursion_steps": int(metrics.recursion_steps),
+        "nodes_per_sec": f"{nodes_per_sec:.1f}",
+        "py_peak_kb": _fmt_kb(metrics.peak_memory_kb),
+        "rss_kb": _fmt_kb(metrics.peak_rss_kb),
+        "validate_ms": f"{metrics.validate_ms:.3f}",
+        "backend": metrics.backend or "python",
+        "winner": metrics.winner,
+        "winner_ms": "" if metrics.winner_ms is None else f"{metrics.winner_ms:.3f}",
+        "cache_hits": metrics.cache_hits,
+        "cache_misses": metrics.cache_misses,
+        **matrix_columns(metrics),
+    }
+
+
+def matrix_columns(metrics: Metrics) -> dict:
+    """Kolom CSV ukuran matrix exact cover sebelum / sesudah preprocessing + waktu bangunnya."""
+    if metrics.matrix_before is None:
+        return {}
+    rows_after, cols_after = metrics.matrix_after
+    rows_before, cols_before = metrics.matrix_before
+    return {
+        "matrix_rows_before": rows_before,
+        "matrix_cols_before": cols_before,
+        "matrix_rows_after": rows_after,
+        "matrix_cols_after": cols_after,
+        "build_ms": f"{metrics.build_ms:.3f}",
+    }
+
+
+def _fmt_kb(value: Optional[float]) -> str:
+    # kolom memori kosong jika tidak diukur (mode="time")
+    return "" if value is None else f"{value:.1f}"
+
+
+def check_solution(metrics: Metrics, board, puzzle) -> None:
+    """
+    Validasi board hasil solver (hanya jika solver melapor sukses): semua unit
+    tanpa duplikat dan clue `puzzle` tetap. Waktunya masuk validate_ms, bukan time_ms.
+    """
+    if not metrics.success:
+        return
+    start = time.perf_counter()
+    metrics.valid = validate_board(board, puzzle)
+    metrics.validate_ms = (time.perf_counter() - start) * 1000.0
+
+
+def pin_to_cpus(cpus) -> None:
+    """Pin proses saat ini ke core tertentu (Linux), supaya timing serial vs paralel bisa dibandingkan."""
+    if cpus:
+        os.sched_setaffinity(0, set(cpus))
+
+
+def benchmark(txt_path: str, csv_out: str, n: int, timeout_sec: float = 30.0, cpus=None,
+              solver_names=None, isolate: bool = False, mem_limit_kb: float = None,
+              max_nodes: int = None, mode: str = "time", trace_python: bool = False):
+    """
+    Runner serial: semua (puzzle, solver) dijalankan berurutan.
+    isolate=True: tiap job jalan di child process dengan kill wall-clock
+    dan batas RSS (mem_limit_kb), lihat run_job_isolated.
+    max_nodes: hentikan tiap solve setelah sejumlah node (reproducible).
+    mode: "time" (default, tanpa pengukuran memori) atau "memory".
+    solver_names: nama di SOLVERS (default: DEFAULT_SOLVERS).
+    """
+    options = RunOptions(timeout_sec, max_nodes, mode, trace_python)
+    pin_to_cpus(cpus)
+    puzzles = iter_puzzle_source(txt_path, n)
+
+    with open(csv_out, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDNAMES)
+        writer.writeheader()  
+
+        for job in iter_jobs(puzzles, options, solver_names):
+            if isolate:
+                writer.writerow(run_job_isolated(job, mem_limit_kb))
+            else:
+                writer.writerow(run_job(job))
+            f.flush()
+
+
+def run_job(job) -> dict:
+    """
+    Worker untuk runner paralel: job = (puzzle_id, solver_name, puzzle, RunOptions).
+    Metrics dikumpulkan sendiri di proses worker lewat run_with_metrics_rss.
     """
-    metrics = Metrics()
+    pid, solver_name, puzzle, opts = job
+    board = clone_board(puzzle)
+    metrics = run_with_metrics_rss(SOLVERS[solver_name], board, opts.timeout_sec, opts.max_nodes,
+                                   opts.mode, opts.trace_python)
+    check_solution(metrics, board, puzzle)
+    return metrics_row(solver_name, pid, metrics, job_status(metrics, opts.timeout_sec))
 
-    proc = psutil.Process()
-    rss_before = proc.memory_info().rss  
 
-    tracemalloc.start()
-    start_time = time.perf_counter()
+def _isolated_child(conn, solver_name: str, puzzle, opts: RunOptions, cpus) -> None:
+    pin_to_cpus(cpus)
+    try:
+        board = clone_board(puzzle)
+        metrics = run_with_metrics_rss(SOLVERS[solver_name], board, opts.timeout_sec,
+                                       opts.max_nodes, opts.mode, opts.trace_python)
+        check_solution(metrics, board, puzzle)
+        if opts.mode == "memory":
+            # child baru hanya menjalankan satu solve -> VmHWM = puncak RSS job ini
+            vmhwm = read_vmhwm_kb()
+            if vmhwm is not None:
+                metrics.peak_rss_kb = max(metrics.peak_rss_kb or 0.0, vmhwm)
+        conn.send(("done", metrics))
+    except MemoryError:
+        conn.send(("oom", None))
+    finally:
+        conn.close()
 
-    success = solver_func(board, metrics, timeout_sec, start_time)
 
-    end_time = time.perf_counter()
-    _, py_peak = tracemalloc.get_traced_memory()
-    tracemalloc.stop()
+def _recv_result(conn) -> tuple:
+    """Pesan child -> (status, metrics); status None = selesai normal."""
+    kind, metrics = conn.recv()
+    return ("oom" if kind == "oom" else None), metrics
 
-    rss_after = proc.memory_info().rss
-    rss_est_peak = max(rss_before, rss_after)
 
-    metrics.time_ms = (end_time - start_time) * 1000.0
-    metrics.success = success
+def run_job_isolated(job, mem_limit_kb: float = None, cpus=None) -> dict:
+    """
+    Jalankan satu job di child process yang diawasi dari luar:
+    - di-kill jika wall-clock melewati timeout_sec + KILL_GRACE_SEC
+      (termasuk setup seperti sudoku_to_exact_cover atau AC-3 awal yang panjang)
+    - di-kill jika RSS child melewati mem_limit_kb
+    Job yang di-kill dicatat dengan status timeout / oom, bukan menggantung batch.
+    """
+    pid, solver_name, puzzle, opts = job
+    timeout_sec = opts.timeout_sec
+    parent_conn, child_conn = mp.Pipe(duplex=False)
+    child = mp.Process(target=_isolated_child,
+                       args=(child_conn, solver_name, puzzle, opts, cpus))
+    start = time.perf_counter()
+    child.start()
+    child_conn.close()
+
+    status = None
+    metrics = None
+    peak_rss = 0
+    try:
+        proc = psutil.Process(child.pid)
+        while True:
+            if parent_conn.poll(WATCH_INTERVAL_SEC):
+                status, metrics = _recv_result(parent_conn)
+                break
+            if not child.is_alive():
+                # child bisa send lalu exit di antara poll dan is_alive: cek pipe sekali lagi
+                status = "error"
+                try:
+                    if parent_conn.poll(0):
+                        status, metrics = _recv_result(parent_conn)
+                except EOFError:
+                    pass
+                break
+            if time.perf_counter() - start > timeout_sec + KILL_GRACE_SEC:
+                status = "timeout"
+                break
+            try:
+                peak_rss = max(peak_rss, proc.memory_info().rss)
+            except psutil.NoSuchProcess:
+                continue
+            if mem_limit_kb is not None and peak_rss / 1024.0 > mem_limit_kb:
+                status = "oom"
+                break
+    except (EOFError, psutil.NoSuchProcess):
+        status = status or "error"
+    finally:
+        if child.is_alive():
+            child.kill()
+        child.join()
+        parent_conn.close()
+
+    if metrics is None:
+        metrics = Metrics(measure_mode=opts.mode)
+        metrics.time_ms = (time.perf_counter() - start) * 1000.0
+        metrics.peak_rss_kb = peak_rss / 1024.0
+        return metrics_row(solver_name, pid, metrics, status)
 
+    if opts.mode == "memory":
+        metrics.peak_rss_kb = max(metrics.peak_rss_kb or 0.0, peak_rss / 1024.0)
+    return metrics_row(solver_name, pid, metrics, status or job_status(metrics, timeout_sec))
 
-    metrics.py_peak_kb = py_peak / 1024.0
-    metrics.rss_kb = rss_est_peak / 1024.0
-    return metrics
 
+def iter_jobs(puzzles, options: RunOptions, solver_names=None):
+    solver_names = list(DEFAULT_SOLVERS) if solver_names is None else solver_names
+    for pid, puzzle in enumerate(puzzles):
+        for solver_name in solver_names:
+            yield pid, solver_name, puzzle, options
 
-def benchmark(txt_path: str, csv_out: str, n: int, timeout_sec: float = 30.0):
-    puzzles = load_puzzles_from_file(txt_path, n)
+
+def benchmark_parallel(txt_path: str, csv_out: str, n: int, timeout_sec: float = 30.0,
+                       workers: int = None, cpus=None, solver_names=None,
+                       isolate: bool = False, mem_limit_kb: float = None, max_nodes: int = None,
+                       mode: str = "time", trace_python: bool = False):
+    """
+    Runner paralel: job (puzzle_id, solver) dibagi ke ProcessPoolExecutor.
+    Hasil ditulis ke CSV sesuai urutan job (sama dengan runner serial),
+    dengan jumlah job in-flight dibatasi supaya tidak semua puzzle di-submit sekaligus.
+    cpus: core untuk worker (mis. semua core kecuali yang dipakai runner serial).
+    isolate=True: tiap job tetap di child process sendiri (run_job_isolated);
+    pool-nya cukup thread karena thread hanya mengawasi child.
+    """
+    puzzles = iter_puzzle_source(txt_path, n)
+    options = RunOptions(timeout_sec, max_nodes, mode, trace_python)
+    workers = workers or (len(cpus) if cpus else os.cpu_count() or 1)
+    max_in_flight = 2 * workers
+
+    if isolate:
+        pool = ThreadPoolExecutor(max_workers=workers)
+        submit = partial(pool.submit, run_job_isolated, mem_limit_kb=mem_limit_kb, cpus=cpus)
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=pin_to_cpus, initargs=(cpus,))
+        submit = partial(pool.submit, run_job)
+
+    with open(csv_out, "w", newline="") as f, pool:
+        writer = csv.DictWriter(f, fieldnames=FIELDNAMES)
+        writer.writeheader()
+
+        pending = deque()
+        for job in iter_jobs(puzzles, options, solver_names):
+            pending.append(submit(job))
+            if len(pending) >= max_in_flight:
+                writer.writerow(pending.popleft().result())
+                f.flush()
+        while pending:
+            writer.writerow(pending.popleft().result())
+            f.flush()
+
+
+def benchmark_propagators(txt_path: str, csv_out: str, n: int, timeout_sec: float = 30.0,
+                          configs: dict = None, max_nodes: int = None):
+    """
+    Jalankan CSP dengan setiap konfigurasi propagasi di CSP_CONFIGS
+    (atau `configs`), supaya terlihat aturan mana yang paling memangkas search.
+    """
+    configs = CSP_CONFIGS if configs is None else configs
+    puzzles = iter_puzzle_source(txt_path, n)
 
     fieldnames = [
-        "solver", "puzzle_id", "success",
-        "time_ms", "recursion_steps",
-        "py_peak_kb", "rss_kb"
+        "config", "propagators", "puzzle_id", "success", "valid",
+        "time_ms", "recursion_steps", "nodes_per_sec",
     ]
 
     with open(csv_out, "w", newline="") as f:
         writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()  
+        writer.writeheader()
 
         for pid, puzzle in enumerate(puzzles):
-            for solver_name, solver_func in SOLVERS.items():
+            for config_name, propagators in configs.items():
                 board = clone_board(puzzle)
-                metrics = run_with_metrics_rss(solver_func, board, timeout_sec)
+                metrics = run_with_metrics_rss(make_csp_solver(propagators), board, timeout_sec,
+                                               max_nodes)
+                check_solution(metrics, board, puzzle)
+                nodes_per_sec = (metrics.recursion_steps / (metrics.time_ms / 1000.0)
+                                 if metrics.time_ms > 0 else 0.0)
 
                 writer.writerow({
-                    "solver": solver_name,
+                    "config": config_name,
+                    "propagators": "+".join(("naked_singles",) + tuple(propagators)),
                     "puzzle_id": pid,
                     "success": int(metrics.success),
+                    "valid": "" if metrics.valid is None else int(metrics.valid),
                     "time_ms": f"{metrics.time_ms:.3f}",
                     "recursion_steps": int(metrics.recursion_steps),
-                    "py_peak_kb": f"{metrics.py_peak_kb:.1f}",
-                    "rss_kb": f"{metrics.rss_kb:.1f}",
+                    "nodes_per_sec": f"{nodes_per_sec:.1f}",
                 })
 
 
-if __name__ == "__main__":
-    benchmark("puzzles_25x25.txt", "results_25x25_120.csv", n=25, timeout_sec=120.0)
-    benchmark("puzzles_25x25.txt", "results_25x25_300.csv", n=25, timeout_sec=300.0)
+# solver serial -> engine parallel_search yang memecah pohon search yang sama
+PARALLEL_ENGINES = {
+    "dlx": "dlx",
+    "dlx_links": "dlx_links",
+    "csp": "csp",
+}
+
+SPEEDUP_FIELDNAMES = [
+    "solver", "puzzle_id", "workers",
+    "serial_status", "serial_ms", "serial_steps",
+    "parallel_status", "parallel_ms", "parallel_steps", "speedup",
+]
+
+
+def benchmark_speedup(txt_path: str, csv_out: str, n: int, timeout_sec: float = 30.0,
+                      workers: int = None, solver_names=None, max_nodes: int = None):
+    """
+    Bandingkan solver serial dengan versi parallel_search (pohon dipecah ke
+    `workers` proses) per puzzle. speedup = serial_ms / parallel_ms; parallel_steps
+    mencakup node semua worker, termasuk subtree yang dibatalkan.
+    """
+    solver_names = list(PARALLEL_ENGINES) if solver_names is None else solver_names
+    workers = workers or os.cpu_count() or 1
 
+    with open(csv_out, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=SPEEDUP_FIELDNAMES)
+        writer.writeheader()
+
+        for pid, puzzle in enumerate(iter_puzzle_source(txt_path, n)):
+            for solver_name in solver_names:
+                serial = run_with_metrics_rss(SOLVERS[solver_name], clone_board(puzzle),
+                                              timeout_sec, max_nodes)
+                parallel_solver = make_parallel_solver(PARALLEL_ENGINES[solver_name], workers)
+                board = clone_board(puzzle)
+                parallel = run_with_metrics_rss(parallel_solver, board, timeout_sec, max_nodes)
+                check_solution(parallel, board, puzzle)
+                speedup = serial.time_ms / parallel.time_ms if parallel.time_ms > 0 else 0.0
+                writer.writerow({
+                    "solver": solver_name,
+                    "puzzle_id": pid,
+                    "workers": workers,
+                    "serial_status": job_status(serial, timeout_sec),
+                    "serial_ms": f"{serial.time_ms:.3f}",
+                    "serial_steps": serial.recursion_steps,
+                    "parallel_status": job_status(parallel, timeout_sec),
+                    "parallel_ms": f"{parallel.time_ms:.3f}",
+                    "parallel_steps": parallel.recursion_steps,
+                    "speedup": f"{speedup:.2f}",
+                })
+                f.flush()
+                print(f"{solver_name:<10} puzzle {pid}: serial {serial.time_ms:.1f} ms, "
+                      f"parallel({workers}) {parallel.time_ms:.1f} ms -> x{speedup:.2f}")
+
+
+SCALING_FIELDNAMES = [
+    "n", "clue_fraction", "clues", "grade", "seed", "solver", "success", "status", "valid",
+    "time_ms", "recursion_steps", "nodes_per_sec",
+]
+
+
+def benchmark_scaling(csv_out: str, sizes=(9, 16, 25), clue_fractions=(0.45, 0.35),
+                      per_setting: int = 3, seed: int = 0, timeout_sec: float = 30.0,
+                      max_nodes: int = None, solver_names=None) -> dict:
+    """
+    Sweep ukuran N x jumlah clue di atas puzzle dari puzzle_generator
+    (seed = seed + k per puzzle, jadi sweep reproducible).
+    Clue = round(fraksi * N * N); generator bisa berhenti di atas target jika
+    tidak ada sel lagi yang bisa dihapus tanpa kehilangan keunikan.
+    Return median time_ms / recursion_steps per (solver, n), juga dicetak
+    supaya kurva pertumbuhan per solver langsung terlihat.
+    """
+    solver_names = list(DEFAULT_SOLVERS) if solver_names is None else solver_names
+    options = RunOptions(timeout_sec, max_nodes)
+    samples = defaultdict(list)
+
+    with open(csv_out, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=SCALING_FIELDNAMES)
+        writer.writeheader()
+
+        for n in sizes:
+            for fraction in clue_fractions:
+                for k in range(per_setting):
+                    puzzle_seed = seed + k
+                    puzzle, _ = generate_puzzle(n, round(fraction * n * n), seed=puzzle_seed)
+                    clues = count_clues(puzzle)
+                    grade = grade_puzzle(puzzle)
+                    for solver_name in solver_names:
+                        row = run_job((puzzle_seed, solver_name, puzzle, options))
+                        samples[solver_name, n].append(
+                            (float(row["time_ms"]), row["recursion_steps"]))
+                        writer.writerow({
+                            "n": n,
+                            "clue_fraction": fraction,
+                            "clues": clues,
+                            "grade": grade,
+                            "seed": puzzle_seed,
+                            "solver": solver_name,
+                            "success": row["success"],
+                            "status": row["status"],
+                            "valid": row["valid"],
+                            "time_ms": row["time_ms"],
+                            "recursion_steps": row["recursion_steps"],
+                            "nodes_per_sec": row["nodes_per_sec"],
+                        })
+                        f.flush()
+
+    growth = {}
+    print(f"{'solver':<12} {'n':>4} {'median_ms':>12} {'median_nodes':>14}")
+    for (solver_name, n), values in samples.items():
+        median_ms = statistics.median(t for t, _ in values)
+        median_nodes = statistics.median(s for _, s in values)
+        growth[solver_name, n] = (median_ms, median_nodes)
+        print(f"{solver_name:<12} {n:>4} {median_ms:>12.2f} {median_nodes:>14.0f}")
+    return growth
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--puzzles", default="puzzles_25x25.txt", help="File puzzle")
+    parser.add_argument("--n", type=int, default=25, help="Ukuran grid")
+    parser.add_argument("--timeouts", type=float, nargs="+", default=[120.0, 300.0],
+                        help="Timeout (detik); satu CSV per timeout")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="0 = runner serial (satu proses), >0 = jumlah worker paralel")
+    parser.add_argument("--cpus", type=int, nargs="*", default=None,
+                        help="Pin runner (atau worker paralel) ke core ini")
+    parser.add_argument("--isolate", action="store_true",
+                        help="Jalankan tiap job di child process dengan kill timeout / batas RSS")
+    parser.add_argument("--mem-limit-kb", type=float, default=None,
+                        help="Batas RSS per job (KB), hanya dengan --isolate")
+    parser.add_argument("--max-nodes", type=int, default=None,
+                        help="Batas node per solve (hasil reproducible lintas mesin)")
+    parser.add_argument("--mode", choices=["time", "memory"], default="time",
+                        help="time = ukur waktu saja; memory = sampling RSS (run terpisah)")
+    parser.add_argument("--trace-python", action="store_true",
+                        help="Aktifkan tracemalloc (py_peak_kb) di mode memory")
+    parser.add_argument("--out-prefix", default="results",
+                        help="Prefix nama CSV output (default: results)")
+    parser.add_argument("--scaling", action="store_true",
+                        help="Sweep puzzle hasil generator (--sizes x --clue-fractions), bukan --puzzles")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[9, 16, 25])
+    parser.add_argument("--clue-fractions", type=float, nargs="+", default=[0.45, 0.35])
+    parser.add_argument("--per-setting", type=int, default=3,
+                        help="Jumlah puzzle per (N, fraksi clue)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--speedup", action="store_true",
+                        help="Bandingkan solver serial vs parallel_search (--workers proses per puzzle)")
+    parser.add_argument("--propagators", action="store_true",
+                        help="Bandingkan konfigurasi propagasi CSP per puzzle (CSV per konfigurasi)")
+    parser.add_argument("--csp-configs", nargs="+", choices=list(CSP_CONFIGS), default=None,
+                        help="Dengan --propagators: konfigurasi dari CSP_CONFIGS (default: semua)")
+    parser.add_argument("--solvers", nargs="+", choices=list(SOLVERS), default=None,
+                        help=f"Solver yang dijalankan (default: {' '.join(DEFAULT_SOLVERS)})")
+    args = parser.parse_args()
+    print(f"Backend solver native: {BACKEND}")
+
+    if args.propagators:
+        configs = None
+        if args.csp_configs is not None:
+            configs = {name: CSP_CONFIGS[name] for name in args.csp_configs}
+        for timeout_sec in args.timeouts:
+            benchmark_propagators(args.puzzles,
+                                  f"{args.out_prefix}_propagators_{args.n}x{args.n}_{timeout_sec:g}.csv",
+                                  args.n, timeout_sec, configs, args.max_nodes)
+        return
+
+    if args.speedup:
+        for timeout_sec in args.timeouts:
+            benchmark_speedup(args.puzzles, f"{args.out_prefix}_speedup_{args.n}x{args.n}_{timeout_sec:g}.csv",
+                              args.n, timeout_sec, args.workers or None, max_nodes=args.max_nodes)
+        return
+
+    if args.scaling:
+        for timeout_sec in args.timeouts:
+            benchmark_scaling(f"{args.out_prefix}_scaling_{timeout_sec:g}.csv",
+                              args.sizes, args.clue_fractions, args.per_setting,
+                              args.seed, timeout_sec, args.max_nodes, args.solvers)
+        return
+
+    for timeout_sec in args.timeouts:
+        csv_out = f"{args.out_prefix}_{args.n}x{args.n}_{timeout_sec:g}.csv"
+        if args.workers > 0:
+            benchmark_parallel(args.puzzles, csv_out, n=args.n, timeout_sec=timeout_sec,
+                               workers=args.workers, cpus=args.cpus, solver_names=args.solvers,
+                               isolate=args.isolate, mem_limit_kb=args.mem_limit_kb,
+                               max_nodes=args.max_nodes, mode=args.mode,
+                               trace_python=args.trace_python)
+        else:
+            benchmark(args.puzzles, csv_out, n=args.n, timeout_sec=timeout_sec, cpus=args.cpus,
+                      solver_names=args.solvers,
+                      isolate=args.isolate, mem_limit_kb=args.mem_limit_kb,
+                      max_nodes=args.max_nodes, mode=args.mode,
+                      trace_python=args.trace_python)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+# benchmark_suite.py
+"""
+Benchmark suite: warmup, N repetisi, kontrol GC, dan statistik
+(median / p95 / stddev / bootstrap CI) per solver dan per puzzle.
+Ringkasan ditulis sebagai JSON supaya bisa di-diff dengan baseline
+tersimpan untuk menangkap regresi performa.
+
+Contoh:
+    python benchmark_suite.py --repeat 10 --out summary.json
+    python benchmark_suite.py --repeat 10 --out new.json --baseline summary.json
+"""
+import argparse
+import gc
+import json
+import math
+import platform
+import random
+import statistics
+import sys
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from sudoku_core import clone_board
+from benchmark import DEFAULT_SOLVERS, SOLVERS, load_puzzles_from_file, run_with_metrics_rss
+
+GC_MODES = ("disable", "collect", "none")
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Percentile dengan interpolasi linear (q di 0..100)."""
+    data = sorted(values)
+    if not data:
+        return math.nan
+    k = (len(data) - 1) * q / 100.0
+    lo = math.floor(k)
+    hi = math.ceil(k)
+    if lo == hi:
+        return data[lo]
+    return data[lo] + (data[hi] - data[lo]) * (k - lo)
+
+
+def bootstrap_ci(values: Sequence[float],
+                 stat: Callable[[Sequence[float]], float] = statistics.median,
+                 n_resamples: int = 1000,
+                 confidence: float = 0.95,
+                 seed: int = 0) -> Tuple[float, float]:
+    """Bootstrap percentile CI untuk `stat` (default median). Seed tetap -> hasil deterministik."""
+    if len(values) < 2:
+        v = values[0] if values else math.nan
+        return v, v
+    rng = random.Random(seed)
+    n = len(values)
+    stats = [stat([values[rng.randrange(n)] for _ in range(n)]) for _ in range(n_resamples)]
+    alpha = (1.0 - confidence) / 2.0
+    return percentile(stats, 100.0 * alpha), percentile(stats, 100.0 * (1.0 - alpha))
+
+
+def summarize(values: Sequence[float], seed: int = 0) -> Dict[str, float]:
+    ci_low, ci_high = bootstrap_ci(values, seed=seed)
+    return {
+        "n": len(values),
+        "mean": statistics.fmean(values) if values else math.nan,
+        "median": statistics.median(values) if values else math.nan,
+        "p95": percentile(values, 95.0),
+        "stddev": statistics.stdev(values) if len(values) > 1 else 0.0,
+        "min": min(values) if values else math.nan,
+        "max": max(values) if values else math.nan,
+        "ci_low": ci_low,
+        "ci_high": ci_high,
+    }
+
+
+def timed_run(solver_func, puzzle, timeout_sec: float, max_nodes: Optional[int], gc_mode: str):
+    board = clone_board(puzzle)
+    if gc_mode in ("disable", "collect"):
+        gc.collect()
+    if gc_mode == "disable":
+        gc.disable()
+    try:
+        return run_with_metrics_rss(solver_func, board, timeout_sec, max_nodes)
+    finally:
+        if gc_mode == "disable":
+            gc.enable()
+
+
+def run_suite(txt_path: str, n: int,
+              solver_names: Optional[List[str]] = None,
+              timeout_sec: float = 30.0,
+              warmup: int = 1,
+              repeat: int = 5,
+              gc_mode: str = "disable",
+              max_nodes: Optional[int] = None,
+              seed: int = 0) -> dict:
+    """
+    Untuk setiap (puzzle, solver): `warmup` run dibuang, lalu `repeat` run diukur
+    (mode waktu, tanpa tracemalloc). Hasil: statistik time_ms per puzzle dan per solver.
+    """
+    if gc_mode not in GC_MODES:
+        raise ValueError(f"gc_mode harus salah satu dari {GC_MODES}")
+    solver_names = list(DEFAULT_SOLVERS) if solver_names is None else solver_names
+    puzzles = load_puzzles_from_file(txt_path, n)
+
+    per_puzzle: Dict[str, Dict[str, dict]] = {}
+    per_solver: Dict[str, dict] = {}
+
+    for solver_name in solver_names:
+        solver_func = SOLVERS[solver_name]
+        per_puzzle[solver_name] = {}
+        all_times: List[float] = []
+        successes = 0
+        runs = 0
+
+        for pid, puzzle in enumerate(puzzles):
+            for _ in range(warmup):
+                timed_run(solver_func, puzzle, timeout_sec, max_nodes, gc_mode)
+
+            times: List[float] = []
+            steps: List[int] = []
+            ok = 0
+            for _ in range(repeat):
+                metrics = timed_run(solver_func, puzzle, timeout_sec, max_nodes, gc_mode)
+                times.append(metrics.time_ms)
+                steps.append(metrics.recursion_steps)
+                ok += int(metrics.success)
+
+            entry = summarize(times, seed)
+            entry["success_rate"] = ok / repeat
+            entry["recursion_steps_median"] = statistics.median(steps)
+            per_puzzle[solver_name][str(pid)] = entry
+
+            all_times.extend(times)
+            successes += ok
+            runs += repeat
+
+        entry = summarize(all_times, seed)
+        entry["success_rate"] = successes / runs if runs else math.nan
+        per_solver[solver_name] = entry
+
+    return {
+        "meta": {
+            "puzzles": txt_path,
+            "n": n,
+            "num_puzzles": len(puzzles),
+            "timeout_sec": timeout_sec,
+            "max_nodes": max_nodes,
+            "warmup": warmup,
+            "repeat": repeat,
+            "gc_mode": gc_mode,
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+        },
+        "per_solver": per_solver,
+        "per_puzzle": per_puzzle,
+    }
+
+
+def write_summary(summary: dict, path: str) -> None:
+    with open(path, "w") as f:
+        json.dump(summary, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load_summary(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare_to_baseline(summary: dict, baseline: dict, threshold: float = 0.10) -> List[dict]:
+    """
+    Bandingkan median time_ms dengan baseline. Dianggap regresi jika
+    median naik lebih dari `threshold` (relatif) DAN CI bootstrap tidak overlap
+    (ci_low sekarang > ci_high baseline), supaya noise tidak dilaporkan.
+    """
+    regressions = []
+
+    def check(key: str, cur: dict, base: dict) -> None:
+        if base["median"] <= 0:
+            return
+        ratio = cur["median"] / base["median"]
+        if ratio > 1.0 + threshold and cur["ci_low"] > base["ci_high"]:
+            regressions.append({
+                "key": key,
+                "baseline_median_ms": base["median"],
+                "current_median_ms": cur["median"],
+                "ratio": ratio,
+            })
+
+    for solver_name, cur in summary["per_solver"].items():
+        base = baseline.get("per_solver", {}).get(solver_name)
+        if base is not None:
+            check(solver_name, cur, base)
+        for pid, cur_p in summary["per_puzzle"].get(solver_name, {}).items():
+            base_p = baseline.get("per_puzzle", {}).get(solver_name, {}).get(pid)
+            if base_p is not None:
+                check(f"{solver_name}/puzzle {pid}", cur_p, base_p)
+
+    return regressions
+
+
+def print_summary(summary: dict) -> None:
+    print(f"{'solver':<12} {'median_ms':>12} {'p95_ms':>12} {'stddev':>10} {'95% CI':>25} {'success':>8}")
+    for solver_name, s in summary["per_solver"].items():
+        ci = f"[{s['ci_low']:.2f}, {s['ci_high']:.2f}]"
+        print(f"{solver_name:<12} {s['median']:>12.2f} {s['p95']:>12.2f} {s['stddev']:>10.2f} "
+              f"{ci:>25} {s['success_rate']:>8.2f}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark suite dengan repetisi dan statistik")
+    parser.add_argument("--puzzles", default="puzzles_25x25.txt")
+    parser.add_argument("--n", type=int, default=25)
+    parser.add_argument("--solvers", nargs="*", choices=list(SOLVERS), default=None,
+                        help="Default: benchmark.DEFAULT_SOLVERS")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--max-nodes", type=int, default=None)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--gc", choices=GC_MODES, default="disable",
+                        help="disable = gc.collect() lalu GC mati selama run (default)")
+    parser.add_argument("--out", default="benchmark_summary.json")
+    parser.add_argument("--baseline", default=None, help="Ringkasan JSON lama untuk deteksi regresi")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Kenaikan median relatif minimum untuk dianggap regresi")
+    args = parser.parse_args()
+
+    summary = run_suite(args.puzzles, args.n, args.solvers, args.timeout,
+                        args.warmup, args.repeat, args.gc, args.max_nodes)
+    write_summary(summary, args.out)
+    print_summary(summary)
+
+    if args.baseline:
+        regressions = compare_to_baseline(summary, load_summary(args.baseline), args.threshold)
+        for reg in regressions:
+            print(f"REGRESI {reg['key']}: {reg['baseline_median_ms']:.2f} ms -> "
+                  f"{reg['current_median_ms']:.2f} ms (x{reg['ratio']:.2f})")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
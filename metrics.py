@@ -1,41 +1,216 @@
 # metrics.py
+import threading
 import time
 import tracemalloc
 import psutil
 from dataclasses import dataclass
+from typing import Optional, Tuple
+
+# default: jam dicek sekali tiap 256 node search
+DEFAULT_CHECK_EVERY = 256
+# interval sampling RSS di background thread (detik)
+DEFAULT_SAMPLE_INTERVAL = 0.005
+
+# mode pengukuran: "time" = hanya waktu (tanpa tracemalloc/sampler),
+# "memory" = sampler RSS (+ tracemalloc jika trace_python=True)
+MEASURE_MODES = ("time", "memory")
 
 @dataclass
 class Metrics:
     recursion_steps: int = 0
     time_ms: float = 0.0
     success: bool = False
-    peak_memory_kb: float = 0.0     # tracemalloc peak (Python allocations)
-    peak_rss_kb: float = 0.0        # OS RSS peak (process resident set)
+    peak_memory_kb: Optional[float] = None  # tracemalloc peak (Python allocations), None = tidak diukur
+    peak_rss_kb: Optional[float] = None     # OS RSS peak (process resident set), None = tidak diukur
+    measure_mode: str = "time"
+    stop_reason: str = ""           # "" / "time" / "nodes" / "cancelled" (diisi dari Budget)
+    valid: Optional[bool] = None    # hasil validate_board pada solusi, None = tidak dicek
+    validate_ms: float = 0.0        # waktu validasi, terpisah dari time_ms solver
+    cache_hits: int = 0             # CachedSolver: dijawab dari cache
+    cache_misses: int = 0           # CachedSolver: solver asli dijalankan
+    solution_count: Optional[int] = None  # mode count_solutions (sampai limit), None = mode solve
+    winner: str = ""                # solve_portfolio: entry yang pertama menemukan solusi
+    winner_ms: Optional[float] = None       # solve_portfolio: waktu sampai jawaban pemenang
+    backend: str = ""               # "native" / "python" untuk solver native_backend, "" = Python biasa
+    matrix_before: Optional[Tuple[int, int]] = None  # solve_dlx: (baris, kolom) exact cover penuh
+    matrix_after: Optional[Tuple[int, int]] = None   # solve_dlx: (baris, kolom) yang benar-benar dibangun
+    build_ms: Optional[float] = None                 # solve_dlx: waktu sudoku_to_exact_cover (bagian dari time_ms)
 
-def run_with_metrics(solver_func, board, timeout_sec: float = 30.0) -> Metrics:
-    metrics = Metrics()
 
-    proc = psutil.Process()
-    rss_start = proc.memory_info().rss  # bytes [web:225][web:224]
-    rss_peak = rss_start
+class Budget:
+    """
+    Deadline + batas node bersama untuk semua solver.
+    Solver memanggil tick() sekali per node search; jam (perf_counter)
+    hanya dicek tiap `check_every` node, bukan di setiap node.
+    max_nodes (opsional) menghentikan search setelah tepat max_nodes tick,
+    sehingga hasil bisa direproduksi lintas mesin (tidak bergantung wall-clock).
+    Setelah habis, tick() selalu True sampai rekursi selesai unwind.
+    cancel (opsional): objek dengan is_set() (mis. multiprocessing.Event) yang
+    dicek bersama jam; jika di-set, search berhenti dengan reason "cancelled".
+    """
 
-    tracemalloc.start()
-    start_time = time.perf_counter()
+    __slots__ = ("deadline", "max_nodes", "check_every", "cancel", "nodes", "countdown",
+                 "_batch", "reason")
 
-    # jalankan solver
-    success = solver_func(board, metrics, timeout_sec, start_time)
+    def __init__(self, timeout_sec: float = float("inf"),
+                 start_time: Optional[float] = None,
+                 max_nodes: Optional[int] = None,
+                 check_every: int = DEFAULT_CHECK_EVERY,
+                 cancel=None):
+        start = time.perf_counter() if start_time is None else start_time
+        self.deadline = start + timeout_sec
+        self.max_nodes = max_nodes
+        self.cancel = cancel
+        self.check_every = max(1, check_every)
+        self.nodes = 0          # tick yang sudah dihitung sampai check terakhir
+        self.reason = ""        # "time" / "nodes" / "cancelled" setelah habis
+        self._batch = self._next_batch()
+        self.countdown = self._batch
+
+    def _next_batch(self) -> int:
+        batch = self.check_every
+        if self.max_nodes is not None:
+            batch = min(batch, self.max_nodes - self.nodes + 1)
+        return max(1, batch)
+
+    def tick(self) -> bool:
+        """Catat satu node; True jika budget habis (search harus berhenti)."""
+        self.countdown -= 1
+        if self.countdown > 0:
+            return False
+        return self._check()
+
+    def ticks(self) -> int:
+        """Jumlah tick yang sudah tercatat (termasuk batch yang sedang berjalan)."""
+        return self.nodes + self._batch - self.countdown
+
+    def consume(self, ticks: int, reason: str = "") -> None:
+        """
+        Catat tick yang dihitung di luar tick() (mis. loop search di backend native)
+        beserta alasan berhenti, supaya Budget tetap konsisten untuk pemakai berikutnya.
+        """
+        self.nodes = self.ticks() + ticks
+        if reason and not self.reason:
+            self.reason = reason
+        self._batch = self._next_batch()
+        self.countdown = self._batch
+
+    def _check(self) -> bool:
+        if self.reason:
+            return True
+        self.nodes += self._batch
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            self.reason = "nodes"
+            return True
+        if time.perf_counter() > self.deadline:
+            self.reason = "time"
+            return True
+        if self.cancel is not None and self.cancel.is_set():
+            self.reason = "cancelled"
+            return True
+        self._batch = self._next_batch()
+        self.countdown = self._batch
+        return False
+
+class RssSampler:
+    """
+    Sampling RSS proses di background thread setiap `interval` detik,
+    supaya puncak RSS selama solve tertangkap (bukan hanya before/after).
+    Dipakai sebagai context manager.
+    """
+
+    def __init__(self, interval: float = DEFAULT_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.peak = 0
+        self._proc = psutil.Process()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def sample(self) -> None:
+        rss = self._proc.memory_info().rss
+        if rss > self.peak:
+            self.peak = rss
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample()
 
-    end_time = time.perf_counter()
-    current, peak = tracemalloc.get_traced_memory()
-    tracemalloc.stop()
+    def start(self) -> None:
+        self.sample()
+        self._thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+        self._thread.start()
 
-    # ambil RSS lagi setelah solve (simple peak estimate)
-    rss_end = proc.memory_info().rss
-    rss_peak = max(rss_peak, rss_end)
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.sample()
+
+    def __enter__(self) -> "RssSampler":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    @property
+    def peak_kb(self) -> float:
+        return self.peak / 1024.0
+
+
+def read_vmhwm_kb() -> Optional[float]:
+    """
+    Puncak RSS proses ini menurut kernel (VmHWM di /proc/self/status, Linux).
+    Paling akurat dibaca di child process baru yang hanya menjalankan satu solve.
+    """
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return float(line.split()[1])  # sudah dalam kB
+    except OSError:
+        pass
+    return None
+
+
+def run_with_metrics(solver_func, board, timeout_sec: float = 30.0,
+                     max_nodes: Optional[int] = None,
+                     mode: str = "time",
+                     trace_python: bool = False,
+                     sample_interval: float = DEFAULT_SAMPLE_INTERVAL) -> Metrics:
+    """
+    mode="time"  : hanya waktu + recursion_steps; tidak ada tracemalloc / sampler
+                   sehingga time_ms tidak terdistorsi.
+    mode="memory": RSS di-sampling di background thread; tracemalloc hanya
+                   jika trace_python=True (opt-in, memperlambat hot path).
+    """
+    if mode not in MEASURE_MODES:
+        raise ValueError(f"mode harus salah satu dari {MEASURE_MODES}, bukan {mode!r}")
+
+    metrics = Metrics(measure_mode=mode)
+    measure_memory = mode == "memory"
+    sampler = RssSampler(sample_interval) if measure_memory else None
+    trace = measure_memory and trace_python
+
+    if sampler is not None:
+        sampler.start()
+    if trace:
+        tracemalloc.start()
+    start_time = time.perf_counter()
+
+    # jalankan solver
+    budget = Budget(timeout_sec, start_time, max_nodes)
+    try:
+        success = solver_func(board, metrics, timeout_sec, start_time, budget=budget)
+    finally:
+        end_time = time.perf_counter()
+        if trace:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            metrics.peak_memory_kb = peak / 1024.0
+        if sampler is not None:
+            sampler.stop()
+            metrics.peak_rss_kb = sampler.peak_kb
 
     metrics.time_ms = (end_time - start_time) * 1000.0
     metrics.success = success
-    metrics.peak_memory_kb = peak / 1024.0
-    metrics.peak_rss_kb = rss_peak / 1024.0
     return metrics
-    
\ No newline at end of file
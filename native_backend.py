@@ -0,0 +1,108 @@
+# native_backend.py
+"""
+Backend native opsional untuk loop search DFS bitmask dan DLX.
+
+Extension _sudoku_native (C, build: python setup.py build_ext --inplace) dicoba
+di-import sekali saat modul dimuat. Jika tidak ada, BACKEND = "python" dan
+solver di sini jatuh ke solve_dfs / solve_dlx_links biasa.
+
+Solver native mengikuti urutan node versi Python (recursion_steps identik),
+tetapi tidak bisa memanggil kembali ke Python di tengah search, jadi fallback
+ke Python juga dipakai jika step_callback / event_sink diminta, jika
+Budget punya cancel (parallel_search), atau jika N di luar jangkauan native.
+metrics.backend mencatat backend yang benar-benar jalan.
+"""
+import time
+from typing import List, Optional
+
+from metrics import Metrics, Budget
+from solver_dfs import solve_dfs
+from solver_dlx_links import build_links, solve_dlx_links
+
+try:
+    import _sudoku_native
+except ImportError:
+    _sudoku_native = None
+
+NATIVE_AVAILABLE = _sudoku_native is not None
+BACKEND = "native" if NATIVE_AVAILABLE else "python"
+
+# DFS native memakai bitmask uint64 per unit
+MAX_NATIVE_DFS_N = 64
+
+
+def _use_native(budget: Budget, step_callback, event_sink) -> bool:
+    return (NATIVE_AVAILABLE and step_callback is None and event_sink is None
+            and budget.cancel is None)
+
+
+def _native_budget(budget: Budget) -> tuple:
+    """(max_nodes sisa atau -1, detik sisa sampai deadline, check_every) untuk loop native."""
+    max_nodes = -1 if budget.max_nodes is None else max(0, budget.max_nodes - budget.ticks())
+    remaining = min(budget.deadline - time.perf_counter(), 1e9)
+    return max_nodes, remaining, budget.check_every
+
+
+def solve_dfs_native(board: List[List[int]],
+                     metrics: Metrics,
+                     timeout_sec: float,
+                     start_time: float,
+                     step_callback=None,
+                     budget: Optional[Budget] = None,
+                     event_sink=None) -> bool:
+    """solve_dfs dengan loop search di C jika tersedia (signature solver standar)."""
+    if budget is None:
+        budget = Budget(timeout_sec, start_time)
+    n = len(board)
+    if not (_use_native(budget, step_callback, event_sink) and n <= MAX_NATIVE_DFS_N):
+        metrics.backend = "python"
+        return solve_dfs(board, metrics, timeout_sec, start_time, step_callback, budget,
+                         event_sink)
+
+    metrics.backend = "native"
+    cells = [v for row in board for v in row]
+    ok, cells, steps, ticks, reason = _sudoku_native.dfs(cells, n, *_native_budget(budget))
+    metrics.recursion_steps += steps
+    budget.consume(ticks, reason)
+    metrics.stop_reason = budget.reason
+    if ok:
+        for r in range(n):
+            board[r][:] = cells[r * n:(r + 1) * n]
+    return ok
+
+
+def solve_dlx_native(board: List[List[int]],
+                     metrics: Metrics,
+                     timeout_sec: float,
+                     start_time: float,
+                     step_callback=None,
+                     budget: Optional[Budget] = None,
+                     event_sink=None) -> bool:
+    """
+    solve_dlx_links dengan search cover/uncover di C jika tersedia.
+    Matrix tetap dibangun oleh build_links (Python), lalu array-nya dikirim ke C.
+    """
+    if budget is None:
+        budget = Budget(timeout_sec, start_time)
+    if not _use_native(budget, step_callback, event_sink):
+        metrics.backend = "python"
+        return solve_dlx_links(board, metrics, timeout_sec, start_time, step_callback, budget,
+                               event_sink)
+
+    metrics.backend = "native"
+    dl = build_links(board)
+    ok, row_ids, steps, ticks, reason = _sudoku_native.dlx(
+        dl.L, dl.R, dl.U, dl.D, dl.C, dl.S, dl.row_of, *_native_budget(budget))
+    metrics.recursion_steps += steps
+    budget.consume(ticks, reason)
+    metrics.stop_reason = budget.reason
+    if not ok:
+        return False
+
+    # terapkan solusi ke board asli
+    n = len(board)
+    for row_id in row_ids:
+        cell, v = divmod(row_id, n)
+        r, c = divmod(cell, n)
+        board[r][c] = v + 1
+    return True
@@ -0,0 +1,203 @@
+# parallel_search.py
+"""
+Search paralel untuk satu puzzle: pohon search dipecah di level atas
+dan setiap subtree diselesaikan di worker ProcessPoolExecutor.
+
+- DLX: semua baris kandidat dari kolom MRV pertama (kolom dengan size minimum,
+  sama dengan pilihan dlx_search / algorithm_x) -> satu subtree per baris.
+- CSP: semua nilai dari sel pertama yang dipilih MRV (setelah propagasi awal)
+  -> satu subtree per nilai.
+
+Subtree direpresentasikan sebagai board dengan satu given tambahan, jadi worker
+cukup menjalankan solver serial biasa. Worker pertama yang menemukan solusi
+men-set Event bersama; Budget di worker lain melihatnya saat cek jam berikutnya
+dan berhenti dengan stop_reason "cancelled".
+"""
+import os
+import time
+import multiprocessing as mp
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import partial
+from typing import Callable, Dict, List, Optional
+
+from sudoku_core import EMPTY, clone_board, validate_board
+from sudoku_geometry import get_geometry
+from metrics import Metrics, Budget
+from solver_csp import (MRVQueue, init_domains, order_values_lcv, propagate,
+                        resolve_propagators, solve_csp)
+from solver_dlx import solve_dlx
+from solver_dlx_links import ROOT, build_links, solve_dlx_links
+
+Board = List[List[int]]
+
+ENGINES: Dict[str, Callable] = {
+    "dlx": solve_dlx,
+    "dlx_links": solve_dlx_links,
+    "csp": solve_csp,
+}
+
+# cancel event milik proses worker (diisi initializer pool)
+_CANCEL = None
+
+
+def split_dlx(board: Board) -> List[Board]:
+    """Satu board per baris kandidat di kolom exact cover dengan size minimum."""
+    if not validate_board(board, complete=False):
+        return []
+    n = len(board)
+    dl = build_links(board, preselect_givens=True)
+    R, D, S, row_of = dl.R, dl.D, dl.S, dl.row_of
+    if R[ROOT] == ROOT:
+        return [board]
+
+    col = R[ROOT]
+    h = R[col]
+    while h != ROOT:
+        if S[h] < S[col]:
+            col = h
+        h = R[h]
+
+    children = []
+    i = D[col]
+    while i != col:
+        cell, v = divmod(row_of[i], n)
+        child = clone_board(board)
+        child[cell // n][cell % n] = v + 1
+        children.append(child)
+        i = D[i]
+    return children
+
+
+def split_csp(board: Board, propagators=()) -> List[Board]:
+    """Satu board per nilai (urutan LCV) dari sel pilihan MRV setelah propagasi."""
+    geo = get_geometry(len(board))
+    store = init_domains(board)
+    if not propagate(store, geo, deque(range(geo.ncells)), resolve_propagators(propagators)):
+        return []
+    cell = MRVQueue(store, board, geo).select()
+    if cell is None:
+        return [board]
+
+    r, c = geo.row_of[cell], geo.col_of[cell]
+    children = []
+    for value in order_values_lcv(cell, store, board, geo):
+        child = clone_board(board)
+        child[r][c] = value
+        children.append(child)
+    return children
+
+
+def split_tree(board: Board, engine: str, min_tasks: int, max_depth: int,
+               metrics: Metrics) -> List[Board]:
+    """
+    Pecah level demi level sampai ada >= min_tasks subtree atau max_depth tercapai.
+    Setiap board yang dipecah dihitung satu node di metrics.recursion_steps.
+    """
+    split = split_csp if engine == "csp" else split_dlx
+    tasks = [board]
+    for _ in range(max_depth):
+        if len(tasks) >= min_tasks:
+            break
+        expanded = []
+        for task in tasks:
+            if all(v != EMPTY for row in task for v in row):
+                expanded.append(task)
+                continue
+            metrics.recursion_steps += 1
+            expanded.extend(split(task))
+        if expanded == tasks:
+            break
+        tasks = expanded
+    return tasks
+
+
+def _init_worker(cancel) -> None:
+    global _CANCEL
+    _CANCEL = cancel
+
+
+def _solve_subtree(engine: str, board: Board, timeout_sec: float, max_nodes: Optional[int]):
+    metrics = Metrics()
+    start = time.perf_counter()
+    budget = Budget(timeout_sec, start, max_nodes, cancel=_CANCEL)
+    ok = ENGINES[engine](board, metrics, timeout_sec, start, budget=budget)
+    metrics.time_ms = (time.perf_counter() - start) * 1000.0
+    metrics.success = ok
+    if ok:
+        _CANCEL.set()
+    return ok, board, metrics
+
+
+def solve_parallel(board: Board,
+                   metrics: Metrics,
+                   timeout_sec: float,
+                   start_time: float,
+                   step_callback=None,
+                   budget: Optional[Budget] = None,
+                   engine: str = "dlx_links",
+                   workers: Optional[int] = None,
+                   max_depth: int = 3) -> bool:
+    """
+    Signature solver standar (step_callback diabaikan: worker ada di proses lain).
+    Pohon dipecah sampai ada minimal 2 * workers subtree (maksimal max_depth level).
+    metrics hasil gabungan: recursion_steps = node split + jumlah node semua worker
+    (termasuk yang dibatalkan). max_nodes dari budget berlaku per subtree.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"engine harus salah satu dari {tuple(ENGINES)}")
+    if budget is None:
+        budget = Budget(timeout_sec, start_time)
+    workers = workers or os.cpu_count() or 1
+
+    tasks = split_tree(board, engine, 2 * workers, max_depth, metrics)
+    remaining = budget.deadline - time.perf_counter()
+    if not tasks or remaining <= 0:
+        metrics.stop_reason = "" if not tasks else "time"
+        return False
+
+    ctx = mp.get_context()
+    cancel = ctx.Event()
+    solved = None
+    reasons = set()
+    counted = set()
+
+    def merge(sub: Metrics) -> None:
+        metrics.recursion_steps += sub.recursion_steps
+        if sub.stop_reason:
+            reasons.add(sub.stop_reason)
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks)), mp_context=ctx,
+                             initializer=_init_worker, initargs=(cancel,)) as pool:
+        futures = [pool.submit(_solve_subtree, engine, task, remaining, budget.max_nodes)
+                   for task in tasks]
+        for fut in as_completed(futures):
+            counted.add(fut)
+            ok, result_board, sub = fut.result()
+            merge(sub)
+            if ok:
+                solved = result_board
+                cancel.set()
+                for other in futures:
+                    other.cancel()
+                break
+        # tunggu worker yang masih jalan berhenti (lihat cancel), lalu gabungkan node-nya
+        pool.shutdown(wait=True)
+        for fut in futures:
+            if fut not in counted and not fut.cancelled():
+                merge(fut.result()[2])
+
+    if solved is None:
+        # tidak ada subtree yang punya solusi, atau sebagian berhenti karena budget
+        metrics.stop_reason = next((r for r in ("time", "nodes") if r in reasons), "")
+        return False
+
+    for r, row in enumerate(solved):
+        board[r][:] = row
+    metrics.stop_reason = ""
+    return True
+
+
+def make_parallel_solver(engine: str, workers: Optional[int] = None) -> Callable:
+    """Solver paralel dengan signature standar untuk engine tertentu."""
+    return partial(solve_parallel, engine=engine, workers=workers)
@@ -4,6 +4,8 @@ signal.signal(signal.SIGINT, signal.SIG_DFL)  # bantu Ctrl+C di sebagian backend
 import pandas as pd
 import matplotlib.pyplot as plt
 
+from benchmark import SOLVERS
+
 
 def plot_results(csv_path: str, tag: str = ""):
     try:
@@ -15,12 +17,12 @@ def plot_results(csv_path: str, tag: str = ""):
         df["success"] = df["success"].astype(int)
 
         # --- Kolom memori (kompatibel lama & baru) ---
-        if "py_peak_kb" in df.columns:
-            df["py_peak_kb"] = df["py_peak_kb"].astype(float)
-        if "rss_kb" in df.columns:
-            df["rss_kb"] = df["rss_kb"].astype(float)
-        if "peak_memory_kb" in df.columns:
-            df["peak_memory_kb"] = df["peak_memory_kb"].astype(float)
+        # run mode="time" menulis kolom memori kosong -> NaN, kolom itu dilewati
+        for col in ("py_peak_kb", "rss_kb", "peak_memory_kb"):
+            if col in df.columns:
+                df[col] = df[col].astype(float)
+                if df[col].isna().all():
+                    df = df.drop(columns=[col])
 
         # --- Aggregate per solver ---
         agg_dict = {
@@ -37,8 +39,11 @@ def plot_results(csv_path: str, tag: str = ""):
 
         grouped = df.groupby("solver").agg(**agg_dict).reset_index()
 
-        # Urutan solver konsisten
-        order = ["dfs", "csp", "dlx"]
+        # Urutan solver konsisten: ikuti registry SOLVERS, nama yang tidak
+        # dikenal (CSV lama/solver eksternal) ditaruh di belakang
+        present = list(dict.fromkeys(grouped["solver"]))
+        order = [s for s in SOLVERS if s in present]
+        order += [s for s in present if s not in order]
         grouped["solver"] = pd.Categorical(grouped["solver"], categories=order, ordered=True)
         grouped = grouped.sort_values("solver")
 
@@ -0,0 +1,123 @@
+# portfolio.py
+"""
+Portfolio solver: beberapa solver (dan konfigurasinya) dijalankan bersamaan,
+masing-masing di child process sendiri. Jawaban pertama yang sukses dipakai,
+child lain langsung di-kill. Pemenang dan waktunya dicatat di Metrics
+(winner, winner_ms), jadi CSV benchmark menunjukkan engine mana yang menang
+per puzzle.
+"""
+import multiprocessing as mp
+import time
+from functools import partial
+from multiprocessing.connection import wait
+from typing import Callable, Dict, List, Optional, Sequence
+
+from metrics import Metrics, Budget
+from solver_dfs import solve_dfs
+from solver_csp import solve_csp
+from solver_dlx import solve_dlx
+from solver_dlx_links import solve_dlx_links
+
+Board = List[List[int]]
+
+PORTFOLIO: Dict[str, Callable] = {
+    "dfs": solve_dfs,
+    "csp": solve_csp,
+    "csp_all": partial(solve_csp, propagators=("hidden_singles", "naked_pairs",
+                                               "hidden_pairs", "box_line")),
+    "dlx": solve_dlx,
+    "dlx_links": solve_dlx_links,
+}
+
+# interval cek deadline saat menunggu hasil child
+WAIT_INTERVAL_SEC = 0.05
+
+
+def _portfolio_child(conn, name: str, board: Board, timeout_sec: float,
+                     max_nodes: Optional[int]) -> None:
+    metrics = Metrics()
+    start = time.perf_counter()
+    try:
+        ok = PORTFOLIO[name](board, metrics, timeout_sec, start,
+                             budget=Budget(timeout_sec, start, max_nodes))
+        metrics.success = ok
+        metrics.time_ms = (time.perf_counter() - start) * 1000.0
+        conn.send((ok, board, metrics))
+    except MemoryError:
+        conn.send((False, None, metrics))
+    finally:
+        conn.close()
+
+
+def solve_portfolio(board: Board,
+                    metrics: Metrics,
+                    timeout_sec: float,
+                    start_time: float,
+                    step_callback=None,
+                    budget: Optional[Budget] = None,
+                    entries: Optional[Sequence[str]] = None) -> bool:
+    """
+    Signature solver standar. entries: nama di PORTFOLIO (default semua).
+    step_callback diabaikan (solver berjalan di proses lain).
+    metrics: recursion_steps / stop_reason dari pemenang, winner = nama entry,
+    winner_ms = waktu sejak start_time sampai jawaban pemenang diterima.
+    Jika tidak ada yang sukses, recursion_steps = total node semua entry.
+    """
+    if budget is None:
+        budget = Budget(timeout_sec, start_time)
+    entries = list(PORTFOLIO) if entries is None else list(entries)
+    remaining = budget.deadline - time.perf_counter()
+
+    children = {}
+    for name in entries:
+        parent_conn, child_conn = mp.Pipe(duplex=False)
+        proc = mp.Process(target=_portfolio_child,
+                          args=(child_conn, name, board, remaining, budget.max_nodes))
+        proc.start()
+        child_conn.close()
+        children[parent_conn] = (name, proc)
+
+    solved = None
+    total_steps = 0
+    reasons = set()
+    try:
+        pending = list(children)
+        while pending and solved is None:
+            if time.perf_counter() > budget.deadline:
+                reasons.add("time")
+                break
+            for conn in wait(pending, timeout=WAIT_INTERVAL_SEC):
+                pending.remove(conn)
+                name, _ = children[conn]
+                try:
+                    ok, result, sub = conn.recv()
+                except EOFError:
+                    continue  # child mati tanpa hasil (mis. di-kill OS karena memori)
+                total_steps += sub.recursion_steps
+                if sub.stop_reason:
+                    reasons.add(sub.stop_reason)
+                if ok:
+                    solved = (name, result, sub)
+                    break
+    finally:
+        for conn, (_, proc) in children.items():
+            if proc.is_alive():
+                proc.kill()
+            proc.join()
+            conn.close()
+
+    if solved is None:
+        metrics.recursion_steps += total_steps
+        metrics.stop_reason = next((r for r in ("time", "nodes") if r in reasons), "")
+        return False
+
+    name, result, sub = solved
+    for r, row in enumerate(result):
+        board[r][:] = row
+    metrics.recursion_steps += sub.recursion_steps
+    metrics.stop_reason = ""
+    metrics.winner = name
+    metrics.winner_ms = (time.perf_counter() - start_time) * 1000.0
+    if step_callback is not None:
+        step_callback(board)
+    return True
@@ -0,0 +1,251 @@
+# puzzle_bin.py
+"""
+Format biner ringkas untuk puzzle / solusi Sudoku N x N.
+
+Layout file (little endian):
+    header 16 byte: magic b"SDKB", versi (u8), N (u8), reserved (u16), count (u64)
+    lalu `count` board, masing-masing N*N byte (row-major, 0 = kosong)
+
+Board ke-i ada di offset HEADER.size + i * N * N, jadi reader cukup mmap
+file dan memberi memoryview tanpa parsing / copy.
+
+    python puzzle_bin.py convert puzzles_25x25.txt puzzles_25x25.bin
+    python puzzle_bin.py solve puzzles_25x25.bin solutions_25x25.bin --solver dlx_links
+"""
+import argparse
+import mmap
+import os
+import struct
+import time
+from typing import Iterator, List, Optional, Sequence, Union
+
+from sudoku_core import iter_puzzles
+from metrics import Metrics
+
+Board = List[List[int]]
+BoardLike = Union[Board, bytes, bytearray, memoryview]
+
+MAGIC = b"SDKB"
+VERSION = 1
+HEADER = struct.Struct("<4sBBHQ")
+COUNT_OFFSET = 8   # offset field count di header
+
+
+def is_puzzle_bin(path: str) -> bool:
+    """True jika file diawali magic format biner ini."""
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def _read_header(f) -> tuple:
+    raw = f.read(HEADER.size)
+    if len(raw) < HEADER.size:
+        raise ValueError("File terlalu pendek untuk header puzzle biner")
+    magic, version, n, _, count = HEADER.unpack(raw)
+    if magic != MAGIC:
+        raise ValueError(f"Magic tidak dikenal: {magic!r}")
+    if version != VERSION:
+        raise ValueError(f"Versi format {version} tidak didukung (harus {VERSION})")
+    return n, count
+
+
+def to_board(view: Union[bytes, memoryview], n: int) -> Board:
+    """Board N*N byte -> list of list (copy), bentuk yang dipakai solver."""
+    return [list(view[r * n:(r + 1) * n]) for r in range(n)]
+
+
+class PuzzleBinReader:
+    """
+    Reader berbasis mmap (read-only). reader[i] -> memoryview N*N byte, zero-copy.
+    Catatan: memoryview yang masih hidup menahan mmap; lepaskan (del / view.release())
+    sebelum close(), atau mmap.close() akan gagal dengan BufferError.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self.n, self.count = _read_header(self._file)
+            self.cell_count = self.n * self.n
+            expected = HEADER.size + self.count * self.cell_count
+            if os.fstat(self._file.fileno()).st_size < expected:
+                raise ValueError(f"File terpotong: butuh {expected} byte untuk {self.count} board")
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+        self._view = memoryview(self._mm)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, i: int) -> memoryview:
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError(i)
+        start = HEADER.size + i * self.cell_count
+        return self._view[start:start + self.cell_count]
+
+    def __iter__(self) -> Iterator[memoryview]:
+        for i in range(self.count):
+            yield self[i]
+
+    def grid(self, i: int) -> memoryview:
+        """View 2D (view[r, c]), tetap zero-copy."""
+        return self[i].cast("B", (self.n, self.n))
+
+    def board(self, i: int) -> Board:
+        """Board ke-i sebagai list of list (copy), siap dipakai solver."""
+        return to_board(self[i], self.n)
+
+    def iter_boards(self) -> Iterator[Board]:
+        for i in range(self.count):
+            yield self.board(i)
+
+    def close(self) -> None:
+        self._view.release()
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self) -> "PuzzleBinReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class PuzzleBinWriter:
+    """
+    Writer append: jika file sudah ada, header dicek (N harus sama) dan board
+    ditambahkan di akhir; count di header di-update saat flush()/close().
+    """
+
+    def __init__(self, path: str, n: int):
+        if n > 255:
+            raise ValueError("Format biner hanya mendukung N <= 255 (satu byte per sel)")
+        self.n = n
+        self.cell_count = n * n
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            self._file = open(path, "r+b")
+            file_n, self.count = _read_header(self._file)
+            if file_n != n:
+                self._file.close()
+                raise ValueError(f"File berisi board {file_n}x{file_n}, bukan {n}x{n}")
+            self._file.seek(HEADER.size + self.count * self.cell_count)
+            self._file.truncate()
+        else:
+            self._file = open(path, "w+b")
+            self.count = 0
+            self._file.write(HEADER.pack(MAGIC, VERSION, n, 0, 0))
+
+    def write(self, board: BoardLike) -> None:
+        """Tambah satu board (list of list, atau N*N byte mentah / memoryview dari reader)."""
+        if isinstance(board, (bytes, bytearray, memoryview)):
+            data = bytes(board)
+        else:
+            data = bytes(v for row in board for v in row)
+        if len(data) != self.cell_count:
+            raise ValueError(f"Board berisi {len(data)} sel, harus {self.cell_count}")
+        self._file.write(data)
+        self.count += 1
+
+    def write_many(self, boards) -> None:
+        for board in boards:
+            self.write(board)
+
+    def flush(self) -> None:
+        pos = self._file.tell()
+        self._file.seek(COUNT_OFFSET)
+        self._file.write(struct.pack("<Q", self.count))
+        self._file.seek(pos)
+        self._file.flush()
+
+    def close(self) -> None:
+        self.flush()
+        self._file.close()
+
+    def __enter__(self) -> "PuzzleBinWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def txt_to_bin(txt_path: str, bin_path: str, n: Optional[int] = None) -> int:
+    """
+    Konversi file teks (semua format iter_puzzles, termasuk .gz) ke format biner.
+    Streaming: hanya satu puzzle di memori. Return jumlah board yang ditulis.
+    """
+    writer = None
+    try:
+        for board in iter_puzzles(txt_path, n):
+            if writer is None:
+                if os.path.exists(bin_path):
+                    os.remove(bin_path)
+                writer = PuzzleBinWriter(bin_path, len(board))
+            elif len(board) != writer.n:
+                raise ValueError(f"Ukuran campur di {txt_path}: {len(board)} vs {writer.n}")
+            writer.write(board)
+    finally:
+        if writer is not None:
+            writer.close()
+    return writer.count if writer is not None else 0
+
+
+def solve_bin(in_path: str, out_path: str, solver_func, timeout_sec: float = 30.0,
+              indices: Optional[Sequence[int]] = None, append: bool = False) -> List[Metrics]:
+    """
+    Selesaikan board dari file biner dan tulis solusinya ke `out_path`
+    (layout sama, urutan sama dengan input), tanpa lewat teks.
+    `out_path` yang sudah ada ditimpa; append=True menambahkan di akhir file
+    (index solusi lalu bergeser sebanyak isi lama).
+    Board yang gagal ditulis apa adanya (sebagian terisi); cek Metrics.success.
+    """
+    if not append and os.path.exists(out_path):
+        os.remove(out_path)
+    results = []
+    with PuzzleBinReader(in_path) as reader, PuzzleBinWriter(out_path, reader.n) as writer:
+        for i in (range(len(reader)) if indices is None else indices):
+            board = reader.board(i)
+            metrics = Metrics()
+            start = time.perf_counter()
+            metrics.success = solver_func(board, metrics, timeout_sec, start)
+            metrics.time_ms = (time.perf_counter() - start) * 1000.0
+            writer.write(board)
+            results.append(metrics)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Format biner puzzle Sudoku")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    conv = sub.add_parser("convert", help="txt / txt.gz -> biner")
+    conv.add_argument("src")
+    conv.add_argument("dst")
+    conv.add_argument("--n", type=int, default=None)
+
+    solve = sub.add_parser("solve", help="Selesaikan file biner, tulis solusi biner")
+    solve.add_argument("src")
+    solve.add_argument("dst")
+    solve.add_argument("--solver", default="dlx_links")
+    solve.add_argument("--timeout", type=float, default=30.0)
+    solve.add_argument("--append", action="store_true",
+                       help="Tambahkan ke dst yang sudah ada (default: dst ditimpa)")
+
+    args = parser.parse_args()
+    if args.cmd == "convert":
+        count = txt_to_bin(args.src, args.dst, args.n)
+        print(f"{count} board ditulis ke {args.dst}")
+    else:
+        from benchmark import SOLVERS
+        results = solve_bin(args.src, args.dst, SOLVERS[args.solver], args.timeout,
+                            append=args.append)
+        solved = sum(1 for m in results if m.success)
+        total_ms = sum(m.time_ms for m in results)
+        print(f"{solved}/{len(results)} solved, total {total_ms:.1f} ms -> {args.dst}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+# puzzle_generator.py
+"""
+Generator puzzle Sudoku N x N (N kuadrat sempurna: 9, 16, 25, 36, 49)
+dengan jumlah clue terkontrol, tingkat kesulitan, dan seed reproducible.
+
+    python puzzle_generator.py --n 16 --clues 120 --count 5 --seed 1 --out puzzles_16x16.txt
+"""
+import argparse
+import random
+from collections import deque
+from typing import List, Optional, Sequence, Tuple
+
+from sudoku_core import EMPTY, BitBoard, clone_board
+from sudoku_geometry import get_geometry
+from solver_csp import init_domains, propagate, resolve_propagators
+from solver_dlx_links import count_solutions
+
+Board = List[List[int]]
+
+# tingkat kesulitan = aturan propagasi minimum yang cukup untuk menyelesaikan puzzle
+# tanpa search; "expert" = butuh search.
+DIFFICULTY_RULES = {
+    "easy": (),
+    "medium": ("hidden_singles",),
+    "hard": ("hidden_singles", "naked_pairs", "hidden_pairs", "box_line"),
+}
+DIFFICULTIES = tuple(DIFFICULTY_RULES) + ("expert",)
+
+
+def solved_grid(n: int, rng: random.Random) -> Board:
+    """
+    Grid solusi acak: pola dasar lalu diacak dengan operasi yang menjaga validitas
+    (relabel digit, permutasi baris dalam band, permutasi band, sama untuk kolom,
+    dan transpose).
+    """
+    geo = get_geometry(n)
+    b = geo.b
+
+    def shuffled_lines() -> List[int]:
+        bands = list(range(b))
+        rng.shuffle(bands)
+        lines = []
+        for band in bands:
+            inner = list(range(b))
+            rng.shuffle(inner)
+            lines.extend(band * b + i for i in inner)
+        return lines
+
+    digits = list(range(1, n + 1))
+    rng.shuffle(digits)
+    rows = shuffled_lines()
+    cols = shuffled_lines()
+
+    def base(r: int, c: int) -> int:
+        return (b * (r % b) + r // b + c) % n
+
+    grid = [[digits[base(r, c)] for c in cols] for r in rows]
+    if rng.random() < 0.5:
+        grid = [list(col) for col in zip(*grid)]
+    return grid
+
+
+def solvable_by_rules(board: Board, rules: Sequence[str]) -> bool:
+    """True jika propagasi (ac3 + rules) saja sudah menentukan semua sel (=> solusi unik)."""
+    geo = get_geometry(len(board))
+    store = init_domains(board)
+    if not propagate(store, geo, deque(range(geo.ncells)), resolve_propagators(rules)):
+        return False
+    return all(d and not (d & (d - 1)) for d in store.dom)
+
+
+def grade_puzzle(board: Board) -> str:
+    """Kesulitan = level pertama di DIFFICULTY_RULES yang menyelesaikan puzzle, selain itu expert."""
+    for level, rules in DIFFICULTY_RULES.items():
+        if solvable_by_rules(board, rules):
+            return level
+    return "expert"
+
+
+def _removal_keeps_unique(puzzle: Board, r: int, c: int) -> bool:
+    # cepat: jika sel yang baru dikosongkan hanya punya satu kandidat,
+    # nilainya terpaksa oleh clue lain -> himpunan solusi tidak berubah
+    cand = BitBoard(puzzle).candidates(r, c)
+    if cand and not (cand & (cand - 1)):
+        return True
+    return count_solutions(puzzle, 2) == 1
+
+
+def generate_puzzle(n: int,
+                    clues: int,
+                    difficulty: Optional[str] = None,
+                    seed: Optional[int] = None) -> Tuple[Board, Board]:
+    """
+    Buat (puzzle, solution) N x N dengan solusi unik.
+    Sel dihapus dalam urutan acak; penghapusan diterima hanya jika puzzle tetap unik
+    (count_solutions dengan limit 2) dan, jika difficulty easy/medium/hard,
+    tetap bisa diselesaikan dengan aturan level itu.
+    Berhenti saat jumlah clue = `clues` atau tidak ada sel lagi yang bisa dihapus,
+    jadi clue akhir bisa > `clues` untuk target yang terlalu rendah.
+    """
+    if difficulty is not None and difficulty not in DIFFICULTIES:
+        raise ValueError(f"difficulty harus salah satu dari {DIFFICULTIES}")
+    rng = random.Random(seed)
+    solution = solved_grid(n, rng)
+    puzzle = clone_board(solution)
+    rules = DIFFICULTY_RULES.get(difficulty) if difficulty is not None else None
+
+    cells = [(r, c) for r in range(n) for c in range(n)]
+    rng.shuffle(cells)
+    filled = n * n
+    for r, c in cells:
+        if filled <= clues:
+            break
+        val = puzzle[r][c]
+        puzzle[r][c] = EMPTY
+        if rules is not None:
+            ok = solvable_by_rules(puzzle, rules)
+        else:
+            ok = _removal_keeps_unique(puzzle, r, c)
+        if ok:
+            filled -= 1
+        else:
+            puzzle[r][c] = val
+
+    return puzzle, solution
+
+
+def generate_graded(n: int,
+                    clues: int,
+                    difficulty: str,
+                    seed: int = 0,
+                    max_attempts: int = 20) -> Tuple[Board, Board, int]:
+    """
+    Seperti generate_puzzle, tapi diulang dengan seed turunan sampai grade_puzzle
+    tepat sama dengan `difficulty` (generate_puzzle hanya menjamin "paling sulit
+    level itu"). Return (puzzle, solution, seed_yang_dipakai).
+    """
+    for attempt in range(max_attempts):
+        attempt_seed = seed * 1000003 + attempt
+        puzzle, solution = generate_puzzle(n, clues, difficulty, attempt_seed)
+        if grade_puzzle(puzzle) == difficulty:
+            return puzzle, solution, attempt_seed
+    raise RuntimeError(f"Tidak berhasil membuat puzzle {difficulty} {n}x{n} "
+                       f"dengan {clues} clue dalam {max_attempts} percobaan")
+
+
+def count_clues(board: Board) -> int:
+    return sum(1 for row in board for v in row if v != EMPTY)
+
+
+def format_puzzle(board: Board) -> List[str]:
+    """Format token (N angka per baris), sama dengan puzzles_25x25.txt."""
+    return [" ".join(str(v) for v in row) for row in board]
+
+
+def write_corpus(path: str, n: int, clues: int, count: int,
+                 difficulty: Optional[str] = None, seed: int = 0) -> None:
+    """Tulis `count` puzzle ke satu file (bisa dibaca benchmark.load_puzzles_from_file)."""
+    with open(path, "w") as f:
+        for k in range(count):
+            if difficulty is None:
+                puzzle, _ = generate_puzzle(n, clues, None, seed + k)
+            else:
+                puzzle, _, _ = generate_graded(n, clues, difficulty, seed + k)
+            f.write("\n".join(format_puzzle(puzzle)) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generator puzzle Sudoku N x N")
+    parser.add_argument("--n", type=int, default=9)
+    parser.add_argument("--clues", type=int, required=True)
+    parser.add_argument("--difficulty", choices=DIFFICULTIES, default=None)
+    parser.add_argument("--count", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", required=True)
+    args = parser.parse_args()
+    write_corpus(args.out, args.n, args.clues, args.count, args.difficulty, args.seed)
+
+
+if __name__ == "__main__":
+    main()
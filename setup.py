@@ -0,0 +1,16 @@
+# setup.py
+"""
+Build extension native opsional (C murni, hanya butuh compiler + header Python):
+
+    python setup.py build_ext --inplace
+
+Hasilnya _sudoku_native*.so di folder repo. Tanpa build ini semua solver tetap
+jalan dengan backend Python (lihat native_backend.py).
+"""
+from setuptools import Extension, setup
+
+setup(
+    name="sudoku-pka",
+    version="0.1.0",
+    ext_modules=[Extension("_sudoku_native", ["_sudoku_native.c"])],
+)
@@ -0,0 +1,342 @@
+# solution_cache.py
+"""
+Cache solusi di depan solver, dengan kunci bentuk kanonik puzzle.
+
+Puzzle yang isomorfik (relabel digit, permutasi baris dalam band, permutasi band,
+hal yang sama untuk kolom/stack, dan transpose) dipetakan ke board kanonik yang sama.
+Solusi disimpan dalam koordinat kanonik; saat hit, transformasi puzzle yang
+diminta dibalik untuk mendapatkan solusinya.
+
+Kanonisasi bersifat best-effort: baris/kolom diurutkan dengan kunci invarian,
+dan hanya urutan untuk kunci yang seri yang dicoba satu per satu (maksimal
+MAX_CANDIDATES kombinasi). Jika lebih dari itu, seri dipecah dengan indeks asli,
+jadi sebagian varian isomorfik bisa miss. Hasilnya tetap benar karena setiap
+solusi yang diambil dari cache divalidasi terhadap puzzle.
+
+    cache = SolutionCache(maxsize=4096, path="solutions.sqlite")
+    solve = CachedSolver(solve_dlx_links, cache)
+    solve(board, metrics, timeout_sec, start_time)
+"""
+import dbm
+import itertools
+import sqlite3
+from collections import OrderedDict
+from typing import List, Optional, Sequence, Tuple
+
+from sudoku_core import EMPTY, validate_board
+from sudoku_geometry import get_geometry
+from metrics import Metrics, Budget
+
+Board = List[List[int]]
+Order = Tuple[int, ...]
+# (transpose, urutan baris, urutan kolom, relabel[digit asli] -> digit kanonik)
+Transform = Tuple[bool, Order, Order, Order]
+
+MAX_CANDIDATES = 256
+
+
+def _line_keys(grid: Board, counts_other: Sequence[int], freq: Sequence[int], b: int) -> List[tuple]:
+    """
+    Kunci per baris yang invarian terhadap permutasi kolom yang diizinkan dan relabel digit:
+    jumlah clue, jumlah clue per stack (diurutkan), jumlah clue kolom di posisi clue,
+    dan frekuensi global digit-digit clue-nya.
+    """
+    n = len(grid)
+    keys = []
+    for row in grid:
+        filled = [c for c in range(n) if row[c] != EMPTY]
+        per_stack = sorted(sum(1 for c in range(s * b, s * b + b) if row[c] != EMPTY)
+                           for s in range(b))
+        keys.append((
+            len(filled),
+            tuple(per_stack),
+            tuple(sorted(counts_other[c] for c in filled)),
+            tuple(sorted(freq[row[c]] for c in filled)),
+        ))
+    return keys
+
+
+def _tie_orders(keys: Sequence, items: Sequence[int]) -> List[List[Order]]:
+    """
+    Semua urutan `items` yang konsisten dengan pengurutan berdasarkan keys:
+    item diurutkan per kunci, lalu setiap kelompok seri dipermutasikan.
+    Return list pilihan per kelompok (dikombinasi dengan itertools.product).
+    """
+    ordered = sorted(items, key=lambda i: (keys[i], i))
+    groups = [list(g) for _, g in itertools.groupby(ordered, key=lambda i: keys[i])]
+    return [list(itertools.permutations(g)) for g in groups]
+
+
+def _line_orders(keys: Sequence[tuple], b: int) -> Tuple[List[List[Order]], List[List[List[Order]]]]:
+    """Pilihan urutan band (level atas) dan urutan baris di dalam setiap band."""
+    band_keys = [tuple(sorted(keys[band * b + i] for i in range(b))) for band in range(b)]
+    band_choices = _tie_orders(band_keys, range(b))
+    inner_choices = [_tie_orders(keys, range(band * b, band * b + b)) for band in range(b)]
+    return band_choices, inner_choices
+
+
+def _expand(band_choices, inner_choices, first_only: bool) -> List[Order]:
+    """Gabungkan pilihan band + baris menjadi urutan baris lengkap (first_only: seri dipecah indeks)."""
+    if first_only:
+        band_choices = [c[:1] for c in band_choices]
+        inner_choices = [[c[:1] for c in band] for band in inner_choices]
+    result = []
+    for band_parts in itertools.product(*band_choices):
+        bands = [i for part in band_parts for i in part]
+        per_band = [list(itertools.product(*inner_choices[band])) for band in bands]
+        for inner in itertools.product(*per_band):
+            result.append(tuple(i for parts in inner for part in parts for i in part))
+    return result
+
+
+def _count_choices(band_choices, inner_choices) -> int:
+    total = 1
+    for c in band_choices:
+        total *= len(c)
+    for band in inner_choices:
+        for c in band:
+            total *= len(c)
+    return total
+
+
+def _relabel(grid: Board, rows: Order, cols: Order, n: int) -> Tuple[tuple, Order]:
+    """Board tersusun ulang, digit dinamai ulang sesuai urutan kemunculan pertama."""
+    mapping = [0] * (n + 1)
+    nxt = 1
+    out = []
+    for r in rows:
+        row = grid[r]
+        for c in cols:
+            v = row[c]
+            if v != EMPTY and not mapping[v]:
+                mapping[v] = nxt
+                nxt += 1
+            out.append(mapping[v])
+    # digit yang tidak muncul mendapat label sisa, urut naik (tetap bijeksi)
+    for v in range(1, n + 1):
+        if not mapping[v]:
+            mapping[v] = nxt
+            nxt += 1
+    return tuple(out), tuple(mapping)
+
+
+def canonical_form(board: Board) -> Tuple[bytes, Transform]:
+    """
+    (kunci kanonik, transformasi) untuk board.
+    Kunci = N (1 byte) + N*N byte board kanonik.
+    """
+    n = len(board)
+    b = get_geometry(n).b
+    freq = [0] * (n + 1)
+    for row in board:
+        for v in row:
+            freq[v] += 1
+
+    best = None
+    for transpose in (False, True):
+        grid = [list(col) for col in zip(*board)] if transpose else board
+        row_counts = [sum(1 for v in row if v != EMPTY) for row in grid]
+        col_counts = [sum(1 for r in range(n) if grid[r][c] != EMPTY) for c in range(n)]
+        t_grid = [list(col) for col in zip(*grid)]
+        row_keys = _line_keys(grid, col_counts, freq, b)
+        col_keys = _line_keys(t_grid, row_counts, freq, b)
+
+        row_choices = _line_orders(row_keys, b)
+        col_choices = _line_orders(col_keys, b)
+        total = _count_choices(*row_choices) * _count_choices(*col_choices)
+        first_only = total > MAX_CANDIDATES
+        row_orders = _expand(*row_choices, first_only)
+        col_orders = _expand(*col_choices, first_only)
+
+        for rows in row_orders:
+            for cols in col_orders:
+                cells, mapping = _relabel(grid, rows, cols, n)
+                if best is None or cells < best[0]:
+                    best = (cells, (transpose, rows, cols, mapping))
+
+    cells, transform = best
+    return bytes((n,)) + bytes(cells), transform
+
+
+def to_canonical(solution: Board, transform: Transform) -> bytes:
+    """Solusi board asli -> N*N byte dalam koordinat kanonik."""
+    transpose, rows, cols, mapping = transform
+    grid = [list(col) for col in zip(*solution)] if transpose else solution
+    return bytes(mapping[grid[r][c]] for r in rows for c in cols)
+
+
+def from_canonical(data: bytes, transform: Transform) -> Board:
+    """Kebalikan to_canonical: N*N byte kanonik -> solusi untuk board asli."""
+    transpose, rows, cols, mapping = transform
+    n = len(rows)
+    inverse = [0] * (n + 1)
+    for v in range(1, n + 1):
+        inverse[mapping[v]] = v
+    grid = [[EMPTY] * n for _ in range(n)]
+    for i, r in enumerate(rows):
+        base = i * n
+        row = grid[r]
+        for j, c in enumerate(cols):
+            row[c] = inverse[data[base + j]]
+    if transpose:
+        grid = [list(col) for col in zip(*grid)]
+    return grid
+
+
+class SqliteBackend:
+    """Backend disk: satu tabel key -> solusi kanonik."""
+
+    def __init__(self, path: str):
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("CREATE TABLE IF NOT EXISTS solutions (key BLOB PRIMARY KEY, solution BLOB)")
+
+    def get(self, key: bytes) -> Optional[bytes]:
+        row = self.conn.execute("SELECT solution FROM solutions WHERE key = ?", (key,)).fetchone()
+        return None if row is None else row[0]
+
+    def put(self, key: bytes, value: bytes) -> None:
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO solutions VALUES (?, ?)", (key, value))
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+class DbmBackend:
+    """Backend disk dbm (modul standar, implementasi tergantung platform)."""
+
+    def __init__(self, path: str):
+        self.db = dbm.open(path, "c")
+
+    def get(self, key: bytes) -> Optional[bytes]:
+        try:
+            return self.db[key]
+        except KeyError:
+            return None
+
+    def put(self, key: bytes, value: bytes) -> None:
+        self.db[key] = value
+
+    def close(self) -> None:
+        self.db.close()
+
+
+def open_backend(path: str):
+    """sqlite untuk *.sqlite / *.db, selain itu dbm."""
+    if path.endswith((".sqlite", ".sqlite3", ".db")):
+        return SqliteBackend(path)
+    return DbmBackend(path)
+
+
+class SolutionCache:
+    """
+    LRU di memori (OrderedDict) dengan dua jenis kunci:
+    - board mentah persis sama -> solusi langsung (tanpa kanonisasi)
+    - kunci kanonik -> solusi dalam koordinat kanonik
+    Opsional: backend disk (path) sebagai lapisan kedua untuk kunci kanonik.
+    """
+
+    def __init__(self, maxsize: int = 4096, path: Optional[str] = None):
+        self.maxsize = maxsize
+        self.entries: "OrderedDict[bytes, bytes]" = OrderedDict()
+        self.backend = open_backend(path) if path is not None else None
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def raw_key(board: Board) -> bytes:
+        return b"R" + bytes((len(board),)) + bytes(v for row in board for v in row)
+
+    def _lookup(self, key: bytes) -> Optional[bytes]:
+        value = self.entries.get(key)
+        if value is not None:
+            self.entries.move_to_end(key)
+        return value
+
+    def _store(self, key: bytes, value: bytes) -> None:
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def lookup(self, board: Board) -> Tuple[Optional[Board], Optional[Tuple[bytes, Transform]]]:
+        """
+        (solusi, None) saat hit. Saat miss: (None, (kunci kanonik, transform)) supaya
+        put() tidak perlu menghitung canonical_form lagi (mahal untuk 25x25).
+        """
+        n = len(board)
+        raw = self.raw_key(board)
+        value = self._lookup(raw)
+        if value is not None:
+            solution = [list(value[r * n:(r + 1) * n]) for r in range(n)]
+            if validate_board(solution, board):
+                self.hits += 1
+                return solution, None
+
+        key, transform = canonical_form(board)
+        ckey = b"C" + key
+        value = self._lookup(ckey)
+        if value is None and self.backend is not None:
+            value = self.backend.get(key)
+            if value is not None:
+                self._store(ckey, value)
+        if value is not None:
+            solution = from_canonical(value, transform)
+            if validate_board(solution, board):
+                self._store(raw, bytes(v for row in solution for v in row))
+                self.hits += 1
+                return solution, None
+
+        self.misses += 1
+        return None, (key, transform)
+
+    def get(self, board: Board) -> Optional[Board]:
+        """Solusi untuk board jika ada di cache (sudah divalidasi), selain itu None."""
+        return self.lookup(board)[0]
+
+    def put(self, board: Board, solution: Board,
+            canonical: Optional[Tuple[bytes, Transform]] = None) -> None:
+        """canonical: hasil miss dari lookup() untuk board yang sama, jika ada."""
+        key, transform = canonical_form(board) if canonical is None else canonical
+        value = to_canonical(solution, transform)
+        self._store(b"C" + key, value)
+        self._store(self.raw_key(board), bytes(v for row in solution for v in row))
+        if self.backend is not None:
+            self.backend.put(key, value)
+
+    def close(self) -> None:
+        if self.backend is not None:
+            self.backend.close()
+            self.backend = None
+
+
+class CachedSolver:
+    """
+    Wrapper dengan signature solver standar.
+    Hit: board diisi dari cache, success=True, metrics.cache_hits += 1 (tanpa search).
+    Miss: solver asli dijalankan, metrics.cache_misses += 1, solusi sukses disimpan.
+    Keyword lain (event_sink, iterative, ...) diteruskan apa adanya ke solver asli.
+    """
+
+    def __init__(self, solver_func, cache: Optional[SolutionCache] = None):
+        self.solver_func = solver_func
+        self.cache = SolutionCache() if cache is None else cache
+
+    def __call__(self, board: Board, metrics: Metrics, timeout_sec: float, start_time: float,
+                 step_callback=None, budget: Optional[Budget] = None, **kwargs) -> bool:
+        solution, canonical = self.cache.lookup(board)
+        if solution is not None:
+            metrics.cache_hits += 1
+            for r, row in enumerate(solution):
+                board[r][:] = row
+            if step_callback is not None:
+                step_callback(board)
+            return True
+
+        metrics.cache_misses += 1
+        puzzle = [row[:] for row in board]
+        ok = self.solver_func(board, metrics, timeout_sec, start_time,
+                              step_callback=step_callback, budget=budget, **kwargs)
+        if ok:
+            self.cache.put(puzzle, board, canonical)
+        return ok
@@ -1,87 +1,186 @@
 from __future__ import annotations
 
-from typing import Dict, Tuple, Set, List, Optional, Callable, Deque
-from collections import deque
 import time
+from typing import List, Optional, Callable, Deque, Dict, Sequence, Tuple
+from collections import deque
 
-from sudoku_core import EMPTY, block_size
-from metrics import Metrics
+from sudoku_core import EMPTY, BitBoard, iter_bits, value_bit
+from sudoku_geometry import Geometry, get_geometry
+from metrics import Metrics, Budget
 
-Cell = Tuple[int, int]              # (row, col)
-DomainMap = Dict[Cell, Set[int]]
-NeighborMap = Dict[Cell, Set[Cell]]
-Arc = Tuple[Cell, Cell]             # (Xi, Xj)
-PruneLog = List[Tuple[Cell, int]]   # daftar (cell, value) yang dihapus dari domain
+Cell = int                          # nomor sel flat: r * n + c
 
 StepCallback = Optional[Callable[[List[List[int]]], None]]
+EventSink = Optional[Callable[[int, int, int], None]]
+Propagator = Callable[["DomainStore", Geometry, Deque[int]], bool]
+
+
+class DomainStore:
+    """
+    Domain CSP sebagai bitmask int per sel (index = nomor sel),
+    plus satu trail undo bersama.
+    Setiap perubahan domain mencatat (cell, mask_lama) ke trail;
+    checkpoint() mengembalikan panjang trail, restore(mark) memotong
+    trail kembali ke mark sambil mengembalikan mask lama.
+    Tidak ada list prune per node seperti PruneLog versi lama.
+    Jika `watch` diisi (MRVQueue), setiap perubahan mask dilaporkan ke sana.
+    """
+
+    __slots__ = ("dom", "trail", "watch")
 
+    def __init__(self, masks: List[int]):
+        self.dom = masks
+        self.trail: List[int] = []   # flat: cell, mask_lama, cell, mask_lama, ...
+        self.watch: Optional[MRVQueue] = None
 
-def build_neighbor_map(size: int) -> NeighborMap:
-    """Membangun graph constraint Sudoku: tiap cell terhubung ke row/col/block neighbors."""
-    b = block_size(size)
-    neighbors: NeighborMap = {(r, c): set() for r in range(size) for c in range(size)}
+    def size(self, cell: Cell) -> int:
+        return self.dom[cell].bit_count()
 
-    for r in range(size):
-        for c in range(size):
-            # row neighbors
-            for cc in range(size):
-                if cc != c:
-                    neighbors[(r, c)].add((r, cc))
+    def values(self, cell: Cell) -> List[int]:
+        return list(iter_bits(self.dom[cell]))
 
-            # col neighbors
-            for rr in range(size):
-                if rr != r:
-                    neighbors[(r, c)].add((rr, c))
+    def set(self, cell: Cell, mask: int) -> None:
+        old = self.dom[cell]
+        if old != mask:
+            self.trail.append(cell)
+            self.trail.append(old)
+            self.dom[cell] = mask
+            if self.watch is not None:
+                self.watch.update(cell, mask)
 
-            # block neighbors
-            br = (r // b) * b
-            bc = (c // b) * b
-            for rr in range(br, br + b):
-                for cc in range(bc, bc + b):
-                    if (rr, cc) != (r, c):
-                        neighbors[(r, c)].add((rr, cc))
+    def checkpoint(self) -> int:
+        return len(self.trail)
 
-    return neighbors
+    def restore(self, mark: int) -> None:
+        dom = self.dom
+        trail = self.trail
+        watch = self.watch
+        while len(trail) > mark:
+            old = trail.pop()
+            cell = trail.pop()
+            dom[cell] = old
+            if watch is not None:
+                watch.update(cell, old)
 
 
-def init_domains(board: List[List[int]]) -> DomainMap:
-    """Domain awal: cell kosong -> {1..N}, cell terisi -> {nilai itu}."""
+class MRVQueue:
+    """
+    Struktur pemilihan variabel MRV + degree yang di-update incremental.
+      buckets[k]  : set sel unassigned dengan ukuran domain k
+      bucket_of   : ukuran domain yang tercatat per sel (-1 = sudah assigned)
+      degree      : jumlah peers unassigned per sel (di-update saat assign/unassign)
+    select() hanya mencari bucket tak kosong terkecil lalu tie-break degree
+    di bucket itu, tanpa scan semua sel + semua peers.
+    Hasilnya harus identik dengan select_unassigned_mrv_degree
+    (domain terkecil, degree terbesar, lalu sel row-major pertama).
+    """
+
+    __slots__ = ("peers", "buckets", "bucket_of", "degree", "assigned")
+
+    def __init__(self, store: DomainStore, board: List[List[int]], geo: Geometry):
+        self.peers = geo.peers
+        self.buckets = [set() for _ in range(geo.n + 1)]
+        self.assigned = [is_assigned(board, geo, cell) for cell in range(geo.ncells)]
+        self.bucket_of = [-1] * geo.ncells
+        self.degree = [sum(1 for nb in geo.peers[cell] if not self.assigned[nb])
+                       for cell in range(geo.ncells)]
+        for cell, dom in enumerate(store.dom):
+            if not self.assigned[cell]:
+                size = dom.bit_count()
+                self.buckets[size].add(cell)
+                self.bucket_of[cell] = size
+
+    def update(self, cell: Cell, mask: int) -> None:
+        old = self.bucket_of[cell]
+        if old < 0:
+            return
+        size = mask.bit_count()
+        if size != old:
+            self.buckets[old].discard(cell)
+            self.buckets[size].add(cell)
+            self.bucket_of[cell] = size
+
+    def assign(self, cell: Cell) -> None:
+        self.buckets[self.bucket_of[cell]].discard(cell)
+        self.bucket_of[cell] = -1
+        self.assigned[cell] = True
+        degree = self.degree
+        for nb in self.peers[cell]:
+            degree[nb] -= 1
+
+    def unassign(self, cell: Cell, mask: int) -> None:
+        size = mask.bit_count()
+        self.buckets[size].add(cell)
+        self.bucket_of[cell] = size
+        self.assigned[cell] = False
+        degree = self.degree
+        for nb in self.peers[cell]:
+            degree[nb] += 1
+
+    def select(self) -> Optional[Cell]:
+        for size, bucket in enumerate(self.buckets):
+            if not bucket:
+                continue
+            if size == 0:
+                return min(bucket)  # dead-end cepat
+            degree = self.degree
+            best_cell = -1
+            best_degree = -1
+            for cell in bucket:
+                d = degree[cell]
+                if d > best_degree or (d == best_degree and cell < best_cell):
+                    best_cell = cell
+                    best_degree = d
+            return best_cell
+        return None
+
+
+def init_domains(board: List[List[int]]) -> DomainStore:
+    """
+    Domain awal: cell kosong -> kandidat dari bitmask BitBoard
+    (nilai given di row/col/block langsung tersaring), cell terisi -> {nilai itu}.
+    Cell kosong tanpa kandidat mendapat domain 0; propagate dengan queue semua
+    sel menolaknya sebagai kontradiksi, jadi selalu jalankan itu sebelum search.
+    """
     n = len(board)
-    all_vals = set(range(1, n + 1))
-    domains: DomainMap = {}
+    state = BitBoard(board)
+    masks: List[int] = []
 
     for r in range(n):
         for c in range(n):
-            domains[(r, c)] = {board[r][c]} if board[r][c] != EMPTY else set(all_vals)
+            if board[r][c] != EMPTY:
+                masks.append(value_bit(board[r][c]))
+            else:
+                masks.append(state.candidates(r, c))
 
-    return domains
+    return DomainStore(masks)
 
 
-def is_assigned(board: List[List[int]], cell: Cell) -> bool:
-    r, c = cell
-    return board[r][c] != EMPTY
+def is_assigned(board: List[List[int]], geo: Geometry, cell: Cell) -> bool:
+    return board[geo.row_of[cell]][geo.col_of[cell]] != EMPTY
 
 
-def select_unassigned_mrv_degree(domains: DomainMap,
+def select_unassigned_mrv_degree(store: DomainStore,
                                  board: List[List[int]],
-                                 neighbors: NeighborMap) -> Optional[Cell]:
+                                 geo: Geometry) -> Optional[Cell]:
     """
     MRV: pilih cell unassigned dengan domain terkecil.
     Tie-break: degree heuristic (lebih banyak tetangga unassigned).
+    Versi scan penuh; backtrack_mac memakai MRVQueue.select() yang ekuivalen.
     """
     best_cell: Optional[Cell] = None
     best_domain_size = 10**9
     best_degree = -1
 
-    for cell, dom in domains.items():
-        if is_assigned(board, cell):
+    for cell, dom in enumerate(store.dom):
+        if is_assigned(board, geo, cell):
             continue
 
-        dsize = len(dom)
+        dsize = dom.bit_count()
         if dsize == 0:
             return cell  # dead-end cepat
 
-        degree = sum(1 for nb in neighbors[cell] if not is_assigned(board, nb))
+        degree = sum(1 for nb in geo.peers[cell] if not is_assigned(board, geo, nb))
         if dsize < best_domain_size or (dsize == best_domain_size and degree > best_degree):
             best_cell = cell
             best_domain_size = dsize
@@ -91,150 +190,502 @@ def select_unassigned_mrv_degree(domains: DomainMap,
 
 
 def order_values_lcv(cell: Cell,
-                     domains: DomainMap,
+                     store: DomainStore,
                      board: List[List[int]],
-                     neighbors: NeighborMap) -> List[int]:
+                     geo: Geometry) -> List[int]:
     """
     LCV: urutkan nilai yang menghapus paling sedikit kandidat di tetangga.
     """
-    scores: List[Tuple[int, int]] = []
-    for value in domains[cell]:
-        eliminated = 0
-        for nb in neighbors[cell]:
-            if is_assigned(board, nb):
-                continue
-            if value in domains[nb]:
-                eliminated += 1
+    dom = store.dom
+    open_peers = [nb for nb in geo.peers[cell] if not is_assigned(board, geo, nb)]
+    scores = []
+    for value in iter_bits(dom[cell]):
+        bit = value_bit(value)
+        eliminated = sum(1 for nb in open_peers if dom[nb] & bit)
         scores.append((eliminated, value))
 
     scores.sort()
     return [v for _, v in scores]
 
 
-def revise_neq(domains: DomainMap, xi: Cell, xj: Cell, pruned: PruneLog) -> bool:
+def revise_neq(store: DomainStore, xi: Cell, xj: Cell) -> bool:
     """
     Constraint antar neighbor Sudoku: Xi != Xj.
     Untuk constraint !=: hanya perlu prune jika domain(Xj) singleton {v},
     maka v dihapus dari domain(Xi).
     """
-    if len(domains[xj]) != 1:
+    dj = store.dom[xj]
+    if dj == 0 or dj & (dj - 1):
         return False
 
-    forced_val = next(iter(domains[xj]))
-    if forced_val in domains[xi]:
-        domains[xi].remove(forced_val)
-        pruned.append((xi, forced_val))
+    di = store.dom[xi]
+    if di & dj:
+        store.set(xi, di & ~dj)
         return True
 
     return False
 
 
-def ac3(domains: DomainMap, queue: Deque[Arc], neighbors: NeighborMap) -> Tuple[bool, PruneLog]:
+def ac3(store: DomainStore, queue: Deque[Cell], geo: Geometry) -> bool:
     """
-    AC-3: proses queue arc (Xi, Xj); jika domain Xi berubah, push (Xk, Xi) untuk semua neighbor Xk != Xj.
+    AC-3 untuk constraint !=, versi berbasis sel.
+    Arc (Xi, Xj) hanya bisa prune saat domain(Xj) singleton, jadi queue cukup
+    berisi sel Xj; revise dijalankan ke semua peers Xi. Jika domain Xi menjadi
+    singleton, Xi masuk queue. Fixpoint sama dengan AC-3 per-arc.
+    Sel di queue dengan domain 0 (bukan singleton) -> kontradiksi, return False.
+    Semua perubahan domain tercatat di trail store.
     """
-    pruned: PruneLog = []
+    dom = store.dom
+    peers = geo.peers
 
     while queue:
-        xi, xj = queue.popleft()
+        xj = queue.popleft()
+        dj = dom[xj]
+        if dj & (dj - 1):
+            continue
+        if dj == 0:
+            return False
+
+        for xi in peers[xj]:
+            if revise_neq(store, xi, xj):
+                di = dom[xi]
+                if di == 0:
+                    return False
+                if not (di & (di - 1)):
+                    queue.append(xi)
+
+    return True
+
+
+def eliminate(store: DomainStore, cells: Sequence[Cell], mask: int, queue: Deque[Cell]) -> bool:
+    """Hapus bit `mask` dari domain semua cells; sel yang jadi singleton masuk queue."""
+    dom = store.dom
+    for cell in cells:
+        d = dom[cell]
+        if d & mask:
+            d &= ~mask
+            if d == 0:
+                return False
+            store.set(cell, d)
+            if not (d & (d - 1)):
+                queue.append(cell)
+    return True
+
+
+def hidden_singles(store: DomainStore, geo: Geometry, queue: Deque[Cell]) -> bool:
+    """Nilai yang hanya punya satu tempat di sebuah unit -> sel itu dipaksa ke nilai tsb."""
+    dom = store.dom
+    full = (1 << geo.n) - 1
+    for unit in geo.units:
+        once = twice = 0
+        for cell in unit:
+            d = dom[cell]
+            twice |= once & d
+            once |= d
+        if once != full:
+            return False  # ada nilai yang tidak punya tempat di unit ini
+        single = once & ~twice
+        while single:
+            bit = single & -single
+            single ^= bit
+            for cell in unit:
+                if dom[cell] & bit:
+                    if dom[cell] != bit:
+                        store.set(cell, bit)
+                        queue.append(cell)
+                    break
+    return True
+
+
+def naked_pairs(store: DomainStore, geo: Geometry, queue: Deque[Cell]) -> bool:
+    """Dua sel di unit dengan domain 2-nilai yang sama -> nilai itu dihapus dari sel lain di unit."""
+    dom = store.dom
+    for unit in geo.units:
+        seen: Dict[int, Cell] = {}
+        for cell in unit:
+            d = dom[cell]
+            if d.bit_count() != 2:
+                continue
+            if d in seen:
+                other = seen[d]
+                rest = [x for x in unit if x != cell and x != other]
+                if not eliminate(store, rest, d, queue):
+                    return False
+            else:
+                seen[d] = cell
+    return True
+
+
+def hidden_pairs(store: DomainStore, geo: Geometry, queue: Deque[Cell]) -> bool:
+    """Dua nilai yang di sebuah unit hanya muncul di dua sel yang sama -> dua sel itu dibatasi ke pasangan nilai."""
+    dom = store.dom
+    for unit in geo.units:
+        once = twice = more = 0
+        for cell in unit:
+            d = dom[cell]
+            more |= twice & d
+            twice |= once & d
+            once |= d
+        exactly_two = twice & ~more
+        if not exactly_two or not (exactly_two & (exactly_two - 1)):
+            continue
 
-        if revise_neq(domains, xi, xj, pruned):
-            if len(domains[xi]) == 0:
-                return False, pruned
+        by_pos: Dict[Tuple[Cell, Cell], int] = {}
+        while exactly_two:
+            bit = exactly_two & -exactly_two
+            exactly_two ^= bit
+            pos = tuple(cell for cell in unit if dom[cell] & bit)
+            by_pos[pos] = by_pos.get(pos, 0) | bit
 
-            for xk in neighbors[xi]:
-                if xk != xj:
-                    queue.append((xk, xi))
+        for pos, mask in by_pos.items():
+            if mask.bit_count() != 2:
+                continue
+            for cell in pos:
+                if dom[cell] != mask:
+                    store.set(cell, dom[cell] & mask)
+    return True
 
-    return True, pruned
 
+def box_line_reduction(store: DomainStore, geo: Geometry, queue: Deque[Cell]) -> bool:
+    """
+    Pointing: nilai di blok yang hanya ada di satu baris/kolom -> hapus dari sisa baris/kolom itu.
+    Box-line (claiming): nilai di baris/kolom yang hanya ada di satu blok -> hapus dari sisa blok itu.
+    """
+    dom = store.dom
+    for seg, line_rest, block_rest in geo.box_lines:
+        seg_mask = 0
+        for cell in seg:
+            seg_mask |= dom[cell]
+        if not seg_mask:
+            continue
 
-def assign_cell(board: List[List[int]], domains: DomainMap, cell: Cell, value: int) -> PruneLog:
+        block_mask = 0
+        for cell in block_rest:
+            block_mask |= dom[cell]
+        pointing = seg_mask & ~block_mask
+        if pointing and not eliminate(store, line_rest, pointing, queue):
+            return False
+
+        line_mask = 0
+        for cell in line_rest:
+            line_mask |= dom[cell]
+        claiming = seg_mask & ~line_mask
+        if claiming and not eliminate(store, block_rest, claiming, queue):
+            return False
+    return True
+
+
+# tahap propagasi tambahan yang bisa dinyalakan per konfigurasi;
+# naked singles (ac3) selalu jalan karena itulah yang menjaga constraint != saat assign.
+PROPAGATORS: Dict[str, Propagator] = {
+    "hidden_singles": hidden_singles,
+    "naked_pairs": naked_pairs,
+    "hidden_pairs": hidden_pairs,
+    "box_line": box_line_reduction,
+}
+DEFAULT_PROPAGATORS: Tuple[str, ...] = ()
+
+
+def resolve_propagators(names: Sequence[str]) -> Tuple[Propagator, ...]:
+    unknown = [name for name in names if name not in PROPAGATORS]
+    if unknown:
+        raise ValueError(f"Propagator tidak dikenal: {unknown}. Pilihan: {sorted(PROPAGATORS)}")
+    return tuple(PROPAGATORS[name] for name in names)
+
+
+def propagate(store: DomainStore, geo: Geometry, queue: Deque[Cell],
+              stages: Sequence[Propagator] = ()) -> bool:
     """
-    Assign cell=value dan prune domain(cell) menjadi singleton {value}.
-    Return log pruning untuk undo.
+    Pipeline propagasi: ac3 (naked singles) sampai fixpoint, lalu tiap stage
+    berurutan. Begitu satu stage mengubah domain, kembali ke ac3 dulu
+    (aturan murah dulu) dan ulangi sampai tidak ada perubahan.
     """
-    r, c = cell
-    board[r][c] = value
+    while True:
+        if not ac3(store, queue, geo):
+            return False
+        mark = store.checkpoint()
+        for stage in stages:
+            if not stage(store, geo, queue):
+                return False
+            if store.checkpoint() != mark:
+                break
+        else:
+            return True
 
-    removed: PruneLog = []
-    current_dom = domains[cell]
-    for v in list(current_dom):
-        if v != value:
-            current_dom.remove(v)
-            removed.append((cell, v))
 
-    return removed
+def assign_cell(board: List[List[int]], store: DomainStore, geo: Geometry, mrv: MRVQueue,
+                cell: Cell, value: int) -> None:
+    """
+    Assign cell=value dan prune domain(cell) menjadi singleton {value}.
+    Perubahan domain masuk trail; undo lewat store.restore(mark).
+    """
+    board[geo.row_of[cell]][geo.col_of[cell]] = value
+    mrv.assign(cell)
+    store.set(cell, value_bit(value))
 
 
-def undo(board: List[List[int]], domains: DomainMap, cell: Cell, prev_board_val: int, pruned: PruneLog) -> None:
-    r, c = cell
-    board[r][c] = prev_board_val
-    for (pruned_cell, val) in pruned:
-        domains[pruned_cell].add(val)
+def undo(board: List[List[int]], store: DomainStore, geo: Geometry, mrv: MRVQueue,
+         cell: Cell, prev_board_val: int, mark: int) -> None:
+    board[geo.row_of[cell]][geo.col_of[cell]] = prev_board_val
+    store.restore(mark)
+    mrv.unassign(cell, store.dom[cell])
 
 
 def backtrack_mac(board: List[List[int]],
-                  domains: DomainMap,
-                  neighbors: NeighborMap,
+                  store: DomainStore,
+                  geo: Geometry,
+                  mrv: MRVQueue,
                   metrics: Metrics,
-                  timeout_sec: float,
-                  start_time: float,
-                  step_callback: StepCallback = None) -> bool:
-    if time.perf_counter() - start_time > timeout_sec:
+                  budget: Budget,
+                  step_callback: StepCallback = None,
+                  stages: Sequence[Propagator] = (),
+                  event_sink: EventSink = None) -> bool:
+    if budget.tick():
         return False
 
     metrics.recursion_steps += 1  # cost per node search
 
-    cell = select_unassigned_mrv_degree(domains, board, neighbors)
+    cell = mrv.select()
     if cell is None:
         if step_callback is not None:
             step_callback(board)
         return True
 
-    if len(domains[cell]) == 0:
+    if store.dom[cell] == 0:
         return False
 
-    r, c = cell
-    prev_val = board[r][c]
+    prev_val = board[geo.row_of[cell]][geo.col_of[cell]]
 
-    for value in order_values_lcv(cell, domains, board, neighbors):
-        pruned_total: PruneLog = []
+    for value in order_values_lcv(cell, store, board, geo):
+        mark = store.checkpoint()
 
         # assign
-        pruned_total += assign_cell(board, domains, cell, value)
+        assign_cell(board, store, geo, mrv, cell, value)
         if step_callback is not None:
             step_callback(board)
+        if event_sink is not None:
+            event_sink(cell, prev_val, value)
 
-        # MAC: jalankan AC-3 hanya untuk arc (neighbor -> cell)
-        q = deque((nb, cell) for nb in neighbors[cell] if not is_assigned(board, nb))
-        ok, pruned_ac3 = ac3(domains, q, neighbors)
-        pruned_total += pruned_ac3
+        # MAC: propagasi dari cell yang baru di-assign (+ stage tambahan jika ada)
+        ok = propagate(store, geo, deque((cell,)), stages)
 
-        if ok and backtrack_mac(board, domains, neighbors, metrics, timeout_sec, start_time, step_callback):
+        if ok and backtrack_mac(board, store, geo, mrv, metrics, budget, step_callback, stages,
+                                event_sink):
             return True
 
-        # undo
-        undo(board, domains, cell, prev_val, pruned_total)
+        # undo = potong trail ke checkpoint
+        undo(board, store, geo, mrv, cell, prev_val, mark)
         if step_callback is not None:
             step_callback(board)
+        if event_sink is not None:
+            event_sink(cell, value, prev_val)
 
     return False
 
 
+def backtrack_mac_iter(board: List[List[int]],
+                       store: DomainStore,
+                       geo: Geometry,
+                       mrv: MRVQueue,
+                       metrics: Metrics,
+                       budget: Budget,
+                       step_callback: StepCallback = None,
+                       stages: Sequence[Propagator] = (),
+                       event_sink: EventSink = None) -> bool:
+    """
+    backtrack_mac tanpa rekursi. Stack eksplisit dialokasikan sekali
+    (kedalaman maksimum = jumlah sel), satu record per kedalaman:
+    sel, nilai board sebelumnya, daftar nilai LCV, indeks nilai berikutnya,
+    dan checkpoint trail. Urutan node / propagasi / undo sama dengan versi
+    rekursif, jadi hasil dan recursion_steps identik.
+    """
+    size = geo.ncells + 1
+    cells = [0] * size
+    prev_vals = [0] * size
+    values_at: List[List[int]] = [[]] * size
+    next_idx = [0] * size
+    marks = [0] * size
+    depth = 0
+    entering = True
+
+    while True:
+        if entering:
+            # masuk node baru (= satu pemanggilan backtrack_mac)
+            entering = False
+            failed = budget.tick()
+            if not failed:
+                metrics.recursion_steps += 1  # cost per node search
+
+                cell = mrv.select()
+                if cell is None:
+                    if step_callback is not None:
+                        step_callback(board)
+                    return True
+
+                failed = store.dom[cell] == 0
+                if not failed:
+                    cells[depth] = cell
+                    prev_vals[depth] = board[geo.row_of[cell]][geo.col_of[cell]]
+                    values_at[depth] = order_values_lcv(cell, store, board, geo)
+                    next_idx[depth] = 0
+
+            if failed:
+                if depth == 0:
+                    return False
+                depth -= 1
+                undo_child = True
+            else:
+                undo_child = False
+        else:
+            undo_child = True
+
+        cell = cells[depth]
+        prev_val = prev_vals[depth]
+        if undo_child:
+            # undo = potong trail ke checkpoint nilai yang sedang dicoba
+            value = values_at[depth][next_idx[depth] - 1]
+            undo(board, store, geo, mrv, cell, prev_val, marks[depth])
+            if step_callback is not None:
+                step_callback(board)
+            if event_sink is not None:
+                event_sink(cell, value, prev_val)
+
+        values = values_at[depth]
+        k = next_idx[depth]
+        if k == len(values):
+            # semua nilai gagal -> kembali ke parent
+            values_at[depth] = []
+            if depth == 0:
+                return False
+            depth -= 1
+            continue
+
+        value = values[k]
+        next_idx[depth] = k + 1
+        marks[depth] = store.checkpoint()
+
+        # assign
+        assign_cell(board, store, geo, mrv, cell, value)
+        if step_callback is not None:
+            step_callback(board)
+        if event_sink is not None:
+            event_sink(cell, prev_val, value)
+
+        # MAC: propagasi dari cell yang baru di-assign (+ stage tambahan jika ada)
+        ok = propagate(store, geo, deque((cell,)), stages)
+
+        if ok:
+            depth += 1
+            entering = True
+        # propagasi gagal: iterasi berikutnya meng-undo nilai ini (entering=False)
+
+
 def solve_csp(board: List[List[int]],
               metrics: Metrics,
               timeout_sec: float,
               start_time: float,
-              step_callback: StepCallback = None) -> bool:
-    n = len(board)
-    neighbors = build_neighbor_map(n)
-    domains = init_domains(board)
-
-    # AC-3 global sekali di awal (pruning awal)
-    all_arcs = deque((xi, xj) for xi in neighbors for xj in neighbors[xi])
-    ok, _ = ac3(domains, all_arcs, neighbors)
+              step_callback: StepCallback = None,
+              propagators: Sequence[str] = DEFAULT_PROPAGATORS,
+              budget: Optional[Budget] = None,
+              event_sink: EventSink = None,
+              iterative: bool = False) -> bool:
+    """
+    propagators: nama stage tambahan dari PROPAGATORS yang dijalankan
+    setelah ac3 di setiap node (default: hanya ac3 / naked singles).
+    budget: Budget bersama (default dibuat dari timeout_sec/start_time).
+    event_sink: sink(cell, old, new) per assign/undo sel (lihat step_events).
+    iterative: pakai backtrack_mac_iter (stack eksplisit, tanpa batas rekursi).
+    """
+    if budget is None:
+        budget = Budget(timeout_sec, start_time)
+    geo = get_geometry(len(board))
+    store = init_domains(board)
+    stages = resolve_propagators(propagators)
+
+    # propagasi global sekali di awal (pruning awal)
+    ok = propagate(store, geo, deque(range(geo.ncells)), stages)
     if not ok:
         return False
 
-    return backtrack_mac(board, domains, neighbors, metrics, timeout_sec, start_time, step_callback)
+    mrv = MRVQueue(store, board, geo)
+    store.watch = mrv
+
+    if iterative:
+        ok = backtrack_mac_iter(board, store, geo, mrv, metrics, budget, step_callback, stages,
+                                event_sink)
+    else:
+        ok = backtrack_mac(board, store, geo, mrv, metrics, budget, step_callback, stages,
+                           event_sink=event_sink)
+    metrics.stop_reason = budget.reason
+    return ok
+
+
+def count_mac(board: List[List[int]],
+              store: DomainStore,
+              geo: Geometry,
+              mrv: MRVQueue,
+              metrics: Metrics,
+              budget: Budget,
+              limit: int,
+              stages: Sequence[Propagator] = ()) -> int:
+    """
+    Seperti backtrack_mac, tapi tidak berhenti di solusi pertama:
+    jumlahkan solusi di subtree sampai `limit`. Board & store selalu
+    dikembalikan ke keadaan semula sebelum return.
+    """
+    if budget.tick():
+        return 0
+
+    metrics.recursion_steps += 1
+
+    cell = mrv.select()
+    if cell is None:
+        return 1
+    if store.dom[cell] == 0:
+        return 0
+
+    prev_val = board[geo.row_of[cell]][geo.col_of[cell]]
+    total = 0
+    for value in order_values_lcv(cell, store, board, geo):
+        mark = store.checkpoint()
+        assign_cell(board, store, geo, mrv, cell, value)
+        if propagate(store, geo, deque((cell,)), stages):
+            total += count_mac(board, store, geo, mrv, metrics, budget, limit - total, stages)
+        undo(board, store, geo, mrv, cell, prev_val, mark)
+        if total >= limit or budget.reason:
+            break
+    return total
+
+
+def count_solutions(board: List[List[int]],
+                    limit: int = 2,
+                    metrics: Optional[Metrics] = None,
+                    timeout_sec: float = float("inf"),
+                    propagators: Sequence[str] = DEFAULT_PROPAGATORS,
+                    budget: Optional[Budget] = None) -> int:
+    """
+    Hitung solusi dengan MAC search sampai `limit` (2 = cek keunikan).
+    Board tidak diubah. metrics (opsional) diisi solution_count,
+    recursion_steps, time_ms, stop_reason; budget habis -> batas bawah.
+    """
+    if metrics is None:
+        metrics = Metrics()
+    start = time.perf_counter()
+    if budget is None:
+        budget = Budget(timeout_sec, start)
+    board = [row[:] for row in board]
+    geo = get_geometry(len(board))
+    store = init_domains(board)
+    stages = resolve_propagators(propagators)
+
+    count = 0
+    if propagate(store, geo, deque(range(geo.ncells)), stages):
+        mrv = MRVQueue(store, board, geo)
+        store.watch = mrv
+        count = count_mac(board, store, geo, mrv, metrics, budget, limit, stages)
+
+    metrics.solution_count = count
+    metrics.success = count > 0
+    metrics.stop_reason = budget.reason
+    metrics.time_ms = (time.perf_counter() - start) * 1000.0
+    return count
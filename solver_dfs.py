@@ -1,50 +1,154 @@
 # solver_dfs.py
-from typing import List, Callable, Optional
-from sudoku_core import EMPTY, find_empty, is_valid
-from metrics import Metrics
-import time
+from typing import List, Callable, Optional, Tuple
+from sudoku_core import BitBoard, iter_bits
+from metrics import Metrics, Budget
 
 StepCallback = Optional[Callable[[List[List[int]]], None]]
+EventSink = Optional[Callable[[int, int, int], None]]
 
-def solve_dfs(board: List[List[int]],
-              metrics: Metrics,
-              timeout_sec: float,
-              start_time: float,
-              step_callback: StepCallback = None) -> bool:
+
+def dfs_search(state: BitBoard,
+               empties: List[Tuple[int, int]],
+               idx: int,
+               metrics: Metrics,
+               budget: Budget,
+               step_callback: StepCallback = None,
+               event_sink: EventSink = None) -> bool:
     """
-    Solver backtracking dasar (DFS).
-    Sekarang recursion_steps dihitung per node search:
-    setiap kali fungsi ini dipanggil (dan belum timeout) -> +1.
+    Rekursi DFS di atas BitBoard.
+    DFS selalu mengisi sel kosong pertama (row-major), jadi sel kosong
+    pertama di kedalaman idx = empties[idx]; tidak perlu scan find_empty.
+    event_sink: sink(cell, old, new) per perubahan sel (lihat step_events).
     """
-    # cek timeout
-    if time.perf_counter() - start_time > timeout_sec:
+    # cek timeout / batas node (jam hanya dicek tiap beberapa node)
+    if budget.tick():
         return False
 
     # satu node baru di pohon pencarian
     metrics.recursion_steps += 1
 
-    pos = find_empty(board)
-    if pos is None:
+    if idx == len(empties):
         # solved
         if step_callback is not None:
-            step_callback(board)
+            step_callback(state.grid)
         return True
 
-    r, c = pos
-    n = len(board)
+    r, c = empties[idx]
 
-    for val in range(1, n + 1):
-        if is_valid(board, r, c, val):
-            board[r][c] = val
-            if step_callback is not None:
-                step_callback(board)
+    for val in iter_bits(state.candidates(r, c)):
+        state.place(r, c, val)
+        if step_callback is not None:
+            step_callback(state.grid)
+        if event_sink is not None:
+            event_sink(r * state.n + c, 0, val)
 
-            if solve_dfs(board, metrics, timeout_sec, start_time, step_callback):
+        if dfs_search(state, empties, idx + 1, metrics, budget, step_callback, event_sink):
+            return True
+
+        # undo
+        state.unplace(r, c)
+        if step_callback is not None:
+            step_callback(state.grid)
+        if event_sink is not None:
+            event_sink(r * state.n + c, val, 0)
+
+    return False
+
+
+def dfs_search_iter(state: BitBoard,
+                    empties: List[Tuple[int, int]],
+                    metrics: Metrics,
+                    budget: Budget,
+                    step_callback: StepCallback = None,
+                    event_sink: EventSink = None) -> bool:
+    """
+    dfs_search tanpa rekursi: stack eksplisit yang dialokasikan sekali,
+    satu record per kedalaman = (sisa kandidat sel, nilai yang sedang terpasang).
+    Urutan node, callback, event, dan Budget.tick sama persis dengan versi rekursif,
+    jadi hasil dan recursion_steps identik; kedalaman tidak dibatasi recursion limit.
+    """
+    depth_max = len(empties)
+    remaining = [0] * depth_max     # bitmask kandidat yang belum dicoba per kedalaman
+    placed = [0] * depth_max        # nilai yang sedang terpasang per kedalaman
+    n = state.n
+    idx = 0
+    entering = True
+
+    while True:
+        if entering:
+            # masuk node baru di kedalaman idx (= satu pemanggilan dfs_search)
+            if budget.tick():
+                if idx == 0:
+                    return False
+                idx -= 1
+                entering = False
+                continue
+
+            metrics.recursion_steps += 1
+
+            if idx == depth_max:
+                if step_callback is not None:
+                    step_callback(state.grid)
                 return True
 
-            # undo
-            board[r][c] = EMPTY
+            r, c = empties[idx]
+            remaining[idx] = state.candidates(r, c)
+        else:
+            # subtree di kedalaman idx + 1 gagal -> undo nilai di kedalaman idx
+            r, c = empties[idx]
+            val = placed[idx]
+            state.unplace(r, c)
             if step_callback is not None:
-                step_callback(board)
+                step_callback(state.grid)
+            if event_sink is not None:
+                event_sink(r * n + c, val, 0)
 
-    return False
+        mask = remaining[idx]
+        if not mask:
+            # semua kandidat habis -> node gagal, kembali ke parent
+            if idx == 0:
+                return False
+            idx -= 1
+            entering = False
+            continue
+
+        low = mask & -mask
+        remaining[idx] = mask ^ low
+        val = low.bit_length()
+        state.place(r, c, val)
+        placed[idx] = val
+        if step_callback is not None:
+            step_callback(state.grid)
+        if event_sink is not None:
+            event_sink(r * n + c, 0, val)
+        idx += 1
+        entering = True
+
+
+def solve_dfs(board: List[List[int]],
+              metrics: Metrics,
+              timeout_sec: float,
+              start_time: float,
+              step_callback: StepCallback = None,
+              budget: Optional[Budget] = None,
+              event_sink: EventSink = None,
+              iterative: bool = False) -> bool:
+    """
+    Solver backtracking dasar (DFS).
+    Sekarang recursion_steps dihitung per node search:
+    setiap kali node dikunjungi (dan belum timeout) -> +1.
+    Kandidat diambil dari bitmask BitBoard (O(1) per cek), board diisi in-place.
+    budget: Budget bersama (default dibuat dari timeout_sec/start_time).
+    event_sink: sink(cell, old, new) untuk rekaman langkah ringkas (None = mati).
+    iterative: pakai dfs_search_iter (stack eksplisit, tanpa batas rekursi).
+    """
+    if budget is None:
+        budget = Budget(timeout_sec, start_time)
+    state = BitBoard(board)
+    empties = state.empty_cells()
+    if iterative:
+        ok = dfs_search_iter(state, empties, metrics, budget, step_callback, event_sink)
+    else:
+        ok = dfs_search(state, empties, 0, metrics, budget, step_callback, event_sink)
+    metrics.stop_reason = budget.reason
+    return ok
@@ -1,35 +1,64 @@
 # solver_dlx.py
-from typing import List, Dict, Set, Callable, Optional
-from metrics import Metrics
 import time
-from sudoku_core import EMPTY, block_size, clone_board
+from collections import deque
+from typing import List, Dict, Set, Callable, Optional, Sequence, Tuple
+from metrics import Metrics, Budget
+from sudoku_core import EMPTY, clone_board, iter_bits
+from sudoku_geometry import get_geometry
+from solver_csp import init_domains, propagate, resolve_propagators
 
 StepCallback = Optional[Callable[[List[List[int]]], None]]
+EventSink = Optional[Callable[[int, int, int], None]]
 
-def sudoku_to_exact_cover(board: List[List[int]]):
+# stage eliminasi murah sebelum encode (ac3 = givens + naked singles selalu jalan)
+PREPROCESS_PROPAGATORS = ("hidden_singles",)
+
+
+def reduce_candidates(board: List[List[int]],
+                      propagators: Sequence[str] = PREPROCESS_PROPAGATORS) -> Optional[List[int]]:
+    """
+    Domain bitmask per sel setelah eliminasi murah: nilai given di row/col/block,
+    naked singles, dan hidden singles sampai fixpoint (pipeline propagate solver_csp).
+    Domain singleton = sel sudah pasti (given atau hasil singles).
+    None jika puzzle terbukti kontradiksi, termasuk ada domain kosong (0).
+    Hasil non-None belum tentu konsisten (mis. propagators=() tidak mengecek
+    (unit, nilai) tanpa kandidat); sudoku_to_exact_cover tetap membawa kolom
+    kosong itu sehingga Algorithm X gagal di sana.
+    """
+    geo = get_geometry(len(board))
+    store = init_domains(board)
+    if not propagate(store, geo, deque(range(geo.ncells)), resolve_propagators(propagators)):
+        return None
+    if 0 in store.dom:
+        return None
+    return store.dom
+
+
+def full_matrix_size(board: List[List[int]]) -> Tuple[int, int]:
+    """(baris, kolom) matrix exact cover tanpa preprocessing, tanpa membangunnya."""
+    n = len(board)
+    givens = sum(1 for row in board for v in row if v != EMPTY)
+    return givens + (n * n - givens) * n, 4 * n * n
+
+
+def sudoku_to_exact_cover(board: List[List[int]], domains: Optional[Sequence[int]] = None):
     """
     Encode Sudoku (N x N) menjadi masalah Exact Cover.
+    Index kolom diambil dari tabel Geometry (dihitung sekali per N).
     Setiap kandidat (r, c, v) -> satu baris dalam matrix,
     dengan 4 jenis constraint:
       1) Setiap sel (r,c) terisi tepat satu kali.
       2) Setiap nilai v muncul sekali di baris r.
       3) Setiap nilai v muncul sekali di kolom c.
       4) Setiap nilai v muncul sekali di blok.
+    domains (opsional, dari reduce_candidates): hanya kandidat yang tersisa
+    yang jadi baris; sel dengan domain singleton sudah pasti dan tidak ikut
+    matrix sama sekali, jadi kolom yang di-cover-nya juga tidak ada.
+    Kolom diambil dari Geometry (bukan dari baris), jadi constraint tanpa
+    kandidat tetap ada sebagai kolom kosong dan search langsung gagal di sana.
     """
     n = len(board)
-    b = block_size(n)
-
-    def cell_constraint(r, c):
-        return r * n + c
-
-    def row_constraint(r, val):
-        return n * n + r * n + (val - 1)
-
-    def col_constraint(c, val):
-        return 2 * n * n + c * n + (val - 1)
-
-    def block_constraint(br, bc, val):
-        return 3 * n * n + (br * b + bc) * n + (val - 1)
+    geo = get_geometry(n)
 
     # row_id -> set kolom
     matrix: Dict[int, Set[int]] = {}
@@ -38,31 +67,30 @@ def sudoku_to_exact_cover(board: List[List[int]]):
     # kolom -> set row_id yang mengandung kolom tsb (index untuk percepat)
     col_to_rows: Dict[int, Set[int]] = {}
 
+    # semua kolom constraint, dikurangi yang sudah di-cover sel pasti
+    all_cols = set(range(geo.ncols))
     row_id = 0
     for r in range(n):
         for c in range(n):
-            if board[r][c] != EMPTY:
+            cell = r * n + c
+            if domains is not None:
+                d = domains[cell]
+                if d and d & (d - 1) == 0:
+                    all_cols.difference_update(geo.cover_columns(cell, d.bit_length()))
+                    continue  # sudah pasti, di luar matrix
+                vals = list(iter_bits(d))
+            elif board[r][c] != EMPTY:
                 vals = [board[r][c]]
             else:
                 vals = list(range(1, n + 1))
             for val in vals:
-                br = r // b
-                bc = c // b
-                cols = {
-                    cell_constraint(r, c),
-                    row_constraint(r, val),
-                    col_constraint(c, val),
-                    block_constraint(br, bc, val),
-                }
+                cols = set(geo.cover_columns(cell, val))
                 matrix[row_id] = cols
                 row_lookup[row_id] = (r, c, val)
                 for col in cols:
                     col_to_rows.setdefault(col, set()).add(row_id)
                 row_id += 1
 
-    all_cols = set()
-    for cols in matrix.values():
-        all_cols |= cols
     return matrix, row_lookup, all_cols, col_to_rows
 
 def algorithm_x(matrix: Dict[int, Set[int]],
@@ -70,20 +98,21 @@ def algorithm_x(matrix: Dict[int, Set[int]],
                 col_to_rows: Dict[int, Set[int]],
                 solution: List[int],
                 metrics: Metrics,
-                timeout_sec: float,
-                start_time: float,
+                budget: Budget,
                 row_lookup: Dict[int, tuple],
                 vis_board: List[List[int]],
-                step_callback: StepCallback = None) -> bool:
+                step_callback: StepCallback = None,
+                event_sink: EventSink = None) -> bool:
     """
     Implementasi Algorithm X (Exact Cover) gaya backtracking.
     matrix: row_id -> set kolom aktif
     columns: set kolom yang belum ter-cover
     col_to_rows: kolom -> set row_id aktif yang berisi kolom tsb
     vis_board: board untuk visualisasi (tidak dipakai hitung hasil benchmark)
+    event_sink: sink(cell, old, new) per perubahan vis_board
     """
-    # cek timeout
-    if time.perf_counter() - start_time > timeout_sec:
+    # cek timeout / batas node (jam hanya dicek tiap beberapa node)
+    if budget.tick():
         return False
 
     # semua constraint ter-cover -> solusi lengkap
@@ -94,7 +123,9 @@ def algorithm_x(matrix: Dict[int, Set[int]],
 
     # heuristik: pilih kolom dengan jumlah baris aktif paling sedikit
     # (mirip DLX: \"choose column with minimal size\") [web:51][web:60][web:62]
-    col = min(columns, key=lambda c: len(col_to_rows.get(c, ( ))))
+    # seri dipecah index kolom terkecil (urutan iterasi set tidak stabil antar ukuran matrix)
+    span = 4 * len(vis_board) ** 2
+    col = min(columns, key=lambda c: len(col_to_rows.get(c, ( ))) * span + c)
 
     candidate_rows = list(col_to_rows.get(col, ( )))
     if not candidate_rows:
@@ -114,6 +145,8 @@ def algorithm_x(matrix: Dict[int, Set[int]],
         vis_board[vr][vc] = vv
         if step_callback is not None:
             step_callback(vis_board)
+        if event_sink is not None:
+            event_sink(vr * len(vis_board) + vc, old_val, vv)
 
         removed_rows: Dict[int, Set[int]] = {}
         removed_cols: Set[int] = set()
@@ -138,7 +171,8 @@ def algorithm_x(matrix: Dict[int, Set[int]],
 
         # rekursif
         if algorithm_x(matrix, columns, col_to_rows, solution, metrics,
-                       timeout_sec, start_time, row_lookup, vis_board, step_callback):
+                       budget, row_lookup, vis_board, step_callback,
+                       event_sink):
             return True
 
         # undo (uncover) semua perubahan
@@ -153,37 +187,200 @@ def algorithm_x(matrix: Dict[int, Set[int]],
         vis_board[vr][vc] = old_val
         if step_callback is not None:
             step_callback(vis_board)
+        if event_sink is not None:
+            event_sink(vr * len(vis_board) + vc, vv, old_val)
 
     return False
 
+def algorithm_x_iter(matrix: Dict[int, Set[int]],
+                     columns: Set[int],
+                     col_to_rows: Dict[int, Set[int]],
+                     solution: List[int],
+                     metrics: Metrics,
+                     budget: Budget,
+                     row_lookup: Dict[int, tuple],
+                     vis_board: List[List[int]],
+                     step_callback: StepCallback = None,
+                     event_sink: EventSink = None) -> bool:
+    """
+    algorithm_x tanpa rekursi. Stack eksplisit dialokasikan sekali
+    (kedalaman maksimum = jumlah sel, satu baris terpilih per sel), satu record
+    per kedalaman: baris kandidat, indeks kandidat berikutnya, dan perubahan
+    yang harus di-undo. Urutan node / cover / undo sama dengan versi rekursif,
+    jadi hasil dan recursion_steps identik.
+    """
+    n = len(vis_board)
+    size = n * n + 1
+    cand_at: List[list] = [[]] * size
+    next_idx = [0] * size
+    removed_rows_at: List[Dict[int, Set[int]]] = [{}] * size
+    removed_cols_at: List[Set[int]] = [set()] * size
+    old_vals = [0] * size
+    span = 4 * n * n    # kunci MRV: size * span + kolom (seri -> index kolom terkecil)
+    depth = 0
+    entering = True
+
+    while True:
+        undo_child = True
+        if entering:
+            # masuk node baru (= satu pemanggilan algorithm_x)
+            entering = False
+            failed = budget.tick()
+            if not failed:
+                # semua constraint ter-cover -> solusi lengkap
+                if not columns:
+                    if step_callback is not None:
+                        step_callback(vis_board)
+                    return True
+
+                # heuristik: kolom dengan jumlah baris aktif paling sedikit
+                col = min(columns, key=lambda c: len(col_to_rows.get(c, ( ))) * span + c)
+                candidate_rows = list(col_to_rows.get(col, ( )))
+                failed = not candidate_rows
+                if not failed:
+                    cand_at[depth] = candidate_rows
+                    next_idx[depth] = 0
+                    undo_child = False
+
+            if failed:
+                if depth == 0:
+                    return False
+                depth -= 1
+
+        candidate_rows = cand_at[depth]
+        if undo_child:
+            # undo (uncover) perubahan baris yang sedang dicoba di kedalaman ini
+            r = candidate_rows[next_idx[depth] - 1]
+            for rr, cols in removed_rows_at[depth].items():
+                matrix[rr] = cols
+                for cc in cols:
+                    col_to_rows.setdefault(cc, set()).add(rr)
+            for c in removed_cols_at[depth]:
+                columns.add(c)
+
+            solution.pop()
+            vr, vc, vv = row_lookup[r]
+            vis_board[vr][vc] = old_vals[depth]
+            if step_callback is not None:
+                step_callback(vis_board)
+            if event_sink is not None:
+                event_sink(vr * n + vc, vv, old_vals[depth])
+
+        # kandidat berikutnya yang masih aktif (bisa terhapus di level lebih dalam)
+        k = next_idx[depth]
+        while k < len(candidate_rows) and candidate_rows[k] not in matrix:
+            k += 1
+        if k == len(candidate_rows):
+            # semua baris gagal -> kembali ke parent
+            cand_at[depth] = []
+            if depth == 0:
+                return False
+            depth -= 1
+            continue
+        r = candidate_rows[k]
+        next_idx[depth] = k + 1
+
+        metrics.recursion_steps += 1
+        solution.append(r)
+
+        # apply ke vis_board (untuk visualisasi)
+        vr, vc, vv = row_lookup[r]
+        old_vals[depth] = vis_board[vr][vc]
+        vis_board[vr][vc] = vv
+        if step_callback is not None:
+            step_callback(vis_board)
+        if event_sink is not None:
+            event_sink(vr * n + vc, old_vals[depth], vv)
+
+        removed_rows: Dict[int, Set[int]] = {}
+        removed_cols: Set[int] = set()
+
+        # cover semua kolom di row ini
+        for c in set(matrix[r]):
+            if c in columns:
+                columns.remove(c)
+                removed_cols.add(c)
+            # semua row lain yang mengandung kolom ini harus dihapus
+            for rr in list(col_to_rows.get(c, ())):
+                if rr == r:
+                    continue
+                if rr in matrix:
+                    removed_rows[rr] = matrix[rr]
+                    for cc in matrix[rr]:
+                        if cc in col_to_rows:
+                            col_to_rows[cc].discard(rr)
+                    del matrix[rr]
+
+        removed_rows_at[depth] = removed_rows
+        removed_cols_at[depth] = removed_cols
+        depth += 1
+        entering = True
+
+
 def solve_dlx(board: List[List[int]],
               metrics: Metrics,
               timeout_sec: float,
               start_time: float,
-              step_callback: StepCallback = None) -> bool:
+              step_callback: StepCallback = None,
+              budget: Optional[Budget] = None,
+              event_sink: EventSink = None,
+              iterative: bool = False,
+              preprocess: bool = True) -> bool:
     """
     Solver Sudoku dengan Exact Cover (Algorithm X).
     Dipakai oleh:
       - benchmark.py (tanpa step_callback)
       - visual_gui.py (dengan step_callback)
+    budget: Budget bersama (default dibuat dari timeout_sec/start_time).
+    event_sink: sink(cell, old, new) untuk rekaman langkah ringkas (None = mati).
+    iterative: pakai algorithm_x_iter (stack eksplisit, tanpa batas rekursi).
+    preprocess: reduce_candidates dulu, matrix hanya berisi kandidat yang tersisa.
+    Ukuran matrix (baris, kolom) dicatat di metrics.matrix_before / matrix_after,
+    waktu sudoku_to_exact_cover di metrics.build_ms.
     """
-    matrix, row_lookup, columns, col_to_rows = sudoku_to_exact_cover(board)
-    solution_rows: List[int] = []
-
-    # copy supaya struktur asli tidak rusak
-    mat_copy = {r: set(cols) for r, cols in matrix.items()}
-    cols_copy = set(columns)
-    col_to_rows_copy = {c: set(rs) for c, rs in col_to_rows.items()}
-
+    if budget is None:
+        budget = Budget(timeout_sec, start_time)
+    n = len(board)
     # board untuk visualisasi
     vis_board = clone_board(board)
 
-    ok = algorithm_x(mat_copy, cols_copy, col_to_rows_copy, solution_rows, metrics,
-                     timeout_sec, start_time, row_lookup, vis_board, step_callback)
+    domains = None
+    if preprocess:
+        domains = reduce_candidates(board)
+        if domains is None:
+            metrics.stop_reason = ""
+            return False
+        # sel yang dipastikan singles langsung tampil (bukan langkah search)
+        for cell, d in enumerate(domains):
+            r, c = divmod(cell, n)
+            if d & (d - 1) == 0 and vis_board[r][c] == EMPTY:
+                vis_board[r][c] = d.bit_length()
+                if event_sink is not None:
+                    event_sink(cell, EMPTY, vis_board[r][c])
+        if step_callback is not None:
+            step_callback(vis_board)
+
+    # struktur dibangun baru per solve, jadi dipakai langsung tanpa copy
+    build_start = time.perf_counter()
+    matrix, row_lookup, columns, col_to_rows = sudoku_to_exact_cover(board, domains)
+    metrics.build_ms = (time.perf_counter() - build_start) * 1000.0
+    metrics.matrix_before = full_matrix_size(board)
+    metrics.matrix_after = (len(matrix), len(columns))
+    solution_rows: List[int] = []
+
+    search = algorithm_x_iter if iterative else algorithm_x
+    ok = search(matrix, columns, col_to_rows, solution_rows, metrics,
+                budget, row_lookup, vis_board, step_callback,
+                event_sink=event_sink)
+    metrics.stop_reason = budget.reason
     if not ok:
         return False
 
-    # terapkan solusi ke board asli
+    # terapkan solusi ke board asli (sel pasti dari preprocessing + baris terpilih)
+    if domains is not None:
+        for cell, d in enumerate(domains):
+            if d & (d - 1) == 0:
+                board[cell // n][cell % n] = d.bit_length()
     for r_id in solution_rows:
         r, c, v = row_lookup[r_id]
         board[r][c] = v
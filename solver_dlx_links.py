@@ -0,0 +1,450 @@
+# solver_dlx_links.py
+from typing import List, Callable, Optional, Sequence
+from metrics import Metrics, Budget
+import time
+from sudoku_core import EMPTY, clone_board, validate_board
+from sudoku_geometry import get_geometry
+
+StepCallback = Optional[Callable[[List[List[int]]], None]]
+EventSink = Optional[Callable[[int, int, int], None]]
+
+ROOT = 0  # node header utama
+
+
+class DancingLinks:
+    """
+    Dancing Links (Knuth) dengan node berbasis array paralel:
+      L, R, U, D : tetangga kiri/kanan/atas/bawah tiap node
+      C          : header kolom milik node
+      S          : jumlah node aktif per kolom (hanya berarti untuk header)
+      row_of     : id baris kandidat milik node
+    Node 0 = root, node 1..ncols = header kolom, sisanya node isi.
+    cover/uncover hanya me-relink index, tidak ada alokasi per node search.
+    """
+
+    __slots__ = ("L", "R", "U", "D", "C", "S", "row_of", "ncols")
+
+    def __init__(self, ncols: int):
+        self.ncols = ncols
+        size = ncols + 1
+        self.L = [i - 1 for i in range(size)]
+        self.R = [i + 1 for i in range(size)]
+        self.L[ROOT] = ncols
+        self.R[ncols] = ROOT
+        self.U = list(range(size))
+        self.D = list(range(size))
+        self.C = list(range(size))
+        self.S = [0] * size
+        self.row_of = [-1] * size
+
+    def add_row(self, row_id: int, cols: Sequence[int]) -> None:
+        """Tambah satu baris; cols = index kolom 0-based."""
+        L, R, U, D, C, S, row_of = self.L, self.R, self.U, self.D, self.C, self.S, self.row_of
+        first = len(L)
+        for k, col in enumerate(cols):
+            h = col + 1
+            node = first + k
+            # sisip di bawah kolom h (sebelum header -> urutan insert terjaga)
+            U.append(U[h])
+            D.append(h)
+            D[U[h]] = node
+            U[h] = node
+            C.append(h)
+            S[h] += 1
+            row_of.append(row_id)
+            # link horizontal melingkar di dalam baris
+            L.append(node - 1 if k > 0 else first + len(cols) - 1)
+            R.append(node + 1 if k < len(cols) - 1 else first)
+
+    def unlink_empty_columns(self) -> None:
+        """Kolom tanpa baris tidak ikut exact cover (sama dengan all_cols di solver_dlx)."""
+        L, R, S = self.L, self.R, self.S
+        h = R[ROOT]
+        while h != ROOT:
+            nxt = R[h]
+            if S[h] == 0:
+                R[L[h]] = R[h]
+                L[R[h]] = L[h]
+            h = nxt
+
+    def select_row(self, node: int) -> None:
+        """Ambil baris milik `node` ke solusi secara permanen: cover semua kolomnya."""
+        self.cover(self.C[node])
+        j = self.R[node]
+        while j != node:
+            self.cover(self.C[j])
+            j = self.R[j]
+
+    def cover(self, h: int) -> None:
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        R[L[h]] = R[h]
+        L[R[h]] = L[h]
+        i = D[h]
+        while i != h:
+            j = R[i]
+            while j != i:
+                U[D[j]] = U[j]
+                D[U[j]] = D[j]
+                S[C[j]] -= 1
+                j = R[j]
+            i = D[i]
+
+    def uncover(self, h: int) -> None:
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        i = U[h]
+        while i != h:
+            j = L[i]
+            while j != i:
+                S[C[j]] += 1
+                U[D[j]] = j
+                D[U[j]] = j
+                j = L[j]
+            i = U[i]
+        R[L[h]] = h
+        L[R[h]] = h
+
+
+def build_links(board: List[List[int]], preselect_givens: bool = False) -> DancingLinks:
+    """
+    Encode Sudoku N x N langsung ke DancingLinks (tanpa dict/set perantara).
+    Kolom constraint dari Geometry, sama dengan solver_dlx.sudoku_to_exact_cover.
+    row_id = (r * n + c) * n + (val - 1), jadi (r, c, val) bisa dihitung balik
+    tanpa tabel lookup.
+    preselect_givens=True: baris given langsung di-select (tidak ikut search),
+    jadi kedalaman rekursi = jumlah sel kosong, bukan N*N.
+    """
+    n = len(board)
+    geo = get_geometry(n)
+    dl = DancingLinks(geo.ncols)
+    given_nodes: List[int] = []
+
+    for r in range(n):
+        for c in range(n):
+            if board[r][c] != EMPTY:
+                vals = [board[r][c]]
+                if preselect_givens:
+                    given_nodes.append(len(dl.L))
+            else:
+                vals = range(1, n + 1)
+            cell = r * n + c
+            for val in vals:
+                dl.add_row(cell * n + val - 1, geo.cover_columns(cell, val))
+
+    dl.unlink_empty_columns()
+    for node in given_nodes:
+        dl.select_row(node)
+    return dl
+
+
+def dlx_search(dl: DancingLinks,
+               solution: List[int],
+               metrics: Metrics,
+               budget: Budget,
+               vis_board: List[List[int]],
+               step_callback: StepCallback = None,
+               event_sink: EventSink = None) -> bool:
+    """
+    Algorithm X di atas DancingLinks.
+    recursion_steps dihitung per baris kandidat yang dicoba (sama dengan solver_dlx).
+    event_sink: sink(cell, old, new) per perubahan vis_board.
+    """
+    # cek timeout / batas node (jam hanya dicek tiap beberapa node)
+    if budget.tick():
+        return False
+
+    R, D, C, S, row_of = dl.R, dl.D, dl.C, dl.S, dl.row_of
+
+    # semua constraint ter-cover -> solusi lengkap
+    if R[ROOT] == ROOT:
+        if step_callback is not None:
+            step_callback(vis_board)
+        return True
+
+    # pilih kolom dengan size minimum
+    col = R[ROOT]
+    best = S[col]
+    h = R[col]
+    while h != ROOT and best > 0:
+        if S[h] < best:
+            col = h
+            best = S[h]
+        h = R[h]
+    if best == 0:
+        return False
+
+    n = len(vis_board)
+    dl.cover(col)
+    i = D[col]
+    while i != col:
+        metrics.recursion_steps += 1
+        row_id = row_of[i]
+        solution.append(row_id)
+
+        # apply ke vis_board (untuk visualisasi)
+        cell, v = divmod(row_id, n)
+        vr, vc = divmod(cell, n)
+        old_val = vis_board[vr][vc]
+        vis_board[vr][vc] = v + 1
+        if step_callback is not None:
+            step_callback(vis_board)
+        if event_sink is not None:
+            event_sink(cell, old_val, v + 1)
+
+        j = R[i]
+        while j != i:
+            dl.cover(C[j])
+            j = R[j]
+
+        if dlx_search(dl, solution, metrics, budget, vis_board, step_callback,
+                      event_sink):
+            return True
+
+        # undo (uncover) urutan terbalik
+        j = dl.L[i]
+        while j != i:
+            dl.uncover(C[j])
+            j = dl.L[j]
+
+        solution.pop()
+        vis_board[vr][vc] = old_val
+        if step_callback is not None:
+            step_callback(vis_board)
+        if event_sink is not None:
+            event_sink(cell, v + 1, old_val)
+        i = D[i]
+
+    dl.uncover(col)
+    return False
+
+
+def dlx_search_iter(dl: DancingLinks,
+                    solution: List[int],
+                    metrics: Metrics,
+                    budget: Budget,
+                    vis_board: List[List[int]],
+                    step_callback: StepCallback = None,
+                    event_sink: EventSink = None) -> bool:
+    """
+    dlx_search tanpa rekursi. Stack eksplisit dialokasikan sekali (kedalaman
+    maksimum = jumlah sel), satu record per kedalaman: kolom yang di-cover dan
+    node baris yang sedang dicoba (= kolom itu sendiri jika belum ada).
+    Urutan node / cover / uncover sama dengan versi rekursif, jadi hasil dan
+    recursion_steps identik.
+    """
+    R, L, D, C, S, row_of = dl.R, dl.L, dl.D, dl.C, dl.S, dl.row_of
+    n = len(vis_board)
+    size = n * n + 1
+    cols = [0] * size
+    rows = [0] * size
+    old_vals = [0] * size
+    depth = 0
+    entering = True
+
+    while True:
+        undo_child = True
+        if entering:
+            # masuk node baru (= satu pemanggilan dlx_search)
+            entering = False
+            failed = budget.tick()
+            if not failed:
+                # semua constraint ter-cover -> solusi lengkap
+                if R[ROOT] == ROOT:
+                    if step_callback is not None:
+                        step_callback(vis_board)
+                    return True
+
+                # pilih kolom dengan size minimum
+                col = R[ROOT]
+                best = S[col]
+                h = R[col]
+                while h != ROOT and best > 0:
+                    if S[h] < best:
+                        col = h
+                        best = S[h]
+                    h = R[h]
+                failed = best == 0
+                if not failed:
+                    dl.cover(col)
+                    cols[depth] = col
+                    rows[depth] = col
+                    undo_child = False
+
+            if failed:
+                if depth == 0:
+                    return False
+                depth -= 1
+
+        col = cols[depth]
+        i = rows[depth]
+        if undo_child:
+            # subtree baris i gagal: undo (uncover) urutan terbalik
+            j = L[i]
+            while j != i:
+                dl.uncover(C[j])
+                j = L[j]
+
+            solution.pop()
+            cell, v = divmod(row_of[i], n)
+            vr, vc = divmod(cell, n)
+            vis_board[vr][vc] = old_vals[depth]
+            if step_callback is not None:
+                step_callback(vis_board)
+            if event_sink is not None:
+                event_sink(cell, v + 1, old_vals[depth])
+
+        i = D[i]
+        rows[depth] = i
+        if i == col:
+            # semua baris gagal -> kembali ke parent
+            dl.uncover(col)
+            if depth == 0:
+                return False
+            depth -= 1
+            continue
+
+        metrics.recursion_steps += 1
+        row_id = row_of[i]
+        solution.append(row_id)
+
+        # apply ke vis_board (untuk visualisasi)
+        cell, v = divmod(row_id, n)
+        vr, vc = divmod(cell, n)
+        old_vals[depth] = vis_board[vr][vc]
+        vis_board[vr][vc] = v + 1
+        if step_callback is not None:
+            step_callback(vis_board)
+        if event_sink is not None:
+            event_sink(cell, old_vals[depth], v + 1)
+
+        j = R[i]
+        while j != i:
+            dl.cover(C[j])
+            j = R[j]
+
+        depth += 1
+        entering = True
+
+
+def dlx_count(dl: DancingLinks,
+              limit: int,
+              metrics: Metrics,
+              budget: Budget) -> int:
+    """
+    Hitung solusi exact cover sampai `limit` (berhenti begitu limit tercapai).
+    Struktur selalu di-uncover kembali sebelum return, jadi DancingLinks
+    yang sama bisa dipakai ulang tanpa copy.
+    Jika budget habis, hasilnya batas bawah (cek budget.reason).
+    """
+    if budget.tick():
+        return 0
+
+    R, D, C, S = dl.R, dl.D, dl.C, dl.S
+    if R[ROOT] == ROOT:
+        return 1
+
+    col = R[ROOT]
+    best = S[col]
+    h = R[col]
+    while h != ROOT and best > 0:
+        if S[h] < best:
+            col = h
+            best = S[h]
+        h = R[h]
+    if best == 0:
+        return 0
+
+    total = 0
+    dl.cover(col)
+    i = D[col]
+    while i != col:
+        metrics.recursion_steps += 1
+        j = R[i]
+        while j != i:
+            dl.cover(C[j])
+            j = R[j]
+
+        total += dlx_count(dl, limit - total, metrics, budget)
+
+        j = dl.L[i]
+        while j != i:
+            dl.uncover(C[j])
+            j = dl.L[j]
+
+        if total >= limit or budget.reason:
+            break
+        i = D[i]
+    dl.uncover(col)
+    return total
+
+
+def solve_dlx_links(board: List[List[int]],
+                    metrics: Metrics,
+                    timeout_sec: float,
+                    start_time: float,
+                    step_callback: StepCallback = None,
+                    budget: Optional[Budget] = None,
+                    event_sink: EventSink = None,
+                    iterative: bool = False) -> bool:
+    """
+    Solver Sudoku dengan Dancing Links (array paralel).
+    Matrix dibangun sekali, tidak ada copy tambahan seperti di solve_dlx.
+    budget: Budget bersama (default dibuat dari timeout_sec/start_time).
+    event_sink: sink(cell, old, new) untuk rekaman langkah ringkas (None = mati).
+    iterative: pakai dlx_search_iter (stack eksplisit, tanpa batas rekursi).
+    """
+    if budget is None:
+        budget = Budget(timeout_sec, start_time)
+    dl = build_links(board)
+    solution_rows: List[int] = []
+
+    # board untuk visualisasi
+    vis_board = clone_board(board)
+
+    if iterative:
+        ok = dlx_search_iter(dl, solution_rows, metrics, budget, vis_board, step_callback,
+                             event_sink)
+    else:
+        ok = dlx_search(dl, solution_rows, metrics, budget, vis_board, step_callback,
+                        event_sink=event_sink)
+    metrics.stop_reason = budget.reason
+    if not ok:
+        return False
+
+    # terapkan solusi ke board asli
+    n = len(board)
+    for row_id in solution_rows:
+        cell, v = divmod(row_id, n)
+        r, c = divmod(cell, n)
+        board[r][c] = v + 1
+    return True
+
+
+def count_solutions(board: List[List[int]],
+                    limit: int = 2,
+                    metrics: Optional[Metrics] = None,
+                    timeout_sec: float = float("inf"),
+                    budget: Optional[Budget] = None) -> int:
+    """
+    Hitung solusi puzzle sampai `limit` (limit=2 -> cek keunikan: 0 / 1 / >1).
+    Given langsung di-select (preselect_givens) dan DancingLinks yang sama dipakai
+    untuk seluruh search, tidak ada copy struktur exact cover.
+    metrics (opsional) diisi solution_count, recursion_steps, time_ms, stop_reason;
+    jika budget habis, solution_count adalah batas bawah.
+    """
+    if metrics is None:
+        metrics = Metrics()
+    start = time.perf_counter()
+    if budget is None:
+        budget = Budget(timeout_sec, start)
+
+    # given yang saling bentrok tidak boleh di-preselect (kolom ter-cover dua kali)
+    if validate_board(board, complete=False):
+        count = dlx_count(build_links(board, preselect_givens=True), limit, metrics, budget)
+    else:
+        count = 0
+
+    metrics.solution_count = count
+    metrics.success = count > 0
+    metrics.stop_reason = budget.reason
+    metrics.time_ms = (time.perf_counter() - start) * 1000.0
+    return count
@@ -0,0 +1,197 @@
+# step_events.py
+"""
+Stream event langkah solver yang ringkas, pengganti snapshot board penuh.
+
+Solver memanggil event sink `sink(cell, old, new)` setiap kali satu sel board
+berubah (cell = r * N + c). StepRecorder menyimpan event sebagai triple int di
+array('i'): biaya rekam O(1) per langkah dan memori sebanding jumlah event,
+bukan event x N*N seperti snapshot.
+
+Buffer dibatasi `capacity` event. Saat penuh, separuh event tertua dikeluarkan:
+diterapkan ke board dasar (base) dan, jika ada log_path, ditulis ke log biner
+(jadi histori lengkap tetap ada di disk). Frame direkonstruksi saat diminta
+oleh EventReplay dari base + delta, dengan keyframe berkala.
+
+    recorder = StepRecorder(board, capacity=1 << 20)
+    solve_dfs(board, metrics, timeout_sec, start, event_sink=recorder.record)
+    frames = EventReplay.from_recorder(recorder, stride=50)
+    frames[k]  # board setelah event ke-(k * stride)
+
+Layout log biner (native endian, int32): magic b"SDKE", N, N*N sel board awal,
+lalu triple (cell, old, new) per event.
+"""
+import os
+from array import array
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+Board = List[List[int]]
+EventSink = Optional[Callable[[int, int, int], None]]
+
+MAGIC = b"SDKE"
+DEFAULT_CAPACITY = 1 << 20        # 1M event ~ 12 MB
+DEFAULT_KEYFRAME_EVERY = 4096     # keyframe replay tiap sekian event
+
+
+def _flat(board: Board) -> array:
+    return array("i", (v for row in board for v in row))
+
+
+def _apply(cells: array, events: Sequence[int]) -> None:
+    """Terapkan triple (cell, old, new) berurutan ke board flat."""
+    for i in range(0, len(events), 3):
+        cells[events[i]] = events[i + 2]
+
+
+def _revert(cells: array, events: Sequence[int]) -> None:
+    """Kebalikan _apply (triple diproses dari belakang)."""
+    for i in range(len(events) - 3, -1, -3):
+        cells[events[i]] = events[i + 1]
+
+
+class StepRecorder:
+    """
+    Event sink dengan buffer array('i') terbatas.
+    base: board flat sebelum event pertama yang masih ada di buffer
+    offset: jumlah event yang sudah dikeluarkan (indeks absolut event buffer[0])
+    """
+
+    def __init__(self, board: Board, capacity: int = DEFAULT_CAPACITY,
+                 log_path: Optional[str] = None):
+        if capacity < 2:
+            raise ValueError("capacity minimal 2 event")
+        self.n = len(board)
+        self.base = _flat(board)
+        self.capacity = capacity
+        self.events = array("i")
+        self.offset = 0
+        self.limit = capacity * 3
+        self.log: Optional[BinaryIO] = None
+        if log_path is not None:
+            self.log = open(log_path, "wb")
+            self.log.write(MAGIC)
+            array("i", (self.n,)).tofile(self.log)
+            self.base.tofile(self.log)
+
+    def record(self, cell: int, old: int, new: int) -> None:
+        """Event sink untuk solver: satu perubahan sel."""
+        events = self.events
+        events.extend((cell, old, new))
+        if len(events) >= self.limit:
+            self._evict()
+
+    def _evict(self) -> None:
+        """Keluarkan separuh event tertua ke base (dan log)."""
+        cut = (self.capacity // 2) * 3
+        old = self.events[:cut]
+        _apply(self.base, old)
+        if self.log is not None:
+            old.tofile(self.log)
+        del self.events[:cut]
+        self.offset += cut // 3
+
+    def __len__(self) -> int:
+        """Jumlah event total yang pernah direkam (termasuk yang sudah dikeluarkan)."""
+        return self.offset + len(self.events) // 3
+
+    def close(self) -> None:
+        """Tulis sisa buffer ke log (buffer tetap ada untuk replay)."""
+        if self.log is not None:
+            self.events.tofile(self.log)
+            self.log.close()
+            self.log = None
+
+    def __enter__(self) -> "StepRecorder":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def read_event_log(path: str) -> Tuple[int, array, array]:
+    """Log biner -> (N, board awal flat, event triple)."""
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} bukan log event ({MAGIC!r})")
+        head = array("i")
+        head.fromfile(f, 1)
+        n = head[0]
+        cells = array("i")
+        cells.fromfile(f, n * n)
+        events = array("i")
+        remaining = os.fstat(f.fileno()).st_size - f.tell()
+        events.fromfile(f, remaining // (3 * events.itemsize) * 3)
+    return n, cells, events
+
+
+class EventReplay:
+    """
+    Frame on-demand dari base + delta, bentuk sequence (len / indeks) seperti
+    list snapshot lama: frames[k] = board setelah event ke-min(k * stride, total).
+    Frame terakhir selalu state akhir. Akses berurutan (maju/mundur sedikit)
+    hanya menerapkan delta di antaranya; lompatan jauh mulai dari keyframe
+    terdekat yang dibuat sambil jalan (tiap keyframe_every event).
+    """
+
+    def __init__(self, n: int, base: array, events: array, stride: int = 1,
+                 keyframe_every: int = DEFAULT_KEYFRAME_EVERY):
+        self.n = n
+        self.events = events
+        self.total = len(events) // 3
+        self.stride = max(1, stride)
+        self.keyframe_every = max(1, keyframe_every)
+        self.keyframes: Dict[int, array] = {0: array("i", base)}
+        self.cursor = array("i", base)
+        self.pos = 0
+
+    @classmethod
+    def from_recorder(cls, recorder: StepRecorder, **kwargs) -> "EventReplay":
+        return cls(recorder.n, recorder.base, recorder.events, **kwargs)
+
+    @classmethod
+    def from_log(cls, path: str, **kwargs) -> "EventReplay":
+        n, cells, events = read_event_log(path)
+        return cls(n, cells, events, **kwargs)
+
+    def __len__(self) -> int:
+        return -(-self.total // self.stride) + 1
+
+    def seek(self, event_index: int) -> array:
+        """Board flat setelah `event_index` event (cursor ikut dipindah)."""
+        target = min(max(event_index, 0), self.total)
+        if target < self.pos:
+            if self.pos - target <= self.keyframe_every:
+                _revert(self.cursor, self.events[target * 3:self.pos * 3])
+                self.pos = target
+                return self.cursor
+            key = target - target % self.keyframe_every
+            while key not in self.keyframes:
+                key -= self.keyframe_every
+            self.cursor = array("i", self.keyframes[key])
+            self.pos = key
+
+        k = self.keyframe_every
+        while self.pos < target:
+            nxt = min(target, (self.pos // k + 1) * k)
+            _apply(self.cursor, self.events[self.pos * 3:nxt * 3])
+            self.pos = nxt
+            if nxt % k == 0 and nxt not in self.keyframes:
+                self.keyframes[nxt] = array("i", self.cursor)
+        return self.cursor
+
+    def changed_cells(self, start: int, end: int) -> List[int]:
+        """Sel yang disentuh event di [start, end), tanpa duplikat (untuk redraw parsial)."""
+        seen = dict.fromkeys(self.events[start * 3:end * 3:3])
+        return list(seen)
+
+    def __getitem__(self, k: int) -> Board:
+        if k < 0:
+            k += len(self)
+        if not 0 <= k < len(self):
+            raise IndexError(k)
+        cells = self.seek(k * self.stride)
+        n = self.n
+        return [cells[r * n:(r + 1) * n].tolist() for r in range(n)]
+
+    def __iter__(self) -> Iterator[Board]:
+        for k in range(len(self)):
+            yield self[k]
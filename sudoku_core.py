@@ -1,5 +1,8 @@
+import gzip
 import math
-from typing import List, Tuple, Optional
+from typing import List, Tuple, Optional, Iterator, TextIO
+
+from sudoku_geometry import get_geometry
 
 EMPTY = 0  # sel kosong
 
@@ -52,23 +55,175 @@ def parse_puzzle(lines: List[str]) -> List[List[int]]:
     return board
 
 
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+def open_puzzle_file(path: str) -> TextIO:
+    """Buka file puzzle sebagai teks; gzip dikenali dari suffix .gz atau magic bytes."""
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt")
+    with open(path, "rb") as f:
+        magic = f.read(2)
+    if magic == GZIP_MAGIC:
+        return gzip.open(path, "rt")
+    return open(path)
+
+
+def _is_square(k: int) -> bool:
+    return k > 0 and math.isqrt(k) ** 2 == k
+
+
+def _line_layout(cells: List[str], n: Optional[int]) -> Tuple[int, bool]:
+    """
+    (N, satu_baris) untuk baris pertama sebuah puzzle.
+    `cells` = token (format angka dipisah spasi) atau karakter (format klasik).
+    - n diberikan: N*N sel -> satu puzzle per baris, N sel -> satu baris grid.
+    - n None: >= 81 sel dan kuadrat dari N kuadrat sempurna -> satu puzzle per baris
+      (81 -> 9x9, 256 -> 16x16, ...); selain itu panjang baris = N.
+    """
+    k = len(cells)
+    if n is not None:
+        if k == n * n:
+            return n, True
+        if k == n:
+            return n, False
+        raise ValueError(f"Baris berisi {k} sel, bukan {n} atau {n * n} untuk N={n}")
+    m = math.isqrt(k)
+    if k >= 81 and m * m == k and _is_square(m):
+        return m, True
+    if _is_square(k) and k > 1:
+        return k, False
+    raise ValueError(f"Tidak bisa menentukan N dari baris dengan {k} sel")
+
+
+def iter_puzzles(path: str, n: Optional[int] = None) -> Iterator[List[List[int]]]:
+    """
+    Generator puzzle dari file (boleh .gz), satu board per yield; memori konstan
+    (hanya satu puzzle yang ditampung), jadi korpus jutaan puzzle tidak perlu dimuat dulu.
+    Format yang didukung (boleh dicampur, N dideteksi per puzzle jika n None):
+    - satu puzzle per baris, mis. 81 karakter '530070000600195000...'
+      (atau N*N token dipisah spasi)
+    - multi-baris token: N baris berisi N angka (puzzles_25x25.txt)
+    - multi-baris karakter: N baris berisi N karakter (9x9 klasik)
+    Baris kosong dilewati; puzzle terakhir yang tidak lengkap diabaikan.
+    """
+    with open_puzzle_file(path) as f:
+        rows: List[str] = []
+        size = 0
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            tokens = line.split()
+            cells = tokens if len(tokens) > 1 else list(line)
+
+            if not rows:
+                size, one_line = _line_layout(cells, n)
+                if one_line:
+                    if len(tokens) > 1:
+                        yield parse_puzzle([" ".join(cells[i:i + size])
+                                            for i in range(0, size * size, size)])
+                    else:
+                        yield parse_puzzle([line[i:i + size] for i in range(0, size * size, size)])
+                    continue
+
+            rows.append(line)
+            if len(rows) == size:
+                yield parse_puzzle(rows)
+                rows = []
+
+
 def is_valid(board: List[List[int]], r: int, c: int, val: int) -> bool:
-    n = len(board)
-    b = block_size(n)
-    for j in range(n):
-        if board[r][j] == val:
+    geo = get_geometry(len(board))
+    row_of, col_of = geo.row_of, geo.col_of
+    if board[r][c] == val:
+        return False
+    for p in geo.peers[r * geo.n + c]:
+        if board[row_of[p]][col_of[p]] == val:
             return False
-    for i in range(n):
-        if board[i][c] == val:
+    return True
+
+def validate_board(board: List[List[int]],
+                   original: Optional[List[List[int]]] = None,
+                   complete: bool = True) -> bool:
+    """
+    Cek seluruh board dalam satu pass bitmask: setiap nilai di 1..N, tidak ada
+    duplikat di baris / kolom / blok, dan (jika `original` diberikan) semua clue
+    asli tetap sama. complete=True: sel kosong dianggap tidak valid (cek solusi);
+    complete=False: cek konsistensi board yang masih sebagian terisi.
+    """
+    n = len(board)
+    geo = get_geometry(n)
+    block_of = geo.block_of
+    cols = [0] * n
+    blocks = [0] * n
+
+    for r in range(n):
+        row = board[r]
+        if len(row) != n:
             return False
-    br = (r // b) * b
-    bc = (c // b) * b
-    for i in range(br, br + b):
-        for j in range(bc, bc + b):
-            if board[i][j] == val:
+        base = r * n
+        used_r = 0
+        for c in range(n):
+            val = row[c]
+            if val == EMPTY:
+                if complete:
+                    return False
+                continue
+            if not 0 < val <= n:
                 return False
+            bit = 1 << (val - 1)
+            k = block_of[base + c]
+            if (used_r | cols[c] | blocks[k]) & bit:
+                return False
+            used_r |= bit
+            cols[c] |= bit
+            blocks[k] |= bit
+
+    if original is not None:
+        for r in range(n):
+            for c, clue in enumerate(original[r]):
+                if clue != EMPTY and board[r][c] != clue:
+                    return False
     return True
 
+
+def validate_batch(boards, originals=None, complete: bool = True) -> List[bool]:
+    """
+    validate_board untuk banyak board sekaligus.
+    Array NumPy (B, N, N) dicek tervektorisasi (one-hot per nilai, jumlah per
+    unit harus <= 1); sequence biasa dicek board per board dengan bitmask.
+    """
+    if hasattr(boards, "ndim"):
+        return _validate_batch_numpy(boards, originals, complete)
+    if originals is None:
+        return [validate_board(b, None, complete) for b in boards]
+    return [validate_board(b, o, complete) for b, o in zip(boards, originals)]
+
+
+def _validate_batch_numpy(boards, originals, complete: bool) -> List[bool]:
+    import numpy as np
+
+    grid = np.asarray(boards)
+    B, n = grid.shape[0], grid.shape[1]
+    b = get_geometry(n).b
+    in_range = ((grid >= 0) & (grid <= n)).all(axis=(1, 2))
+    if complete:
+        in_range &= (grid != EMPTY).all(axis=(1, 2))
+
+    # board lengkap + tiap nilai paling banyak sekali per unit => tepat sekali
+    onehot = grid[..., None] == np.arange(1, n + 1)
+    ok = in_range
+    ok &= (onehot.sum(axis=2) <= 1).all(axis=(1, 2))
+    ok &= (onehot.sum(axis=1) <= 1).all(axis=(1, 2))
+    ok &= (onehot.reshape(B, b, b, b, b, n).sum(axis=(2, 4)) <= 1).all(axis=(1, 2, 3))
+
+    if originals is not None:
+        orig = np.asarray(originals)
+        ok &= ((orig == EMPTY) | (orig == grid)).all(axis=(1, 2))
+    return ok.tolist()
+
+
 def find_empty(board: List[List[int]]) -> Optional[Tuple[int, int]]:
     n = len(board)
     for i in range(n):
@@ -79,6 +234,91 @@ def find_empty(board: List[List[int]]) -> Optional[Tuple[int, int]]:
 
 def clone_board(board: List[List[int]]) -> List[List[int]]:
     return [row[:] for row in board]
+
+
+def value_bit(val: int) -> int:
+    """Nilai v (1..N) -> bit ke-(v-1)."""
+    return 1 << (val - 1)
+
+
+def iter_bits(mask: int) -> Iterator[int]:
+    """Iterasi nilai (1..N) yang bit-nya menyala di mask, urut naik."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length()
+        mask ^= low
+
+
+class BitBoard:
+    """
+    State board ringkas berbasis bitmask.
+    Untuk tiap row/col/block disimpan integer bitmask nilai yang sudah dipakai,
+    di-update incremental saat place/unplace, jadi:
+      - cek satu kandidat  -> O(1)
+      - semua kandidat sel -> satu OR + satu AND
+    `grid` adalah board asli (list of list) yang diubah in-place,
+    sehingga step_callback / snapshot GUI tetap bisa memakainya.
+    """
+
+    __slots__ = ("n", "geo", "grid", "full", "rows", "cols", "blocks")
+
+    def __init__(self, board: List[List[int]]):
+        n = len(board)
+        self.n = n
+        self.geo = get_geometry(n)
+        self.grid = board
+        self.full = (1 << n) - 1
+        self.rows = [0] * n
+        self.cols = [0] * n
+        self.blocks = [0] * n
+        for r in range(n):
+            for c in range(n):
+                val = board[r][c]
+                if val != EMPTY:
+                    bit = value_bit(val)
+                    self.rows[r] |= bit
+                    self.cols[c] |= bit
+                    self.blocks[self.block_index(r, c)] |= bit
+
+    def block_index(self, r: int, c: int) -> int:
+        return self.geo.block_of[r * self.n + c]
+
+    def candidates(self, r: int, c: int) -> int:
+        """Bitmask kandidat untuk sel (r, c)."""
+        used = self.rows[r] | self.cols[c] | self.blocks[self.block_index(r, c)]
+        return self.full & ~used
+
+    def can_place(self, r: int, c: int, val: int) -> bool:
+        bit = value_bit(val)
+        return not ((self.rows[r] | self.cols[c] | self.blocks[self.block_index(r, c)]) & bit)
+
+    def place(self, r: int, c: int, val: int) -> None:
+        bit = value_bit(val)
+        self.grid[r][c] = val
+        self.rows[r] |= bit
+        self.cols[c] |= bit
+        self.blocks[self.block_index(r, c)] |= bit
+
+    def unplace(self, r: int, c: int) -> None:
+        val = self.grid[r][c]
+        if val == EMPTY:
+            return
+        bit = ~value_bit(val)
+        self.grid[r][c] = EMPTY
+        self.rows[r] &= bit
+        self.cols[c] &= bit
+        self.blocks[self.block_index(r, c)] &= bit
+
+    def empty_cells(self) -> List[Tuple[int, int]]:
+        """Semua sel kosong, urut row-major (sama dengan urutan find_empty)."""
+        n = self.n
+        grid = self.grid
+        return [(r, c) for r in range(n) for c in range(n) if grid[r][c] == EMPTY]
+
+    def snapshot(self) -> List[List[int]]:
+        return clone_board(self.grid)
+
+
 def print_board(board: List[List[int]]) -> None:
     n = len(board)
     b = block_size(n)
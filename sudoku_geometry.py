@@ -0,0 +1,95 @@
+# sudoku_geometry.py
+import math
+from functools import lru_cache
+from typing import Tuple
+
+IntTable = Tuple[int, ...]
+
+
+class Geometry:
+    """
+    Geometri Sudoku N x N yang dihitung sekali per ukuran N.
+    Semua tabel berupa tuple flat yang di-index dengan nomor sel
+    cell = r * n + c, sehingga solver tidak perlu membangun ulang
+    dict/set peers di setiap solve.
+
+    Kolom exact cover untuk kandidat (cell, val):
+      cell_col  = cell
+      ec_row[cell]   + (val - 1)   (nilai val di baris r)
+      ec_col[cell]   + (val - 1)   (nilai val di kolom c)
+      ec_block[cell] + (val - 1)   (nilai val di blok)
+    """
+
+    __slots__ = ("n", "b", "ncells", "ncols",
+                 "row_of", "col_of", "block_of",
+                 "rows", "cols", "blocks", "units", "units_of", "peers", "box_lines",
+                 "ec_row", "ec_col", "ec_block")
+
+    def __init__(self, n: int):
+        b = math.isqrt(n)
+        if b * b != n:
+            raise ValueError(f"N={n} bukan kuadrat sempurna, blok tidak terdefinisi")
+        nn = n * n
+        self.n = n
+        self.b = b
+        self.ncells = nn
+        self.ncols = 4 * nn
+
+        cells = range(nn)
+        self.row_of: IntTable = tuple(cell // n for cell in cells)
+        self.col_of: IntTable = tuple(cell % n for cell in cells)
+        self.block_of: IntTable = tuple((cell // n // b) * b + (cell % n) // b for cell in cells)
+
+        self.rows = tuple(tuple(r * n + c for c in range(n)) for r in range(n))
+        self.cols = tuple(tuple(r * n + c for r in range(n)) for c in range(n))
+        self.blocks = tuple(
+            tuple((br + i) * n + (bc + j) for i in range(b) for j in range(b))
+            for br in range(0, n, b) for bc in range(0, n, b)
+        )
+        self.units = self.rows + self.cols + self.blocks
+        # index unit (ke self.units) milik tiap sel: (row, col, block)
+        self.units_of = tuple(
+            (self.row_of[cell], n + self.col_of[cell], 2 * n + self.block_of[cell])
+            for cell in cells
+        )
+        self.peers = tuple(
+            tuple(sorted(
+                (set(self.rows[self.row_of[cell]])
+                 | set(self.cols[self.col_of[cell]])
+                 | set(self.blocks[self.block_of[cell]])) - {cell}
+            ))
+            for cell in cells
+        )
+
+        # irisan blok x baris/kolom untuk pointing / box-line reduction:
+        # (sel irisan, sisa sel di baris/kolom, sisa sel di blok)
+        box_lines = []
+        for blk in self.blocks:
+            blk_set = set(blk)
+            for line in set(self.row_of[c] for c in blk):
+                box_lines.append(self._split(self.rows[line], blk_set))
+            for line in set(self.col_of[c] for c in blk):
+                box_lines.append(self._split(self.cols[line], blk_set))
+        self.box_lines = tuple(sorted(box_lines))
+
+        self.ec_row: IntTable = tuple(nn + self.row_of[cell] * n for cell in cells)
+        self.ec_col: IntTable = tuple(2 * nn + self.col_of[cell] * n for cell in cells)
+        self.ec_block: IntTable = tuple(3 * nn + self.block_of[cell] * n for cell in cells)
+
+    @staticmethod
+    def _split(line: IntTable, blk_set: set) -> Tuple[IntTable, IntTable, IntTable]:
+        seg = tuple(c for c in line if c in blk_set)
+        line_rest = tuple(c for c in line if c not in blk_set)
+        block_rest = tuple(sorted(blk_set.difference(seg)))
+        return seg, line_rest, block_rest
+
+    def cover_columns(self, cell: int, val: int) -> Tuple[int, int, int, int]:
+        """4 kolom exact cover untuk kandidat (cell, val)."""
+        v = val - 1
+        return (cell, self.ec_row[cell] + v, self.ec_col[cell] + v, self.ec_block[cell] + v)
+
+
+@lru_cache(maxsize=None)
+def get_geometry(n: int) -> Geometry:
+    """Geometry per N, di-cache (jumlah entry = jumlah ukuran berbeda, bukan jumlah puzzle)."""
+    return Geometry(n)
@@ -0,0 +1,112 @@
+# test_solver_csp.py
+"""
+MRVQueue.select() harus memilih sel yang sama dengan scan penuh
+select_unassigned_mrv_degree di setiap node backtrack_mac.
+Jalankan: python -m pytest -q
+"""
+import random
+from collections import deque
+
+import pytest
+
+from metrics import Budget, Metrics
+from puzzle_generator import solved_grid
+from sudoku_core import EMPTY, clone_board, parse_puzzle
+from sudoku_geometry import get_geometry
+from solver_csp import (MRVQueue, backtrack_mac, init_domains, propagate,
+                        resolve_propagators, select_unassigned_mrv_degree)
+
+PUZZLE_9_EASY = [
+    "530070000",
+    "600195000",
+    "098000060",
+    "800060003",
+    "400803001",
+    "700020006",
+    "060000280",
+    "000419005",
+    "000080079",
+]
+
+PUZZLE_9_HARD = [
+    "000000010",
+    "400000000",
+    "020000000",
+    "000050407",
+    "008000300",
+    "001090000",
+    "300400200",
+    "050100000",
+    "000806000",
+]
+
+
+class CheckedMRVQueue(MRVQueue):
+    """MRVQueue yang membandingkan setiap select() dengan scan penuh."""
+
+    def __init__(self, store, board, geo):
+        super().__init__(store, board, geo)
+        self.store = store
+        self.board = board
+        self.geo = geo
+        self.calls = 0
+
+    def select(self):
+        cell = super().select()
+        expected = select_unassigned_mrv_degree(self.store, self.board, self.geo)
+        assert cell == expected, f"select() #{self.calls}: {cell} != scan {expected}"
+        self.calls += 1
+        return cell
+
+
+def holes(n: int, keep: float, seed: int):
+    """Grid solusi acak dengan sebagian sel dikosongkan (tidak harus unik)."""
+    rng = random.Random(seed)
+    board = solved_grid(n, rng)
+    for r in range(n):
+        for c in range(n):
+            if rng.random() >= keep:
+                board[r][c] = EMPTY
+    return board
+
+
+def run_checked(board, stages=(), max_nodes=3000):
+    board = clone_board(board)
+    geo = get_geometry(len(board))
+    store = init_domains(board)
+    assert propagate(store, geo, deque(range(geo.ncells)), stages)
+    mrv = CheckedMRVQueue(store, board, geo)
+    store.watch = mrv
+    metrics = Metrics()
+    backtrack_mac(board, store, geo, mrv, metrics, Budget(max_nodes=max_nodes), stages=stages)
+    return mrv.calls
+
+
+@pytest.mark.parametrize("board", [
+    parse_puzzle(PUZZLE_9_EASY),
+    parse_puzzle(PUZZLE_9_HARD),
+    holes(9, 0.3, seed=1),
+    holes(16, 0.5, seed=2),
+    holes(16, 0.35, seed=3),
+], ids=["9x9-easy", "9x9-hard", "9x9-random", "16x16-half", "16x16-sparse"])
+@pytest.mark.parametrize("propagators", [(), ("hidden_singles", "naked_pairs")],
+                         ids=["ac3", "ac3+stages"])
+def test_select_matches_full_scan(board, propagators):
+    assert run_checked(board, resolve_propagators(propagators)) > 0
+
+
+@pytest.mark.parametrize("n", [9, 16])
+def test_select_matches_full_scan_on_ties(n):
+    # board kosong: semua domain dan degree sama, tie-break row-major yang menentukan
+    board = [[EMPTY] * n for _ in range(n)]
+    assert run_checked(board, max_nodes=500) > 0
+
+
+def test_empty_starting_domain_is_contradiction():
+    # sel (0, 8) tanpa kandidat: baris 0 berisi 1..8, angka 9 ada di kolom 8
+    board = [[1, 2, 3, 4, 5, 6, 7, 8, EMPTY]] + [[EMPTY] * 9 for _ in range(8)]
+    board[4][8] = 9
+    geo = get_geometry(9)
+    store = init_domains(board)
+    assert store.dom[8] == 0
+    assert not propagate(store, geo, deque(range(geo.ncells)))
@@ -0,0 +1,44 @@
+# test_solver_dlx.py
+"""
+Matrix exact cover dari domain hasil reduce_candidates harus tetap membawa
+constraint yang tidak punya kandidat (kolom kosong), supaya search gagal.
+Jalankan: python -m pytest -q
+"""
+import time
+
+from metrics import Metrics
+from sudoku_core import EMPTY, clone_board
+from sudoku_geometry import get_geometry
+from solver_dlx import reduce_candidates, solve_dlx, sudoku_to_exact_cover
+
+
+def no_nine_in_row0():
+    # baris 0: 1..6 + tiga sel kosong, angka 9 terkunci di blok kanan atas (1, 6);
+    # tiap sel tetap punya kandidat {7, 8}, tapi (baris 0, nilai 9) tidak punya
+    board = [[1, 2, 3, 4, 5, 6, EMPTY, EMPTY, EMPTY]] + [[EMPTY] * 9 for _ in range(8)]
+    board[1][6] = 9
+    return board
+
+
+def test_uncovered_unit_value_stays_as_empty_column():
+    board = no_nine_in_row0()
+    domains = reduce_candidates(board, ())
+    assert domains is not None and 0 not in domains
+
+    matrix, _, columns, col_to_rows = sudoku_to_exact_cover(board, domains)
+    col = get_geometry(9).cover_columns(0, 9)[1]
+    assert col in columns
+    assert not col_to_rows.get(col)
+
+
+def test_solve_dlx_fails_on_uncovered_unit_value():
+    board = no_nine_in_row0()
+    work = clone_board(board)
+    metrics = Metrics()
+    assert not solve_dlx(work, metrics, 5.0, time.perf_counter())
+    assert work == board
+    assert metrics.build_ms is None  # hidden_singles sudah menolak sebelum encode
+
+    metrics = Metrics()
+    assert not solve_dlx(clone_board(board), metrics, 5.0, time.perf_counter(), preprocess=False)
+    assert metrics.build_ms is not None and metrics.build_ms >= 0.0
@@ -2,58 +2,64 @@ import time
 import argparse
 import tkinter as tk
 
-from sudoku_core import parse_puzzle, clone_board
+from sudoku_core import iter_puzzles, clone_board
 from solver_dfs import solve_dfs
 from solver_csp import solve_csp
 from solver_dlx import solve_dlx
+from solver_dlx_links import solve_dlx_links
 from metrics import Metrics
+from step_events import DEFAULT_CAPACITY, EventReplay, StepRecorder
 
 def load_first_puzzle(path: str):
-    # ambil puzzle 
-    with open(path) as f:
-        lines = [line.rstrip("\n") for line in f if line.strip()]
-    n = len(lines[0])
-    chunk = lines[:n]
-    return parse_puzzle(chunk)
-
-def collect_snapshots(solver_func, puzzle_path: str,
-                      timeout_sec: float = 10.0,
-                      downsample: int = 50):
+    # ambil puzzle pertama saja (N dideteksi otomatis, file tidak dibaca semua)
+    return next(iter_puzzles(path))
+
+def collect_events(solver_func, puzzle_path: str,
+                   timeout_sec: float = 10.0,
+                   downsample: int = 50,
+                   capacity: int = DEFAULT_CAPACITY,
+                   log_path: str = None):
     """
-    Jalankan solver dengan step_callback yang menyimpan snapshot board.
-    downsample: simpan hanya setiap N langkah biar tidak kebanyakan frame.
+    Jalankan solver dengan event_sink yang merekam delta (cell, old, new).
+    Rekam O(1) per langkah; frame dibuat ulang saat diputar (EventReplay).
+    downsample: satu frame setiap N event.
+    capacity: batas event di memori (event tertua dilipat ke board dasar,
+    dan ditulis ke log_path jika diisi).
     """
     board = load_first_puzzle(puzzle_path)
     board = clone_board(board)
 
     metrics = Metrics()
-    snapshots = []
-
-    step_counter = {"k": 0}
-
-    def callback(b):
-        step_counter["k"] += 1
-        if step_counter["k"] % downsample == 0:
-            snapshots.append([row[:] for row in b])
+    recorder = StepRecorder(board, capacity=capacity, log_path=log_path)
 
     start_time = time.perf_counter()
-    solved = solver_func(board, metrics, timeout_sec, start_time, step_callback=callback)
+    solved = solver_func(board, metrics, timeout_sec, start_time, event_sink=recorder.record)
     end_time = time.perf_counter()
+    recorder.close()
 
     # isi time_ms di metrics untuk dilaporkan
     metrics.time_ms = (end_time - start_time) * 1000.0
 
-    # pastikan solusi akhir juga tersimpan
-    snapshots.append([row[:] for row in board])
-
-    return snapshots, metrics, solved
+    # frame terakhir EventReplay selalu state akhir (solusi jika solved)
+    frames = EventReplay.from_recorder(recorder, stride=downsample)
+    return frames, metrics, solved
 
 class SudokuGUI:
+    """
+    Item canvas (garis grid + satu text per sel) dibuat sekali; tiap frame hanya
+    sel yang berubah di-update lewat itemconfigure.
+    Frame skipping adaptif: indeks frame mengikuti jam (satu frame per delay_ms
+    sejak mulai), jadi jika render tertinggal, frame di antaranya dilewati dan
+    kecepatan putar tetap stabil untuk replay panjang.
+    """
+
     def __init__(self, snapshots, cell_size=40, delay_ms=50, title="Sudoku Visual"):
+        # snapshots: sequence board (list, atau EventReplay yang merakit frame on-demand)
         self.snapshots = snapshots
         self.index = 0
         self.cell_size = cell_size
         self.delay_ms = delay_ms
+        self.skipped = 0
 
         self.n = len(snapshots[0])
         self.root = tk.Tk()
@@ -66,12 +72,16 @@ class SudokuGUI:
                                 bg="white")
         self.canvas.pack()
 
-        self.draw_board(self.snapshots[0])
+        self.items = []
+        self.shown = [0] * (self.n * self.n)
+        self.shown_event = None
+        self.create_items()
+        self.show(0)
         # mulai animasi
+        self.start_time = time.perf_counter()
         self.root.after(self.delay_ms, self.play)
 
-    def draw_board(self, board):
-        self.canvas.delete("all")
+    def create_items(self):
         n = self.n
         cs = self.cell_size
 
@@ -85,28 +95,64 @@ class SudokuGUI:
             # garis vertikal
             self.canvas.create_line(i * cs, 0, i * cs, n * cs, width=width)
 
-        # isi angka
+        # satu text item per sel (kosong = text "")
+        font = ("Arial", int(cs/2))
         for r in range(n):
             for c in range(n):
-                val = board[r][c]
-                if val != 0:
-                    x = c * cs + cs / 2
-                    y = r * cs + cs / 2
-                    self.canvas.create_text(x, y, text=str(val), font=("Arial", int(cs/2)))
+                x = c * cs + cs / 2
+                y = r * cs + cs / 2
+                self.items.append(self.canvas.create_text(x, y, text="", font=font))
+
+    def frame_cells(self, k):
+        """
+        (board flat frame ke-k, sel kandidat berubah atau None = cek semua).
+        EventReplay: langsung board flat dari seek, sel berubah dari event di antaranya
+        (jika event di antaranya lebih banyak dari jumlah sel, cek semua saja).
+        """
+        frames = self.snapshots
+        if isinstance(frames, EventReplay):
+            event = min(k * frames.stride, frames.total)
+            changed = None
+            if self.shown_event is not None:
+                lo, hi = sorted((self.shown_event, event))
+                if hi - lo <= len(self.shown):
+                    changed = frames.changed_cells(lo, hi)
+            self.shown_event = event
+            return frames.seek(event), changed
+        return [v for row in frames[k] for v in row], None
+
+    def show(self, k):
+        cells, changed = self.frame_cells(k)
+        shown = self.shown
+        itemconfigure = self.canvas.itemconfigure
+        for i in (range(len(cells)) if changed is None else changed):
+            val = cells[i]
+            if val != shown[i]:
+                shown[i] = val
+                itemconfigure(self.items[i], text=str(val) if val != 0 else "")
 
     def play(self):
-        if self.index >= len(self.snapshots):
+        last = len(self.snapshots) - 1
+        if self.index >= last:
             return
-        self.draw_board(self.snapshots[self.index])
-        self.index += 1
-        self.root.after(self.delay_ms, self.play)
+        # frame yang seharusnya tampil sekarang menurut jam; frame tertinggal dilewati
+        due = int((time.perf_counter() - self.start_time) * 1000.0 / self.delay_ms)
+        target = min(last, max(self.index + 1, due))
+        self.skipped += target - self.index - 1
+        self.index = target
+
+        t0 = time.perf_counter()
+        self.show(self.index)
+        render_ms = (time.perf_counter() - t0) * 1000.0
+        self.root.after(max(1, int(self.delay_ms - render_ms)), self.play)
 
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument(
         "solver",
-        choices=["dfs", "csp", "dlx"],
-        help="Pilih algoritma yang akan divisualisasikan"
+        nargs="?",
+        choices=["dfs", "csp", "dlx", "dlx_links"],
+        help="Pilih algoritma yang akan divisualisasikan (tidak perlu dengan --replay)"
     )
     parser.add_argument(
         "--puzzle",
@@ -123,25 +169,50 @@ def main():
         "--downsample",
         type=int,
         default=50,
-        help="Simpan hanya setiap N langkah (default 50) agar animasi tidak terlalu berat"
+        help="Tampilkan satu frame setiap N langkah (default 50) agar animasi tidak terlalu berat"
+    )
+    parser.add_argument(
+        "--capacity",
+        type=int,
+        default=DEFAULT_CAPACITY,
+        help="Batas event langkah di memori; event tertua dilipat ke board dasar"
+    )
+    parser.add_argument(
+        "--event-log",
+        default=None,
+        help="Tulis semua event langkah ke log biner ini (histori lengkap di disk)"
+    )
+    parser.add_argument(
+        "--replay",
+        default=None,
+        help="Putar ulang log event biner tanpa menjalankan solver"
     )
     args = parser.parse_args()
+    if args.solver is None and not args.replay:
+        parser.error("pilih solver atau --replay LOG")
 
     solver_map = {
         "dfs": solve_dfs,
         "csp": solve_csp,
         "dlx": solve_dlx,
+        "dlx_links": solve_dlx_links,
     }
-    solver_func = solver_map[args.solver]
-
-    print(f"Mengumpulkan snapshot untuk solver: {args.solver} ...")
-    snapshots, metrics, solved = collect_snapshots(
-        solver_func,
-        args.puzzle,
-        timeout_sec=args.timeout,
-        downsample=args.downsample,
-    )
-    print(f"Solved: {solved}, langkah: {metrics.recursion_steps}, waktu: {metrics.time_ms:.2f} ms")
+
+    if args.replay:
+        snapshots = EventReplay.from_log(args.replay, stride=args.downsample)
+        print(f"Replay {args.replay}: {snapshots.total} event")
+    else:
+        print(f"Merekam langkah untuk solver: {args.solver} ...")
+        snapshots, metrics, solved = collect_events(
+            solver_map[args.solver],
+            args.puzzle,
+            timeout_sec=args.timeout,
+            downsample=args.downsample,
+            capacity=args.capacity,
+            log_path=args.event_log,
+        )
+        print(f"Solved: {solved}, langkah: {metrics.recursion_steps}, "
+              f"event: {snapshots.total}, waktu: {metrics.time_ms:.2f} ms")
 
     if not snapshots:
         print("Tidak ada snapshot yang terkumpul.")
@@ -152,7 +223,7 @@ def main():
         snapshots,
         cell_size=cell_size,
         delay_ms=50,
-        title=f"Sudoku - {args.solver.upper()}",
+        title=f"Sudoku - {args.solver.upper() if args.solver else 'REPLAY'}",
     )
     gui.root.mainloop()
 